@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Booking, Payment
+from apps.core.pagination import EstimatedCountPaginator
+from .models import ArchivedBooking, ArchivedPayment, Booking, InventoryHold, Payment
 
 
 class PaymentInline(admin.StackedInline):
@@ -14,7 +15,10 @@ class BookingAdmin(admin.ModelAdmin):
     list_filter = ['status', 'check_in', 'check_out', 'created_at']
     search_fields = ['booking_reference', 'user__username', 'user__email', 'guest_email']
     readonly_fields = ['booking_reference', 'created_at', 'updated_at']
-    date_hierarchy = 'check_in'
+    list_select_related = ['user', 'room_type__hotel']
+    autocomplete_fields = ['user', 'room_type']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [PaymentInline]
     fieldsets = (
         ('Booking Information', {
@@ -42,4 +46,42 @@ class PaymentAdmin(admin.ModelAdmin):
     list_filter = ['status', 'payment_method', 'created_at']
     search_fields = ['transaction_id', 'booking__booking_reference']
     readonly_fields = ['transaction_id', 'created_at', 'completed_at']
-    date_hierarchy = 'created_at'
+    list_select_related = ['booking__user']
+    autocomplete_fields = ['booking']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(InventoryHold)
+class InventoryHoldAdmin(admin.ModelAdmin):
+    list_display = ['token', 'room_type', 'user', 'check_in', 'check_out', 'num_rooms', 'expires_at']
+    search_fields = ['token', 'user__email']
+    readonly_fields = ['token', 'created_at']
+    list_select_related = ['room_type__hotel', 'user']
+    autocomplete_fields = ['room_type', 'user']
+
+
+class ArchivedPaymentInline(admin.StackedInline):
+    model = ArchivedPayment
+    extra = 0
+    can_delete = False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedBooking)
+class ArchivedBookingAdmin(admin.ModelAdmin):
+    """Read-only view of archived bookings, searchable like the live list"""
+    list_display = ['booking_reference', 'user', 'room_type', 'check_in', 'check_out', 'status', 'total_price', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['booking_reference', 'user__username', 'user__email', 'guest_email']
+    list_select_related = ['user', 'room_type__hotel']
+    show_full_result_count = False
+    inlines = [ArchivedPaymentInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,177 @@
+"""
+Revenue and occupancy rollups.
+
+Every booking contributes one ``HotelDailyStats`` increment per night of its
+stay: the rooms it holds and an equal share of its total price. Booking
+saves and deletes apply the difference between the old and new
+contributions, so dashboards read the small rollup table instead of scanning
+bookings.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import ROUND_DOWN, Decimal
+
+from django.db import connections, router, transaction
+from django.db.models import Sum
+
+from apps.hotels.models import RoomType
+from .models import ArchivedBooking, Booking, HotelDailyStats
+
+CENT = Decimal('0.01')
+REVENUE_STATUSES = ('confirmed', 'completed')
+
+# Booking values a rollup contribution is computed from
+CONTRIBUTION_FIELDS = ('room_type__hotel_id', 'status', 'check_in', 'check_out', 'num_rooms', 'total_price')
+
+
+def booking_values(booking):
+    """Contribution inputs for an in-memory booking"""
+    return {
+        'room_type__hotel_id': booking.room_type.hotel_id,
+        'status': booking.status,
+        'check_in': booking.check_in,
+        'check_out': booking.check_out,
+        'num_rooms': booking.num_rooms,
+        'total_price': booking.total_price,
+    }
+
+
+def nightly_contributions(values, start=None, end=None):
+    """Yield ((hotel_id, night, status), (bookings, room_nights, revenue)) per night in [start, end)"""
+    nights = (values['check_out'] - values['check_in']).days
+    if nights <= 0:
+        return
+    total = Decimal(values['total_price'])
+    share = (total / nights).quantize(CENT, rounding=ROUND_DOWN)
+    for offset in range(nights):
+        night = values['check_in'] + timedelta(days=offset)
+        if (start and night < start) or (end and night >= end):
+            continue
+        # The last night absorbs the rounding remainder so nights sum to the total
+        revenue = total - share * (nights - 1) if offset == nights - 1 else share
+        key = (values['room_type__hotel_id'], night, values['status'])
+        yield key, (1, values['num_rooms'], revenue)
+
+
+def accumulate(deltas, values, sign=1, start=None, end=None):
+    for key, (bookings, room_nights, revenue) in nightly_contributions(values, start, end):
+        current = deltas[key]
+        deltas[key] = (
+            current[0] + sign * bookings,
+            current[1] + sign * room_nights,
+            current[2] + sign * revenue,
+        )
+
+
+def new_deltas():
+    return defaultdict(lambda: (0, 0, Decimal('0')))
+
+
+def apply_deltas(deltas, using=None, insert=True):
+    """
+    Add deltas to the rollup in one batched statement. With ``insert=False``
+    only existing rows are adjusted, which is what removals need: a missing
+    row means the hotel's stats are already being deleted.
+    """
+    rows = [
+        (bookings, room_nights, revenue, hotel_id, night, status)
+        for (hotel_id, night, status), (bookings, room_nights, revenue) in deltas.items()
+        if bookings or room_nights or revenue
+    ]
+    if not rows:
+        return
+    connection = connections[using or router.db_for_write(HotelDailyStats)]
+    table = connection.ops.quote_name(HotelDailyStats._meta.db_table)
+    if insert:
+        sql = (
+            f'INSERT INTO {table} (bookings, room_nights, revenue, hotel_id, date, status) '
+            f'VALUES (%s, %s, %s, %s, %s, %s) '
+            f'ON CONFLICT (hotel_id, date, status) DO UPDATE SET '
+            f'bookings = {table}.bookings + excluded.bookings, '
+            f'room_nights = {table}.room_nights + excluded.room_nights, '
+            f'revenue = {table}.revenue + excluded.revenue'
+        )
+    else:
+        sql = (
+            f'UPDATE {table} SET bookings = bookings + %s, room_nights = room_nights + %s, '
+            f'revenue = revenue + %s WHERE hotel_id = %s AND date = %s AND status = %s'
+        )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def record_change(old, new, using=None):
+    """Move a booking's contribution from its old values to its new ones (either may be None)"""
+    deltas = new_deltas()
+    if old:
+        accumulate(deltas, old, sign=-1)
+    if new:
+        accumulate(deltas, new, sign=1)
+    apply_deltas(deltas, using, insert=new is not None)
+
+
+def record_status_change(bookings, new_status, using=None):
+    """Rollup update for a set-based status change; ``bookings`` are CONTRIBUTION_FIELDS dicts"""
+    deltas = new_deltas()
+    for values in bookings:
+        accumulate(deltas, values, sign=-1)
+        accumulate(deltas, dict(values, status=new_status), sign=1)
+    apply_deltas(deltas, using)
+
+
+def backfill(start, end, chunk_days=31, using='default', progress=None):
+    """Rebuild rollup rows for nights in [start, end), one date window at a time"""
+    window_start = start
+    while window_start < end:
+        window_end = min(window_start + timedelta(days=chunk_days), end)
+        deltas = new_deltas()
+        # Archived stays still count towards revenue history
+        for model in (Booking, ArchivedBooking):
+            bookings = model.objects.using(using).filter(
+                check_in__lt=window_end, check_out__gt=window_start
+            ).order_by().values(*CONTRIBUTION_FIELDS)
+            for values in bookings.iterator(chunk_size=2000):
+                accumulate(deltas, values, start=window_start, end=window_end)
+        with transaction.atomic(using=using):
+            HotelDailyStats.objects.using(using).filter(
+                date__gte=window_start, date__lt=window_end
+            ).delete()
+            apply_deltas(deltas, using)
+        if progress:
+            progress(window_start, window_end, len(deltas))
+        window_start = window_end
+
+
+def revenue_summary(start, end, hotel_ids=None, statuses=REVENUE_STATUSES):
+    """
+    Revenue, ADR and occupancy per hotel for nights in [start, end), read
+    from the rollup. Occupancy is sold room nights over the hotel's room
+    inventory for the period.
+    """
+    stats = HotelDailyStats.objects.filter(date__gte=start, date__lt=end, status__in=statuses)
+    if hotel_ids is not None:
+        stats = stats.filter(hotel_id__in=hotel_ids)
+    totals = list(stats.values('hotel_id').annotate(revenue=Sum('revenue'), room_nights=Sum('room_nights')))
+
+    inventory = RoomType.objects.filter(hotel_id__in=[row['hotel_id'] for row in totals])
+    rooms = dict(inventory.values('hotel_id').annotate(rooms=Sum('total_rooms')).values_list('hotel_id', 'rooms'))
+    days = (end - start).days
+
+    summary = {}
+    for row in totals:
+        capacity = rooms.get(row['hotel_id'], 0) * days
+        summary[row['hotel_id']] = {
+            'revenue': row['revenue'],
+            'room_nights': row['room_nights'],
+            'adr': (row['revenue'] / row['room_nights']).quantize(CENT) if row['room_nights'] else Decimal('0'),
+            'occupancy': row['room_nights'] / capacity if capacity else 0.0,
+        }
+    return summary
+
+
+def daily_series(hotel_id, start, end, statuses=REVENUE_STATUSES):
+    """Per-night revenue and room nights for one hotel, for charting"""
+    rows = HotelDailyStats.objects.filter(
+        hotel_id=hotel_id, date__gte=start, date__lt=end, status__in=statuses
+    ).values('date').annotate(revenue=Sum('revenue'), room_nights=Sum('room_nights')).order_by('date')
+    return list(rows)
@@ -0,0 +1,107 @@
+"""
+Archiving of old completed and cancelled bookings.
+
+Batches of bookings and their payments are copied into the archive tables
+with ``INSERT ... SELECT`` and then deleted from the hot tables in the same
+transaction. The deletes are plain SQL so the rollup signals don't fire:
+archived stays keep contributing to revenue history. Reviews stay live and
+simply lose their booking link; they were verified when written.
+
+``booking_history`` reads both tables so callers never need to know where a
+booking lives.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import BooleanField, Value
+from django.utils import timezone
+
+from .models import ArchivedBooking, ArchivedPayment, Booking, Payment
+
+ARCHIVE_STATUSES = ('completed', 'cancelled')
+DEFAULT_BATCH_SIZE = 1000
+
+HISTORY_FIELDS = (
+    'id', 'booking_reference', 'status', 'check_in', 'check_out', 'num_rooms', 'num_guests',
+    'total_price', 'created_at', 'room_type__name', 'room_type__hotel_id', 'room_type__hotel__name',
+)
+
+
+def archive_cutoff(today=None):
+    days = getattr(settings, 'BOOKING_ARCHIVE_AFTER_DAYS', 365)
+    return (today or timezone.localdate()) - timedelta(days=days)
+
+
+def archivable(cutoff=None):
+    """Terminal bookings whose stay ended before ``cutoff``"""
+    return Booking.objects.filter(status__in=ARCHIVE_STATUSES, check_out__lt=cutoff or archive_cutoff())
+
+
+def _columns(model):
+    return [field.column for field in model._meta.concrete_fields]
+
+
+def _move(cursor, quote, source, target, key, ids, extra=None):
+    """Copy rows of ``source`` whose ``key`` column is in ``ids`` into ``target``"""
+    columns = _columns(source)
+    extra = extra or {}
+    target_columns = ', '.join(quote(column) for column in columns + list(extra))
+    select = ', '.join([quote(column) for column in columns] + ['%s'] * len(extra))
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(
+        f'INSERT INTO {quote(target._meta.db_table)} ({target_columns}) '
+        f'SELECT {select} FROM {quote(source._meta.db_table)} WHERE {quote(key)} IN ({placeholders})',
+        [*extra.values(), *ids],
+    )
+
+
+def archive_batch(ids, using=None):
+    """Move the given bookings and their payments into the archive"""
+    from apps.reviews.models import Review
+
+    using = using or router.db_for_write(Booking)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        _move(cursor, quote, Booking, ArchivedBooking, 'id', ids, {'archived_at': timezone.now()})
+        _move(cursor, quote, Payment, ArchivedPayment, 'booking_id', ids)
+        cursor.execute(
+            f'UPDATE {quote(Review._meta.db_table)} SET booking_id = NULL WHERE booking_id IN ({placeholders})', ids
+        )
+        cursor.execute(f'DELETE FROM {quote(Payment._meta.db_table)} WHERE booking_id IN ({placeholders})', ids)
+        cursor.execute(f'DELETE FROM {quote(Booking._meta.db_table)} WHERE id IN ({placeholders})', ids)
+    return len(ids)
+
+
+def archive_bookings(cutoff=None, batch_size=DEFAULT_BATCH_SIZE, using='default', progress=None):
+    """Archive every eligible booking, ``batch_size`` per transaction; returns the number moved"""
+    queryset = archivable(cutoff).using(using).order_by('pk').values_list('pk', flat=True)
+    moved = 0
+    while True:
+        ids = list(queryset[:batch_size])
+        if not ids:
+            return moved
+        moved += archive_batch(ids, using)
+        if progress:
+            progress(moved)
+
+
+def booking_history(user):
+    """A user's live and archived bookings as one newest-first values() queryset"""
+    live = Booking.objects.filter(user=user).annotate(
+        archived=Value(False, output_field=BooleanField())
+    ).values(*HISTORY_FIELDS, 'archived')
+    archived = ArchivedBooking.objects.filter(user=user).annotate(
+        archived=Value(True, output_field=BooleanField())
+    ).values(*HISTORY_FIELDS, 'archived')
+    return live.order_by().union(archived.order_by(), all=True).order_by('-created_at', '-id')
+
+
+def find_booking(reference):
+    """Look a booking up by reference in the hot table, then the archive"""
+    booking = Booking.objects.filter(booking_reference=reference).first()
+    if booking is None:
+        booking = ArchivedBooking.objects.filter(booking_reference=reference).order_by('-pk').first()
+    return booking
@@ -0,0 +1,143 @@
+"""
+Constant-memory exports of bookings joined with their payments.
+
+Rows come straight from ``values_list(...).iterator(chunk_size=...)`` so no
+model instances are built and only one chunk is held at a time. Each writer
+yields encoded chunks, which lets the same code feed a file or a
+``StreamingHttpResponse``.
+"""
+import csv
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Booking
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# (column name, ORM path)
+EXPORT_COLUMNS = [
+    ('booking_reference', 'booking_reference'),
+    ('status', 'status'),
+    ('created_at', 'created_at'),
+    ('check_in', 'check_in'),
+    ('check_out', 'check_out'),
+    ('num_nights', 'num_nights'),
+    ('num_rooms', 'num_rooms'),
+    ('num_guests', 'num_guests'),
+    ('hotel', 'room_type__hotel__name'),
+    ('room_type', 'room_type__name'),
+    ('user_email', 'user__email'),
+    ('price_per_night', 'price_per_night'),
+    ('subtotal', 'subtotal'),
+    ('taxes', 'taxes'),
+    ('total_price', 'total_price'),
+    ('payment_transaction_id', 'payment__transaction_id'),
+    ('payment_method', 'payment__payment_method'),
+    ('payment_status', 'payment__status'),
+    ('payment_amount', 'payment__amount'),
+    ('payment_completed_at', 'payment__completed_at'),
+]
+EXPORT_HEADER = [name for name, _ in EXPORT_COLUMNS]
+
+
+def export_queryset(start=None, end=None, status=None):
+    """Bookings created in [start, end) (dates, in the current timezone)"""
+    queryset = Booking.objects.order_by()
+    if start:
+        queryset = queryset.filter(created_at__gte=_day_start(start))
+    if end:
+        queryset = queryset.filter(created_at__lt=_day_start(end))
+    if status:
+        queryset = queryset.filter(status=status)
+    return queryset
+
+
+def daily_range(day):
+    return day, day + timedelta(days=1)
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def iter_rows(queryset, chunk_size=DEFAULT_CHUNK_SIZE):
+    paths = [path for _, path in EXPORT_COLUMNS]
+    return queryset.values_list(*paths).iterator(chunk_size=chunk_size)
+
+
+class _Echo:
+    """File-like object whose write() returns the line for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_jsonl(rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(EXPORT_HEADER, row))) + '\n'
+
+
+STREAM_FORMATS = {
+    'csv': (iter_csv, 'text/csv'),
+    'jsonl': (iter_jsonl, 'application/x-ndjson'),
+}
+
+
+def parquet_schema(pa):
+    """The export's Arrow schema, declared up front so chunks of all-null payment columns still match it"""
+    money = pa.decimal128(10, 2)
+    timestamp = pa.timestamp('us', tz='UTC')
+    types = {
+        'created_at': timestamp,
+        'check_in': pa.date32(),
+        'check_out': pa.date32(),
+        'num_nights': pa.int32(),
+        'num_rooms': pa.int32(),
+        'num_guests': pa.int32(),
+        'price_per_night': money,
+        'subtotal': money,
+        'taxes': money,
+        'total_price': money,
+        'payment_amount': money,
+        'payment_completed_at': timestamp,
+    }
+    return pa.schema([pa.field(name, types.get(name, pa.string())) for name in EXPORT_HEADER])
+
+
+def write_parquet(rows, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write a Parquet file one row group per chunk; needs the optional pyarrow package"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError('Parquet export requires pyarrow (pip install -r requirements-exports.txt)') from exc
+
+    schema = parquet_schema(pa)
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(rows, chunk_size):
+            columns = [list(column) for column in zip(*chunk)]
+            writer.write_table(pa.Table.from_pydict(dict(zip(EXPORT_HEADER, columns)), schema=schema))
+            written += len(chunk)
+    return written
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
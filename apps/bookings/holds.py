@@ -0,0 +1,107 @@
+"""
+Inventory holds for checkout sessions.
+
+A hold reserves rooms of a room type for a date range until ``expires_at``.
+Availability counts unexpired holds alongside bookings, so an expired hold
+stops blocking inventory the moment its TTL passes; ``purge_expired`` only
+tidies the rows away. Converting a hold into a confirmed booking deletes it
+in the same transaction.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from apps.hotels.models import RoomType
+from .models import Booking, InventoryHold
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class InventoryUnavailable(ValidationError):
+    pass
+
+
+class HoldExpired(ValidationError):
+    pass
+
+
+def hold_ttl():
+    return timedelta(minutes=getattr(settings, 'INVENTORY_HOLD_MINUTES', 15))
+
+
+def active_holds(now=None):
+    return InventoryHold.objects.filter(expires_at__gt=now or timezone.now())
+
+
+def held_rooms(room_type, check_in, check_out):
+    """Rooms of ``room_type`` under unexpired holds overlapping [check_in, check_out)"""
+    holds = active_holds().filter(room_type=room_type, check_in__lt=check_out, check_out__gt=check_in)
+    return holds.aggregate(rooms=Sum('num_rooms'))['rooms'] or 0
+
+
+def place_hold(room_type, check_in, check_out, num_rooms=1, user=None, ttl=None):
+    """Reserve rooms for checkout, or raise InventoryUnavailable"""
+    with transaction.atomic():
+        # Serializes competing holds for the same room type where row locks exist
+        room_type = RoomType.objects.select_for_update().get(pk=room_type.pk)
+        if not room_type.is_available(check_in, check_out, num_rooms):
+            raise InventoryUnavailable(f'{room_type} is sold out for {check_in} to {check_out}')
+        return InventoryHold.objects.create(
+            room_type=room_type, user=user, check_in=check_in, check_out=check_out,
+            num_rooms=num_rooms, expires_at=timezone.now() + (ttl or hold_ttl()),
+        )
+
+
+def get_active_hold(token, lock=False):
+    holds = InventoryHold.objects.select_related('room_type')
+    if lock:
+        holds = holds.select_for_update(of=('self',))
+    hold = holds.filter(token=token).first()
+    if hold is None or hold.expires_at <= timezone.now():
+        raise HoldExpired('This checkout session has expired')
+    return hold
+
+
+def extend_hold(token, ttl=None):
+    """Push an active hold's expiry out, e.g. while the payment page is open"""
+    hold = get_active_hold(token)
+    hold.expires_at = timezone.now() + (ttl or hold_ttl())
+    hold.save(update_fields=['expires_at'])
+    return hold
+
+
+def release_hold(token):
+    return InventoryHold.objects.filter(token=token).delete()[0] > 0
+
+
+def confirm_hold(token, **booking_fields):
+    """
+    Turn an active hold into a confirmed booking and release the hold.
+    ``booking_fields`` are the remaining Booking fields (guest details,
+    pricing, user).
+    """
+    with transaction.atomic():
+        hold = get_active_hold(token, lock=True)
+        booking = Booking.objects.create(
+            room_type=hold.room_type, check_in=hold.check_in, check_out=hold.check_out,
+            num_rooms=hold.num_rooms, status='confirmed', **booking_fields,
+        )
+        hold.delete()
+    return booking
+
+
+def purge_expired(now=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Delete expired holds in bounded batches; returns the number removed"""
+    now = now or timezone.now()
+    removed = 0
+    while True:
+        ids = list(
+            InventoryHold.objects.filter(expires_at__lte=now).order_by().values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return removed
+        removed += InventoryHold.objects.filter(pk__in=ids).delete()[0]
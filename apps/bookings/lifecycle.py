@@ -0,0 +1,112 @@
+"""
+Booking status transitions.
+
+Single bookings move through ``transition()`` which validates the change
+against ``TRANSITIONS``. The scheduled jobs apply the two automatic
+transitions (expiring abandoned holds and completing past stays) as
+set-based ``UPDATE``s over bounded batches, each in its own short
+transaction, and keep the revenue rollups in step.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .analytics import CONTRIBUTION_FIELDS, record_status_change
+from .models import Booking
+
+TRANSITIONS = {
+    'pending': {'confirmed', 'cancelled'},
+    'confirmed': {'cancelled', 'completed'},
+    'cancelled': set(),
+    'completed': set(),
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class InvalidTransition(ValidationError):
+    pass
+
+
+def can_transition(current, new):
+    return new in TRANSITIONS.get(current, set())
+
+
+def transition(booking, new_status):
+    """Move one booking to ``new_status``, re-checking its current status under a row lock"""
+    with transaction.atomic():
+        current = Booking.objects.select_for_update().values_list('status', flat=True).get(pk=booking.pk)
+        if not can_transition(current, new_status):
+            raise InvalidTransition(f'Cannot move booking {booking.booking_reference} from {current} to {new_status}')
+        booking.status = new_status
+        booking.save(update_fields=['status', 'updated_at'])
+    return booking
+
+
+def confirm(booking):
+    return transition(booking, 'confirmed')
+
+
+def cancel(booking):
+    return transition(booking, 'cancelled')
+
+
+def complete(booking):
+    return transition(booking, 'completed')
+
+
+def pending_hold():
+    return timedelta(minutes=getattr(settings, 'BOOKING_PENDING_HOLD_MINUTES', 30))
+
+
+def bulk_transition(queryset, from_status, to_status, batch_size=DEFAULT_BATCH_SIZE, pause=0):
+    """
+    Move every booking in ``queryset`` from ``from_status`` to ``to_status``
+    in batches of ``batch_size``, one transaction per batch. Returns the
+    number of bookings moved.
+    """
+    if not can_transition(from_status, to_status):
+        raise InvalidTransition(f'Cannot move bookings from {from_status} to {to_status}')
+    queryset = queryset.filter(status=from_status).order_by('pk')
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.select_for_update(skip_locked=True, of=('self',))
+                .values('pk', *CONTRIBUTION_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            # Re-read what the UPDATE actually moved: a row that changed
+            # status since it was selected is skipped by the UPDATE and must
+            # not reach the rollups or the count
+            pks = [row['pk'] for row in rows]
+            stamp = timezone.now()
+            Booking.objects.filter(pk__in=pks, status=from_status).update(status=to_status, updated_at=stamp)
+            updated = list(
+                Booking.objects.filter(pk__in=pks, status=to_status, updated_at=stamp)
+                .values('pk', *CONTRIBUTION_FIELDS)
+            )
+            record_status_change([dict(values, status=from_status) for values in updated], to_status)
+        moved += len(updated)
+        if len(rows) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+    return moved
+
+
+def expire_pending(now=None, hold=None, **kwargs):
+    """Cancel pending bookings older than the hold window, releasing their inventory"""
+    cutoff = (now or timezone.now()) - (hold or pending_hold())
+    return bulk_transition(Booking.objects.filter(created_at__lt=cutoff), 'pending', 'cancelled', **kwargs)
+
+
+def complete_past_stays(today=None, **kwargs):
+    """Mark confirmed bookings whose stay has ended as completed"""
+    today = today or timezone.localdate()
+    return bulk_transition(Booking.objects.filter(check_out__lte=today), 'confirmed', 'completed', **kwargs)
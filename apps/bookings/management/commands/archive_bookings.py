@@ -0,0 +1,61 @@
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.bookings.archive import DEFAULT_BATCH_SIZE, archivable, archive_bookings, archive_cutoff
+from apps.bookings.models import Booking
+from apps.hotels.models import RoomType
+
+
+class Command(BaseCommand):
+    help = 'Move completed and cancelled bookings past the retention window into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', type=date.fromisoformat, help='Archive stays that ended before this date (default: BOOKING_ARCHIVE_AFTER_DAYS ago)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Bookings moved per transaction')
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--benchmark', action='store_true', help='Time hot-table queries before and after archiving')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per benchmark query')
+
+    def handle(self, *args, **options):
+        cutoff = options['before'] or archive_cutoff()
+        eligible = archivable(cutoff).using(options['database']).count()
+        self.stdout.write(f'{eligible} bookings ended before {cutoff}')
+        before = self._benchmark(options['repeat']) if options['benchmark'] else None
+
+        started = time.perf_counter()
+        moved = archive_bookings(cutoff, options['batch_size'], options['database'], progress=self._progress)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Archived {moved} bookings in {elapsed:.1f}s'))
+
+        if before is not None:
+            after = self._benchmark(options['repeat'])
+            self.stdout.write(f'{"query":<24}{"before ms":>12}{"after ms":>12}')
+            for name, value in before.items():
+                self.stdout.write(f'{name:<24}{value:>12.2f}{after[name]:>12.2f}')
+
+    def _progress(self, moved):
+        self.stdout.write(f'  {moved} archived')
+
+    def _benchmark(self, repeat):
+        """Median latency of the queries that scan the hot booking table"""
+        room_types = list(RoomType.objects.order_by('?')[:50])
+        user_ids = list(Booking.objects.order_by('?').values_list('user_id', flat=True)[:20])
+        check_in = timezone.localdate() + timedelta(days=30)
+        queries = {
+            'availability': lambda: [rt.is_available(check_in, check_in + timedelta(days=2)) for rt in room_types],
+            'user_history': lambda: [list(Booking.objects.filter(user_id=u).order_by('-created_at')[:20]) for u in user_ids],
+            'open_bookings': lambda: Booking.objects.filter(status__in=['pending', 'confirmed']).count(),
+        }
+        results = {}
+        for name, query in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                query()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings)
+        return results
@@ -0,0 +1,34 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db.models import Max, Min
+
+from apps.bookings.analytics import backfill
+from apps.bookings.models import ArchivedBooking, Booking
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the hotel daily revenue rollup from bookings, one date window at a time'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=date.fromisoformat, help='First night to rebuild (default: earliest check-in)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Night to stop before (default: latest check-out)')
+        parser.add_argument('--chunk-days', type=int, default=31, help='Nights rebuilt per transaction')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        bounds = [
+            model.objects.using(using).aggregate(first=Min('check_in'), last=Max('check_out'))
+            for model in (Booking, ArchivedBooking)
+        ]
+        start = options['start'] or min((b['first'] for b in bounds if b['first']), default=None)
+        end = options['end'] or max((b['last'] for b in bounds if b['last']), default=None)
+        if start is None or end is None:
+            self.stdout.write('No bookings to backfill')
+            return
+        backfill(start, end, options['chunk_days'], using, progress=self._progress)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rollups for {start} to {end}'))
+
+    def _progress(self, window_start, window_end, rows):
+        self.stdout.write(f'{window_start} .. {window_end}: {rows} rollup rows')
@@ -0,0 +1,45 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.bookings.exports import (
+    DEFAULT_CHUNK_SIZE, STREAM_FORMATS, daily_range, export_queryset, iter_rows, write_parquet,
+)
+
+
+class Command(BaseCommand):
+    help = 'Export bookings with their payments as CSV, JSON lines or Parquet without loading them into memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help='Export bookings created on this day')
+        parser.add_argument('--start', type=date.fromisoformat, help='First creation day (inclusive)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last creation day (exclusive)')
+        parser.add_argument('--status', help='Only bookings with this status')
+        parser.add_argument('--format', default='csv', choices=[*STREAM_FORMATS, 'parquet'])
+        parser.add_argument('--output', default='-', help="Output path, or '-' for stdout")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        start, end = options['start'], options['end']
+        if options['date']:
+            start, end = daily_range(options['date'])
+        rows = iter_rows(export_queryset(start, end, options['status']), options['chunk_size'])
+
+        if options['format'] == 'parquet':
+            if options['output'] == '-':
+                raise CommandError('Parquet exports need an --output path')
+            try:
+                count = write_parquet(rows, options['output'], options['chunk_size'])
+            except RuntimeError as exc:
+                raise CommandError(str(exc)) from exc
+            self.stderr.write(f'Exported {count} bookings to {options["output"]}')
+            return
+
+        iter_format, _ = STREAM_FORMATS[options['format']]
+        if options['output'] == '-':
+            for chunk in iter_format(rows):
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', newline='', encoding='utf-8') as out:
+            for chunk in iter_format(rows):
+                out.write(chunk)
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from apps.bookings.holds import purge_expired
+from apps.bookings.lifecycle import DEFAULT_BATCH_SIZE, complete_past_stays, expire_pending
+
+
+class Command(BaseCommand):
+    help = 'Expire abandoned pending bookings and checkout holds and complete past stays; safe to run from cron'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hold-minutes', type=int, help='Pending hold window (default: BOOKING_PENDING_HOLD_MINUTES)')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Bookings updated per transaction')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+        parser.add_argument('--skip-expiry', action='store_true')
+        parser.add_argument('--skip-completion', action='store_true')
+
+    def handle(self, *args, **options):
+        batching = {'batch_size': options['batch_size'], 'pause': options['pause']}
+        if not options['skip_expiry']:
+            hold = timedelta(minutes=options['hold_minutes']) if options['hold_minutes'] else None
+            expired = expire_pending(hold=hold, **batching)
+            self.stdout.write(f'Expired {expired} pending bookings')
+            purged = purge_expired(batch_size=options['batch_size'])
+            self.stdout.write(f'Purged {purged} expired holds')
+        if not options['skip_completion']:
+            completed = complete_past_stays(**batching)
+            self.stdout.write(f'Completed {completed} past stays')
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0002_initial"),
+        ("hotels", "0003_external_ids"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HotelDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("confirmed", "Confirmed"),
+                            ("cancelled", "Cancelled"),
+                            ("completed", "Completed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("bookings", models.IntegerField(default=0)),
+                ("room_nights", models.IntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "hotel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="hotels.hotel",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Hotel daily stats",
+                "unique_together": {("hotel", "date", "status")},
+            },
+        ),
+    ]
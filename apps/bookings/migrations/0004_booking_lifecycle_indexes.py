@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0003_hotel_daily_stats"),
+        ("hotels", "0003_external_ids"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["status", "created_at"], name="bookings_bo_status_72dd85_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["status", "check_out"], name="bookings_bo_status_733f8c_idx"
+            ),
+        ),
+    ]
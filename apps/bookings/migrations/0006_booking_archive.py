@@ -0,0 +1,124 @@
+# Generated by Django 5.2.8 on 2026-10-19 17:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0005_inventory_holds"),
+        ("hotels", "0003_external_ids"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedBooking",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("booking_reference", models.CharField(max_length=10, unique=True)),
+                ("check_in", models.DateField()),
+                ("check_out", models.DateField()),
+                ("num_guests", models.IntegerField()),
+                ("num_rooms", models.IntegerField(default=1)),
+                ("guest_first_name", models.CharField(max_length=100)),
+                ("guest_last_name", models.CharField(max_length=100)),
+                ("guest_email", models.EmailField(max_length=254)),
+                ("guest_phone", models.CharField(max_length=20)),
+                ("special_requests", models.TextField(blank=True)),
+                (
+                    "price_per_night",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("num_nights", models.IntegerField()),
+                ("subtotal", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("taxes", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("total_price", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("confirmed", "Confirmed"),
+                            ("cancelled", "Cancelled"),
+                            ("completed", "Completed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+                (
+                    "room_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_bookings",
+                        to="hotels.roomtype",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_bookings",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedPayment",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "payment_method",
+                    models.CharField(
+                        choices=[
+                            ("credit_card", "Credit Card"),
+                            ("debit_card", "Debit Card"),
+                            ("paypal", "PayPal"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("transaction_id", models.CharField(max_length=100, unique=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("completed", "Completed"),
+                            ("failed", "Failed"),
+                            ("refunded", "Refunded"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("card_last4", models.CharField(blank=True, max_length=4)),
+                ("card_brand", models.CharField(blank=True, max_length=20)),
+                ("created_at", models.DateTimeField()),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "booking",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payment",
+                        to="bookings.archivedbooking",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="archivedbooking",
+            index=models.Index(
+                fields=["user", "created_at"], name="bookings_ar_user_id_8f8e14_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# Frozen copy of apps.bookings.postgres as of this migration
+INSTALL_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS btree_gist',
+    "ALTER TABLE bookings_booking ADD COLUMN stay daterange "
+    "GENERATED ALWAYS AS (daterange(check_in, check_out, '[)')) STORED",
+    "CREATE INDEX bookings_booking_stay_gist ON bookings_booking USING gist (room_type_id, stay) "
+    "WHERE status IN ('pending', 'confirmed')",
+    """
+    CREATE OR REPLACE FUNCTION bookings_check_capacity() RETURNS trigger AS $$
+    DECLARE
+        capacity integer;
+        busiest integer;
+    BEGIN
+        IF NEW.status NOT IN ('pending', 'confirmed') THEN
+            RETURN NEW;
+        END IF;
+        SELECT total_rooms INTO capacity FROM hotels_roomtype WHERE id = NEW.room_type_id FOR UPDATE;
+        SELECT COALESCE(MAX(booked), 0) INTO busiest FROM (
+            SELECT SUM(b.num_rooms) AS booked
+            FROM generate_series(NEW.check_in, NEW.check_out - 1, interval '1 day') AS night
+            JOIN bookings_booking b ON b.stay @> night::date
+            WHERE b.room_type_id = NEW.room_type_id
+              AND b.status IN ('pending', 'confirmed')
+              AND b.id <> NEW.id
+            GROUP BY night
+        ) AS nights;
+        IF busiest + NEW.num_rooms > capacity THEN
+            RAISE EXCEPTION 'Room type % is fully booked between % and %',
+                NEW.room_type_id, NEW.check_in, NEW.check_out
+                USING ERRCODE = 'exclusion_violation';
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    'CREATE TRIGGER bookings_booking_capacity '
+    'BEFORE INSERT OR UPDATE OF room_type_id, check_in, check_out, num_rooms, status ON bookings_booking '
+    'FOR EACH ROW EXECUTE FUNCTION bookings_check_capacity()',
+]
+
+UNINSTALL_SQL = [
+    'DROP TRIGGER IF EXISTS bookings_booking_capacity ON bookings_booking',
+    'DROP FUNCTION IF EXISTS bookings_check_capacity()',
+    'DROP INDEX IF EXISTS bookings_booking_stay_gist',
+    'ALTER TABLE bookings_booking DROP COLUMN IF EXISTS stay',
+]
+
+
+def install_stay_range(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in INSTALL_SQL:
+            # No params: client-side formatting would reject the bare % in RAISE
+            schema_editor.execute(sql, params=None)
+
+
+def uninstall_stay_range(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for sql in UNINSTALL_SQL:
+            schema_editor.execute(sql, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0006_booking_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_stay_range, uninstall_stay_range),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-19 18:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0007_postgres_stay_range"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="archivedbooking",
+            name="booking_reference",
+            field=models.CharField(db_index=True, max_length=10),
+        ),
+        migrations.AlterField(
+            model_name="archivedpayment",
+            name="transaction_id",
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.db import models
 from django.conf import settings
-from apps.hotels.models import RoomType
+from apps.hotels.models import Hotel, RoomType
 import uuid
 
 
@@ -42,7 +42,7 @@ class Booking(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.booking_reference:
-            self.booking_reference = str(uuid.uuid4())[:8].upper()
+            self.booking_reference = new_booking_reference()
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -50,6 +50,20 @@ class Booking(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Lifecycle jobs: stale pending holds and finished stays
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['status', 'check_out']),
+        ]
+
+
+def new_booking_reference():
+    """An 8-character reference used by no live or archived booking"""
+    while True:
+        reference = str(uuid.uuid4())[:8].upper()
+        if not (Booking.objects.filter(booking_reference=reference).exists()
+                or ArchivedBooking.objects.filter(booking_reference=reference).exists()):
+            return reference
 
 
 class Payment(models.Model):
@@ -82,3 +96,101 @@ class Payment(models.Model):
 
     def __str__(self):
         return f"Payment {self.transaction_id} - {self.booking.booking_reference}"
+
+
+class HotelDailyStats(models.Model):
+    """Per-night booking rollup by hotel and status, maintained from booking changes"""
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+    bookings = models.IntegerField(default=0)  # Bookings in house that night
+    room_nights = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ['hotel', 'date', 'status']
+        verbose_name_plural = 'Hotel daily stats'
+
+    def __str__(self):
+        return f"{self.hotel_id} {self.date} {self.status}"
+
+
+class InventoryHold(models.Model):
+    """Short-lived lease on rooms while a guest completes checkout"""
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    room_type = models.ForeignKey(RoomType, on_delete=models.CASCADE, related_name='holds')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='inventory_holds')
+    check_in = models.DateField()
+    check_out = models.DateField()
+    num_rooms = models.IntegerField(default=1)
+    expires_at = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['room_type', 'expires_at']),
+            models.Index(fields=['expires_at']),
+        ]
+
+    def __str__(self):
+        return f"Hold {self.token} - {self.room_type_id}"
+
+
+class ArchivedBooking(models.Model):
+    """
+    Completed and cancelled bookings moved out of the hot table; ids are kept
+    from Booking. References and transaction ids are indexed but not unique:
+    one reused by a live row must not stop that row from being archived.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    booking_reference = models.CharField(max_length=10, db_index=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_bookings')
+    room_type = models.ForeignKey(RoomType, on_delete=models.CASCADE, related_name='archived_bookings')
+    check_in = models.DateField()
+    check_out = models.DateField()
+    num_guests = models.IntegerField()
+    num_rooms = models.IntegerField(default=1)
+
+    # Guest details
+    guest_first_name = models.CharField(max_length=100)
+    guest_last_name = models.CharField(max_length=100)
+    guest_email = models.EmailField()
+    guest_phone = models.CharField(max_length=20)
+    special_requests = models.TextField(blank=True)
+
+    # Pricing
+    price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
+    num_nights = models.IntegerField()
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2)
+    taxes = models.DecimalField(max_digits=10, decimal_places=2)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+
+    status = models.CharField(max_length=20, choices=Booking.STATUS_CHOICES)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.booking_reference} (archived)"
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', 'created_at'])]
+
+
+class ArchivedPayment(models.Model):
+    """Payments of archived bookings; ids are kept from Payment"""
+    id = models.BigIntegerField(primary_key=True)
+    booking = models.OneToOneField(ArchivedBooking, on_delete=models.CASCADE, related_name='payment')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    payment_method = models.CharField(max_length=20, choices=Payment.PAYMENT_METHOD)
+    transaction_id = models.CharField(max_length=100, db_index=True)
+    status = models.CharField(max_length=20, choices=Payment.PAYMENT_STATUS)
+    card_last4 = models.CharField(max_length=4, blank=True)
+    card_brand = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Payment {self.transaction_id} (archived)"
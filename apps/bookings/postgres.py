@@ -0,0 +1,90 @@
+"""
+PostgreSQL-only booking schema.
+
+On PostgreSQL each booking gets a generated ``stay`` daterange, a GiST index
+over (room_type_id, stay) for overlap lookups, and a trigger that rejects any
+insert or update that would put more rooms of a room type in use on some night
+than the room type has. Capacity is per-night, so a plain exclusion constraint
+(which only forbids *any* overlap) can't express it; the trigger takes a row
+lock on the room type to serialize competing bookings instead. Other backends
+skip all of this and rely on ``RoomType.is_available``.
+"""
+from django.db import connections
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+
+ACTIVE_STATUSES = ('pending', 'confirmed')
+
+INSTALL_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS btree_gist',
+    "ALTER TABLE bookings_booking ADD COLUMN stay daterange "
+    "GENERATED ALWAYS AS (daterange(check_in, check_out, '[)')) STORED",
+    "CREATE INDEX bookings_booking_stay_gist ON bookings_booking USING gist (room_type_id, stay) "
+    "WHERE status IN ('pending', 'confirmed')",
+    """
+    CREATE OR REPLACE FUNCTION bookings_check_capacity() RETURNS trigger AS $$
+    DECLARE
+        capacity integer;
+        busiest integer;
+    BEGIN
+        IF NEW.status NOT IN ('pending', 'confirmed') THEN
+            RETURN NEW;
+        END IF;
+        SELECT total_rooms INTO capacity FROM hotels_roomtype WHERE id = NEW.room_type_id FOR UPDATE;
+        SELECT COALESCE(MAX(booked), 0) INTO busiest FROM (
+            SELECT SUM(b.num_rooms) AS booked
+            FROM generate_series(NEW.check_in, NEW.check_out - 1, interval '1 day') AS night
+            JOIN bookings_booking b ON b.stay @> night::date
+            WHERE b.room_type_id = NEW.room_type_id
+              AND b.status IN ('pending', 'confirmed')
+              AND b.id <> NEW.id
+            GROUP BY night
+        ) AS nights;
+        IF busiest + NEW.num_rooms > capacity THEN
+            RAISE EXCEPTION 'Room type % is fully booked between % and %',
+                NEW.room_type_id, NEW.check_in, NEW.check_out
+                USING ERRCODE = 'exclusion_violation';
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    'CREATE TRIGGER bookings_booking_capacity '
+    'BEFORE INSERT OR UPDATE OF room_type_id, check_in, check_out, num_rooms, status ON bookings_booking '
+    'FOR EACH ROW EXECUTE FUNCTION bookings_check_capacity()',
+]
+
+UNINSTALL_SQL = [
+    'DROP TRIGGER IF EXISTS bookings_booking_capacity ON bookings_booking',
+    'DROP FUNCTION IF EXISTS bookings_check_capacity()',
+    'DROP INDEX IF EXISTS bookings_booking_stay_gist',
+    'ALTER TABLE bookings_booking DROP COLUMN IF EXISTS stay',
+]
+
+
+def is_postgres(connection):
+    return connection.vendor == 'postgresql'
+
+
+def install(schema_editor):
+    if is_postgres(schema_editor.connection):
+        for sql in INSTALL_SQL:
+            # No params: PostgreSQL's schema editor would run the SQL through
+            # client-side formatting, which rejects the bare % in RAISE
+            schema_editor.execute(sql, params=None)
+
+
+def uninstall(schema_editor):
+    if is_postgres(schema_editor.connection):
+        for sql in UNINSTALL_SQL:
+            schema_editor.execute(sql, params=None)
+
+
+def overlapping(queryset, check_in, check_out):
+    """Bookings in ``queryset`` whose stay overlaps [check_in, check_out)"""
+    if is_postgres(connections[queryset.db]):
+        table = queryset.model._meta.db_table
+        return queryset.filter(RawSQL(
+            f'{table}.stay && daterange(%s, %s)', (check_in, check_out), output_field=BooleanField()
+        ))
+    return queryset.filter(check_in__lt=check_out, check_out__gt=check_in)
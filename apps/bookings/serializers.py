@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+
+class BookingHistorySerializer(serializers.Serializer):
+    """Rows of ``archive.booking_history``, live or archived"""
+    booking_reference = serializers.CharField()
+    status = serializers.CharField()
+    hotel_id = serializers.IntegerField(source='room_type__hotel_id')
+    hotel = serializers.CharField(source='room_type__hotel__name')
+    room_type = serializers.CharField(source='room_type__name')
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    num_rooms = serializers.IntegerField()
+    num_guests = serializers.IntegerField()
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+    created_at = serializers.DateTimeField()
+    archived = serializers.BooleanField()
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .analytics import CONTRIBUTION_FIELDS, booking_values, record_change
+from .models import Booking
+
+
+@receiver(pre_save, sender=Booking)
+def remember_rollup_values(sender, instance, raw, using, **kwargs):
+    if raw or instance.pk is None:
+        instance._rollup_previous = None
+        return
+    previous = Booking.objects.using(using).filter(pk=instance.pk).values(*CONTRIBUTION_FIELDS)
+    instance._rollup_previous = previous.first()
+
+
+@receiver(post_save, sender=Booking)
+def update_rollups(sender, instance, raw, using, **kwargs):
+    if not raw:
+        record_change(getattr(instance, '_rollup_previous', None), booking_values(instance), using)
+
+
+@receiver(post_delete, sender=Booking)
+def remove_from_rollups(sender, instance, using, **kwargs):
+    record_change(booking_values(instance), None, using)
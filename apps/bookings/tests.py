@@ -1,3 +1,503 @@
+import csv
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib.util import find_spec
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet, Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.factories import make_booking, make_destination, make_hotel, make_room_type
+from apps.core.testing import QueryAuditMixin
+from apps.hotels.models import Destination, Hotel, RoomType
+from . import holds, lifecycle
+from .analytics import revenue_summary
+from .archive import archive_bookings, find_booking
+from .exports import EXPORT_HEADER, export_queryset, iter_rows, write_parquet
+from .lifecycle import InvalidTransition
+from .models import ArchivedBooking, Booking, HotelDailyStats, InventoryHold, Payment
+
+User = get_user_model()
+
+
+class BookingAdminTests(QueryAuditMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username='admin', password='admin123', email='a@example.com')
+        cls.room_type = make_room_type(
+            hotel=make_hotel(name='Fjord Hotel', destination=make_destination(name='Oslo', country='Norway')),
+            name='Double', price_per_night=Decimal('100.00'), total_rooms=50
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def _add_bookings(self, count):
+        for i in range(count):
+            make_booking(room_type=self.room_type, check_in=date.today() + timedelta(days=10), nights=2)
+
+    def _changelist_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:bookings_booking_changelist'))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Test related objects in list_display are joined, not fetched per row"""
+        self._changelist_queries()  # Loads the process-wide reference data on a cold start
+        self._add_bookings(2)
+        baseline = self._changelist_queries()
+        self._add_bookings(8)
+        self.assertEqual(self._changelist_queries(), baseline)
+
+
+class BookingExportTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', email='guest@example.com', password='pass12345')
+        destination = Destination.objects.create(name='Oslo', city='Oslo', country='Norway', description='Fjords')
+        hotel = Hotel.objects.create(
+            name='Fjord Hotel', destination=destination, address='1 Pier',
+            star_rating=3, description='Test', cancellation_policy='Flexible'
+        )
+        room_type = RoomType.objects.create(
+            hotel=hotel, name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('100.00'), total_rooms=5
+        )
+        self.booking = Booking.objects.create(
+            user=self.user, room_type=room_type,
+            check_in=date.today() + timedelta(days=3), check_out=date.today() + timedelta(days=5),
+            num_guests=2, guest_first_name='Test', guest_last_name='Guest',
+            guest_email='guest@example.com', guest_phone='+1-555-0100',
+            price_per_night=Decimal('100.00'), num_nights=2, subtotal=Decimal('200.00'),
+            taxes=Decimal('30.00'), total_price=Decimal('230.00'), status='confirmed',
+        )
+        Payment.objects.create(
+            booking=self.booking, amount=Decimal('230.00'), payment_method='credit_card',
+            transaction_id='TXN1', status='completed',
+        )
+        self.today = timezone.localdate()
+
+    def test_csv_export_joins_payment(self):
+        """Test the command writes one CSV row per booking with payment columns"""
+        out = StringIO()
+        call_command('export_bookings', '--date', self.today.isoformat(), stdout=out)
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['booking_reference'], self.booking.booking_reference)
+        self.assertEqual(rows[0]['hotel'], 'Fjord Hotel')
+        self.assertEqual(rows[0]['payment_transaction_id'], 'TXN1')
+        self.assertEqual(rows[0]['total_price'], '230.00')
+
+    def test_date_filter_excludes_other_days(self):
+        """Test a daily export only covers bookings created that day"""
+        out = StringIO()
+        call_command('export_bookings', '--date', (self.today - timedelta(days=1)).isoformat(), stdout=out)
+        self.assertEqual(out.getvalue().strip().count('\n'), 0)
+
+    def test_rows_are_fetched_in_one_query(self):
+        """Test exports don't load related objects per row"""
+        with self.assertNumQueries(1):
+            list(iter_rows(export_queryset(), chunk_size=1))
+
+    def test_streaming_endpoint_requires_staff(self):
+        """Test the export endpoint streams JSON lines for staff only"""
+        url = reverse('bookings:export')
+        params = {'date': self.today.isoformat(), 'output': 'jsonl'}
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url, params).status_code, 403)
+
+        staff = User.objects.create_user(username='finance', password='pass12345', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(url, params)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(json.loads(lines[0])['payment_amount'], '230.00')
+
+    @skipUnless(find_spec('pyarrow'), 'pyarrow is optional (requirements-exports.txt)')
+    def test_parquet_chunks_share_a_declared_schema(self):
+        """Test a first chunk with no payments doesn't fix the payment columns to null"""
+        import pyarrow.parquet as pq
+
+        [paid] = iter_rows(export_queryset())
+        payment_columns = [i for i, name in enumerate(EXPORT_HEADER) if name.startswith('payment_')]
+        unpaid = tuple(None if i in payment_columns else value for i, value in enumerate(paid))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bookings.parquet')
+            self.assertEqual(write_parquet([unpaid, paid], path, chunk_size=1), 2)
+            table = pq.read_table(path).to_pydict()
+        self.assertEqual(table['payment_amount'], [None, Decimal('230.00')])
+        self.assertEqual(table['total_price'], [Decimal('230.00')] * 2)
+
+
+class RevenueRollupTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='pass12345')
+        destination = Destination.objects.create(name='Oslo', city='Oslo', country='Norway', description='Fjords')
+        self.hotel = Hotel.objects.create(
+            name='Fjord Hotel', destination=destination, address='1 Pier',
+            star_rating=3, description='Test', cancellation_policy='Flexible'
+        )
+        self.room_type = RoomType.objects.create(
+            hotel=self.hotel, name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('100.00'), total_rooms=10
+        )
+        self.check_in = date(2026, 3, 1)
+
+    def _book(self, nights=3, num_rooms=2, total='300.00', status='confirmed'):
+        return Booking.objects.create(
+            user=self.user, room_type=self.room_type,
+            check_in=self.check_in, check_out=self.check_in + timedelta(days=nights),
+            num_guests=2, num_rooms=num_rooms, guest_first_name='Test', guest_last_name='Guest',
+            guest_email='guest@example.com', guest_phone='+1-555-0100',
+            price_per_night=Decimal('100.00'), num_nights=nights, subtotal=Decimal(total),
+            taxes=Decimal('0.00'), total_price=Decimal(total), status=status,
+        )
+
+    def _stats(self, status='confirmed'):
+        return list(
+            HotelDailyStats.objects.filter(status=status, bookings__gt=0)
+            .order_by('date').values_list('date', 'room_nights', 'revenue')
+        )
+
+    def test_booking_adds_one_row_per_night(self):
+        """Test each night gets the rooms held and an equal revenue share"""
+        self._book(total='100.00')
+        self.assertEqual(self._stats(), [
+            (date(2026, 3, 1), 2, Decimal('33.33')),
+            (date(2026, 3, 2), 2, Decimal('33.33')),
+            (date(2026, 3, 3), 2, Decimal('33.34')),
+        ])
+
+    def test_status_change_moves_contribution(self):
+        """Test cancelling a booking moves its nights to the cancelled rollup"""
+        booking = self._book()
+        booking.status = 'cancelled'
+        booking.save()
+        self.assertEqual(self._stats('confirmed'), [])
+        self.assertEqual(len(self._stats('cancelled')), 3)
+
+    def test_delete_removes_contribution(self):
+        """Test deleting a booking zeroes its nights"""
+        self._book().delete()
+        self.assertEqual(self._stats(), [])
+
+    def test_backfill_matches_incremental_rollup(self):
+        """Test a windowed backfill rebuilds the same rows"""
+        self._book(nights=5, total='500.00')
+        self._book(nights=2, num_rooms=1, total='150.00')
+        expected = self._stats()
+        HotelDailyStats.objects.all().delete()
+        call_command('backfill_revenue_rollups', '--chunk-days', '2', stdout=StringIO())
+        self.assertEqual(self._stats(), expected)
+
+    def test_summary_reads_only_rollups(self):
+        """Test ADR and occupancy come from the rollup table"""
+        self._book(nights=2, num_rooms=2, total='400.00')
+        self._book(nights=2, num_rooms=1, total='100.00', status='pending')
+        end = self.check_in + timedelta(days=4)
+        with CaptureQueriesContext(connection) as queries:
+            summary = revenue_summary(self.check_in, end)[self.hotel.id]
+        self.assertFalse([q for q in queries if 'bookings_booking' in q['sql']])
+        self.assertEqual(summary['revenue'], Decimal('400.00'))
+        self.assertEqual(summary['room_nights'], 4)
+        self.assertEqual(summary['adr'], Decimal('100.00'))
+        self.assertEqual(summary['occupancy'], 4 / 40)
+
+    def test_hotel_delete_cascades_cleanly(self):
+        """Test removing a hotel doesn't recreate its rollup rows"""
+        self._book()
+        self.hotel.delete()
+        self.assertFalse(HotelDailyStats.objects.exists())
+
+
+class BookingLifecycleTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='pass12345')
+        destination = Destination.objects.create(name='Rome', city='Rome', country='Italy', description='Forum')
+        self.hotel = Hotel.objects.create(
+            name='Forum Hotel', destination=destination, address='1 Via',
+            star_rating=4, description='Test', cancellation_policy='Flexible'
+        )
+        self.room_type = RoomType.objects.create(
+            hotel=self.hotel, name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('100.00'), total_rooms=1
+        )
+        self.today = timezone.localdate()
+
+    def _book(self, check_in, nights=2, status='pending', created_minutes_ago=0):
+        booking = Booking.objects.create(
+            user=self.user, room_type=self.room_type,
+            check_in=check_in, check_out=check_in + timedelta(days=nights),
+            num_guests=2, guest_first_name='Test', guest_last_name='Guest',
+            guest_email='guest@example.com', guest_phone='+1-555-0100',
+            price_per_night=Decimal('100.00'), num_nights=nights, subtotal=Decimal('200.00'),
+            taxes=Decimal('0.00'), total_price=Decimal('200.00'), status=status,
+        )
+        if created_minutes_ago:
+            created = timezone.now() - timedelta(minutes=created_minutes_ago)
+            Booking.objects.filter(pk=booking.pk).update(created_at=created)
+        return booking
+
+    def test_invalid_transition_rejected(self):
+        """Test finished bookings can't be reopened"""
+        booking = self._book(self.today, status='cancelled')
+        with self.assertRaises(InvalidTransition):
+            lifecycle.confirm(booking)
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'cancelled')
+
+    def test_transition_checks_stored_status(self):
+        """Test a stale in-memory status doesn't allow an illegal move"""
+        booking = self._book(self.today)
+        Booking.objects.filter(pk=booking.pk).update(status='cancelled')
+        with self.assertRaises(InvalidTransition):
+            lifecycle.confirm(booking)
+
+    def test_expire_pending_releases_inventory(self):
+        """Test stale pending holds are cancelled and the room frees up"""
+        check_in = self.today + timedelta(days=10)
+        stale = self._book(check_in, created_minutes_ago=120)
+        fresh = self._book(check_in + timedelta(days=5), created_minutes_ago=5)
+        self.assertFalse(self.room_type.is_available(check_in, check_in + timedelta(days=1)))
+
+        self.assertEqual(lifecycle.expire_pending(hold=timedelta(minutes=30)), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, fresh.status), ('cancelled', 'pending'))
+        self.assertTrue(self.room_type.is_available(check_in, check_in + timedelta(days=1)))
+
+    def test_complete_past_stays_in_batches(self):
+        """Test batched completion moves every finished stay and its rollups"""
+        for offset in range(5):
+            self._book(self.today - timedelta(days=10 + offset), status='confirmed')
+        upcoming = self._book(self.today + timedelta(days=3), status='confirmed')
+
+        self.assertEqual(lifecycle.complete_past_stays(batch_size=2), 5)
+        self.assertEqual(Booking.objects.filter(status='completed').count(), 5)
+        upcoming.refresh_from_db()
+        self.assertEqual(upcoming.status, 'confirmed')
+        self.assertEqual(
+            HotelDailyStats.objects.filter(status='completed').aggregate(n=Sum('room_nights'))['n'], 10
+        )
+        self.assertFalse(HotelDailyStats.objects.filter(status='confirmed', room_nights__lt=0).exists())
+        self.assertEqual(
+            HotelDailyStats.objects.filter(status='confirmed').aggregate(n=Sum('room_nights'))['n'], 2
+        )
+
+    def test_bulk_transition_counts_rows_it_updated(self):
+        """Test a booking that changes status mid-batch is left out of the count and rollups"""
+        first = self._book(self.today - timedelta(days=10), status='confirmed')
+        self._book(self.today - timedelta(days=20), status='confirmed')
+        update = QuerySet.update
+
+        def cancel_first(queryset, **kwargs):
+            if kwargs.get('status') == 'completed':
+                with connection.cursor() as cursor:
+                    cursor.execute("UPDATE bookings_booking SET status = 'cancelled' WHERE id = %s", [first.pk])
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=cancel_first):
+            self.assertEqual(lifecycle.complete_past_stays(), 1)
+        self.assertEqual(
+            HotelDailyStats.objects.filter(status='completed').aggregate(n=Sum('room_nights'))['n'], 2
+        )
+
+    def test_process_bookings_command(self):
+        """Test the cron command runs both jobs"""
+        self._book(self.today + timedelta(days=1), created_minutes_ago=120)
+        self._book(self.today - timedelta(days=5), status='confirmed')
+        out = StringIO()
+        call_command('process_bookings', stdout=out)
+        self.assertIn('Expired 1 pending bookings', out.getvalue())
+        self.assertIn('Completed 1 past stays', out.getvalue())
+
+
+class InventoryHoldTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='pass12345')
+        destination = Destination.objects.create(name='Lima', city='Lima', country='Peru', description='Coast')
+        hotel = Hotel.objects.create(
+            name='Coast Hotel', destination=destination, address='1 Malecon',
+            star_rating=3, description='Test', cancellation_policy='Flexible'
+        )
+        self.room_type = RoomType.objects.create(
+            hotel=hotel, name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('100.00'), total_rooms=2
+        )
+        self.check_in = timezone.localdate() + timedelta(days=7)
+        self.check_out = self.check_in + timedelta(days=2)
+
+    def _hold(self, **kwargs):
+        return holds.place_hold(self.room_type, self.check_in, self.check_out, user=self.user, **kwargs)
+
+    def test_holds_block_availability(self):
+        """Test active holds count against room inventory"""
+        self._hold()
+        self.assertTrue(self.room_type.is_available(self.check_in, self.check_out))
+        self._hold()
+        self.assertFalse(self.room_type.is_available(self.check_in, self.check_out))
+        with self.assertRaises(holds.InventoryUnavailable):
+            self._hold()
+
+    def test_expired_hold_frees_inventory(self):
+        """Test a hold stops counting once its TTL passes, before any purge"""
+        hold = self._hold(num_rooms=2)
+        InventoryHold.objects.filter(pk=hold.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertTrue(self.room_type.is_available(self.check_in, self.check_out, num_rooms=2))
+        with self.assertRaises(holds.HoldExpired):
+            holds.confirm_hold(hold.token, user=self.user)
+        self.assertEqual(holds.purge_expired(), 1)
+        self.assertFalse(InventoryHold.objects.exists())
+
+    def test_confirm_hold_creates_booking_and_releases(self):
+        """Test confirming swaps the hold for a confirmed booking"""
+        hold = self._hold()
+        booking = holds.confirm_hold(
+            hold.token, user=self.user, num_guests=2, guest_first_name='Test', guest_last_name='Guest',
+            guest_email='guest@example.com', guest_phone='+1-555-0100', price_per_night=Decimal('100.00'),
+            num_nights=2, subtotal=Decimal('200.00'), taxes=Decimal('0.00'), total_price=Decimal('200.00'),
+        )
+        self.assertEqual(booking.status, 'confirmed')
+        self.assertFalse(InventoryHold.objects.exists())
+        # One booking plus one free room: inventory is unchanged by the swap
+        self.assertTrue(self.room_type.is_available(self.check_in, self.check_out))
+        self.assertFalse(self.room_type.is_available(self.check_in, self.check_out, num_rooms=2))
+
+    def test_multi_room_booking_uses_all_its_rooms(self):
+        """Test a confirmed booking counts its num_rooms, not one, against inventory"""
+        hold = self._hold(num_rooms=2)
+        holds.confirm_hold(
+            hold.token, user=self.user, num_guests=4, guest_first_name='Test', guest_last_name='Guest',
+            guest_email='guest@example.com', guest_phone='+1-555-0100', price_per_night=Decimal('100.00'),
+            num_nights=2, subtotal=Decimal('400.00'), taxes=Decimal('0.00'), total_price=Decimal('400.00'),
+        )
+        self.assertFalse(self.room_type.is_available(self.check_in, self.check_out))
+        with self.assertRaises(holds.InventoryUnavailable):
+            self._hold()
+
+    def test_release_hold(self):
+        """Test abandoning checkout returns the rooms immediately"""
+        hold = self._hold(num_rooms=2)
+        self.assertTrue(holds.release_hold(hold.token))
+        self.assertTrue(self.room_type.is_available(self.check_in, self.check_out, num_rooms=2))
+
+
+class BookingArchiveTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='guest', password='pass12345')
+        destination = Destination.objects.create(name='Cairo', city='Cairo', country='Egypt', description='Nile')
+        self.hotel = Hotel.objects.create(
+            name='Nile Hotel', destination=destination, address='1 Corniche',
+            star_rating=4, description='Test', cancellation_policy='Flexible'
+        )
+        self.room_type = RoomType.objects.create(
+            hotel=self.hotel, name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('100.00'), total_rooms=5
+        )
+        self.today = timezone.localdate()
+
+    def _book(self, check_in, status='completed', paid=True):
+        booking = Booking.objects.create(
+            user=self.user, room_type=self.room_type, check_in=check_in, check_out=check_in + timedelta(days=2),
+            num_guests=2, guest_first_name='Test', guest_last_name='Guest',
+            guest_email='guest@example.com', guest_phone='+1-555-0100',
+            price_per_night=Decimal('100.00'), num_nights=2, subtotal=Decimal('200.00'),
+            taxes=Decimal('0.00'), total_price=Decimal('200.00'), status=status,
+        )
+        if paid:
+            Payment.objects.create(
+                booking=booking, amount=booking.total_price, payment_method='credit_card',
+                transaction_id=f'TX-{booking.booking_reference}', status='completed'
+            )
+        return booking
+
+    def test_archives_old_terminal_bookings_with_payments(self):
+        """Test only old completed/cancelled stays move, payments included"""
+        old = self._book(self.today - timedelta(days=500))
+        self._book(self.today - timedelta(days=450), status='cancelled', paid=False)
+        recent = self._book(self.today - timedelta(days=10))
+        upcoming = self._book(self.today + timedelta(days=10), status='confirmed')
+
+        self.assertEqual(archive_bookings(batch_size=1), 2)
+        self.assertEqual(set(Booking.objects.values_list('pk', flat=True)), {recent.pk, upcoming.pk})
+        archived = ArchivedBooking.objects.get(pk=old.pk)
+        self.assertEqual(archived.booking_reference, old.booking_reference)
+        self.assertEqual(archived.payment.transaction_id, f'TX-{old.booking_reference}')
+        self.assertEqual(Payment.objects.count(), 2)
+
+    def test_review_survives_and_rollups_keep_history(self):
+        """Test archiving unlinks reviews and leaves revenue rollups untouched"""
+        from apps.reviews.models import Review
+
+        old = self._book(self.today - timedelta(days=500))
+        review = Review.objects.create(
+            user=self.user, hotel=self.hotel, booking=old, overall_rating=5, cleanliness_rating=5,
+            location_rating=5, service_rating=5, value_rating=5, title='Great', content='Loved it'
+        )
+        stats = list(HotelDailyStats.objects.values_list('date', 'status', 'room_nights', 'revenue'))
+        archive_bookings()
+        review.refresh_from_db()
+        self.assertIsNone(review.booking_id)
+        self.assertTrue(review.is_verified)
+        self.assertEqual(list(HotelDailyStats.objects.values_list('date', 'status', 'room_nights', 'revenue')), stats)
+
+        HotelDailyStats.objects.all().delete()
+        call_command('backfill_revenue_rollups', stdout=StringIO())
+        self.assertEqual(list(HotelDailyStats.objects.values_list('date', 'status', 'room_nights', 'revenue')), stats)
+
+    def test_reused_references_still_archive(self):
+        """Test a reference already in the archive neither blocks archiving nor hides the newer booking"""
+        first = self._book(self.today - timedelta(days=800), paid=False)
+        archive_bookings()
+        self.assertNotEqual(self._book(self.today).booking_reference, first.booking_reference)
+        second = self._book(self.today - timedelta(days=500), paid=False)
+        Booking.objects.filter(pk=second.pk).update(booking_reference=first.booking_reference)
+        self.assertEqual(archive_bookings(), 1)
+        self.assertEqual(ArchivedBooking.objects.filter(booking_reference=first.booking_reference).count(), 2)
+        self.assertEqual(find_booking(first.booking_reference).pk, second.pk)
+
+    def test_archive_changelist_counts_sparse_ids_exactly(self):
+        """Test the archive admin counts rows rather than estimating from their inherited ids"""
+        self._book(self.today - timedelta(days=500))
+        self._book(self.today - timedelta(days=10))
+        self._book(self.today - timedelta(days=480))
+        archive_bookings()
+        admin = User.objects.create_superuser(username='admin', password='admin123', email='a@example.com')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:bookings_archivedbooking_changelist'))
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_history_reads_both_tables(self):
+        """Test the history endpoint lists live and archived bookings together"""
+        old = self._book(self.today - timedelta(days=500))
+        recent = self._book(self.today - timedelta(days=10))
+        archive_bookings()
+        self.assertEqual(find_booking(old.booking_reference).pk, old.pk)
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('bookings:history'))
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()['results']
+        self.assertEqual(
+            [(row['booking_reference'], row['archived']) for row in rows],
+            [(recent.booking_reference, False), (old.booking_reference, True)],
+        )
+        self.assertEqual(rows[1]['hotel'], 'Nile Hotel')
 
-# Create your tests here.
+    def test_archive_command_benchmark(self):
+        """Test the command reports hot-table latency before and after"""
+        self._book(self.today - timedelta(days=500))
+        out = StringIO()
+        call_command('archive_bookings', '--benchmark', '--repeat', '2', stdout=out)
+        self.assertIn('Archived 1 bookings', out.getvalue())
+        self.assertIn('availability', out.getvalue())
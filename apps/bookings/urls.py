@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'bookings'
+
+urlpatterns = [
+    path('history/', views.BookingHistoryView.as_view(), name='history'),
+    path('export/', views.BookingExportView.as_view(), name='export'),
+]
@@ -1,3 +1,40 @@
-from django.shortcuts import render
+from datetime import date
 
-# Create your views here.
+from django.http import StreamingHttpResponse
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.views import APIView
+
+from .archive import booking_history
+from .exports import STREAM_FORMATS, daily_range, export_queryset, iter_rows
+from .serializers import BookingHistorySerializer
+
+
+class BookingExportView(APIView):
+    """Streams the day's bookings and payments for finance (staff only)"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        # ``format`` is reserved by DRF's content negotiation
+        output = request.query_params.get('output', 'csv')
+        if output not in STREAM_FORMATS:
+            raise ValidationError({'output': f'Choose one of {", ".join(STREAM_FORMATS)}'})
+        try:
+            day = date.fromisoformat(request.query_params['date'])
+        except (KeyError, ValueError):
+            raise ValidationError({'date': 'Expected YYYY-MM-DD'})
+
+        iter_format, content_type = STREAM_FORMATS[output]
+        rows = iter_rows(export_queryset(*daily_range(day), request.query_params.get('status')))
+        response = StreamingHttpResponse(iter_format(rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="bookings-{day}.{output}"'
+        return response
+
+
+class BookingHistoryView(generics.ListAPIView):
+    """The signed-in user's bookings, newest first, including archived stays"""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = BookingHistorySerializer
+
+    def get_queryset(self):
+        return booking_history(self.request.user)
@@ -0,0 +1,71 @@
+"""
+Helpers for async views.
+
+Django's async ORM runs every query on the request's single sync thread, so
+awaiting several of them with ``asyncio.gather`` still executes them one after
+another. ``gather_queries`` instead runs blocking ORM callables on pooled
+threads, each with its own connection, so independent lookups for one page
+genuinely overlap.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import JsonResponse
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _isolated(func):
+    def run():
+        try:
+            return func()
+        finally:
+            # Pooled threads keep their connection only while CONN_MAX_AGE allows
+            close_old_connections()
+    return run
+
+
+async def gather_queries(*funcs):
+    """Run zero-argument ORM callables concurrently and return their results in order"""
+    return await asyncio.gather(*(sync_to_async(_isolated(func), thread_sensitive=False)() for func in funcs))
+
+
+def page_bounds(request):
+    """(start, end, page) for ``?page=`` using the REST framework page size, or None if malformed"""
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        return None
+    if page < 1:
+        return None
+    start = (page - 1) * page_size
+    return start, start + page_size, page
+
+
+def page_out_of_range(page, start, count):
+    return page > 1 and start >= count
+
+
+def paginated_response(request, count, page, results):
+    """Same body shape as PageNumberPagination"""
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    url = request.build_absolute_uri()
+    has_next = page * page_size < count
+    if page <= 1:
+        previous = None
+    elif page == 2:
+        previous = remove_query_param(url, 'page')
+    else:
+        previous = replace_query_param(url, 'page', page - 1)
+    return JsonResponse({
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if has_next else None,
+        'previous': previous,
+        'results': results,
+    })
+
+
+def invalid_page():
+    return JsonResponse({'detail': 'Invalid page.'}, status=404)
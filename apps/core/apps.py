@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.core"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+        from .instrumentation import install_wrapper
+        connection_created.connect(install_wrapper, dispatch_uid='core:query-instrumentation')
@@ -0,0 +1,228 @@
+"""
+Benchmark harness for the hot paths.
+
+Each scenario makes one call per iteration: reads go through Django's test
+client and the full middleware stack, booking creation goes through the same
+hold-and-confirm service the checkout uses. Inputs are drawn from a seeded RNG
+so two runs against the same data set (see ``datagen``) ask the same
+questions. The report holds latency percentiles and queries per call plus the
+commit, versions and row counts it was measured on, so reports from two
+commits can be set side by side with ``compare``.
+"""
+import platform
+import random
+import statistics
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from apps.bookings.holds import confirm_hold, place_hold
+from apps.bookings.models import Booking
+from apps.hotels.models import Hotel, RoomType
+from apps.reviews.models import Review
+
+from .instrumentation import start_recording, stop_recording
+
+SEARCH_TERMS = ['hotel', 'beach', 'central', 'grand', 'spa', 'garden', 'harbour', 'palace']
+POPULAR_HOTELS = 200  # Scenarios pick from the most reviewed hotels, where traffic concentrates
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+@dataclass
+class Context:
+    rng: random.Random
+    client: Client
+    hotels: list
+    room_types: list
+    user: object
+    pages: int
+    created: list = field(default_factory=list)  # Bookings to delete after the run
+
+    def get(self, path):
+        return self.client.get(path).status_code == 200
+
+
+@scenario('availability')
+def availability(ctx):
+    check_in = timezone.localdate() + timedelta(days=ctx.rng.randint(1, 180))
+    check_out = check_in + timedelta(days=ctx.rng.randint(1, 7))
+    return ctx.get(f'/api/hotels/{ctx.rng.choice(ctx.hotels)}/availability/?check_in={check_in}&check_out={check_out}')
+
+
+@scenario('listing')
+def listing(ctx):
+    return ctx.get(f'/api/hotels/?page={ctx.rng.randint(1, ctx.pages)}')
+
+
+@scenario('search')
+def search(ctx):
+    return ctx.get(f'/api/hotels/search/?q={ctx.rng.choice(SEARCH_TERMS)}')
+
+
+@scenario('review_feed')
+def review_feed(ctx):
+    return ctx.get(f'/api/reviews/feed/?hotel={ctx.rng.choice(ctx.hotels)}')
+
+
+@scenario('booking_create')
+def booking_create(ctx):
+    room_type = ctx.rng.choice(ctx.room_types)
+    # Far enough ahead that generated demand rarely sells the room out
+    check_in = timezone.localdate() + timedelta(days=ctx.rng.randint(200, 360))
+    nights = ctx.rng.randint(1, 5)
+    hold = place_hold(room_type, check_in, check_in + timedelta(days=nights), user=ctx.user)
+    subtotal = room_type.price_per_night * nights
+    taxes = (subtotal * Decimal('0.12')).quantize(Decimal('0.01'))
+    booking = confirm_hold(
+        hold.token, user=ctx.user, num_guests=1, guest_first_name='Bench', guest_last_name='Mark',
+        guest_email='bench@example.com', guest_phone='+1-555-0000', price_per_night=room_type.price_per_night,
+        num_nights=nights, subtotal=subtotal, taxes=taxes, total_price=subtotal + taxes,
+    )
+    ctx.created.append(booking.pk)
+    return True
+
+
+def _client():
+    hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*']
+    return Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+
+
+def build_context(seed=0):
+    hotels = list(
+        Hotel.objects.filter(is_active=True)
+        .order_by('-rating__total_reviews', 'pk').values_list('pk', flat=True)[:POPULAR_HOTELS]
+    )
+    active = Hotel.objects.filter(is_active=True).count()
+    return Context(
+        rng=random.Random(seed),
+        client=_client(),
+        hotels=hotels,
+        room_types=list(RoomType.objects.filter(hotel_id__in=hotels).order_by('pk')),
+        user=get_user_model().objects.order_by('pk').first(),
+        pages=max(1, -(-active // settings.REST_FRAMEWORK.get('PAGE_SIZE', 20))),
+    )
+
+
+def _percentile(ordered, pct):
+    if len(ordered) < 2:
+        return ordered[0] if ordered else 0.0
+    return statistics.quantiles(ordered, n=100)[pct - 1]
+
+
+def measure(call, iterations, warmup=0):
+    """
+    Time ``iterations`` calls of ``call`` after ``warmup`` untimed ones.
+    Failed calls are counted in ``failures`` by exception type and message.
+    """
+    for _ in range(warmup):
+        try:
+            call()
+        except Exception:
+            pass
+    timings, queries, errors, failures = [], [], 0, {}
+    for _ in range(iterations):
+        recorder, token = start_recording()
+        started = time.perf_counter()
+        failure = None
+        try:
+            ok = call()
+        except Exception as exc:
+            ok, failure = False, f'{type(exc).__name__}: {exc}'
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            stop_recording(token)
+        if ok:
+            timings.append(elapsed)
+            queries.append(recorder.count)
+        else:
+            errors += 1
+            failure = failure or 'unsuccessful response'
+            failures[failure] = failures.get(failure, 0) + 1
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'errors': errors,
+        'mean_ms': round(statistics.fmean(timings), 3) if timings else 0.0,
+        'min_ms': round(timings[0], 3) if timings else 0.0,
+        'p50_ms': round(_percentile(timings, 50), 3),
+        'p95_ms': round(_percentile(timings, 95), 3),
+        'p99_ms': round(_percentile(timings, 99), 3),
+        'max_ms': round(timings[-1], 3) if timings else 0.0,
+        'queries': round(statistics.fmean(queries), 2) if queries else 0.0,
+        'failures': failures,
+    }
+
+
+def _git_revision():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR, capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None, None
+    return commit or None, bool(dirty)
+
+
+def environment():
+    commit, dirty = _git_revision()
+    return {
+        'timestamp': timezone.now().isoformat(),
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': f'{connection.vendor} {".".join(map(str, connection.get_database_version()))}',
+        'cache': settings.CACHES['default']['BACKEND'],
+        'rows': {
+            model._meta.model_name: model.objects.count()
+            for model in (Hotel, RoomType, get_user_model(), Booking, Review)
+        },
+    }
+
+
+def run(names=None, iterations=100, warmup=10, seed=0):
+    """Run the named scenarios (default: all) and return the report dict"""
+    ctx = build_context(seed)
+    report = {'meta': {**environment(), 'iterations': iterations, 'warmup': warmup, 'seed': seed}, 'scenarios': {}}
+    try:
+        for name in names or SCENARIOS:
+            report['scenarios'][name] = measure(lambda: SCENARIOS[name](ctx), iterations, warmup)
+    finally:
+        # Deleting through the ORM lets the signals undo rollups and cache entries
+        Booking.objects.filter(pk__in=ctx.created).delete()
+    return report
+
+
+def compare(baseline, current):
+    """Per-scenario change from ``baseline`` to ``current``, as percentages"""
+    rows = []
+    for name, new in current['scenarios'].items():
+        old = baseline.get('scenarios', {}).get(name)
+        if old is None:
+            continue
+        row = {'scenario': name, 'queries': (old['queries'], new['queries'])}
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            row[metric] = (old[metric], new[metric], (new[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0)
+        rows.append(row)
+    return rows
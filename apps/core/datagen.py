@@ -0,0 +1,453 @@
+"""
+Deterministic synthetic data for benchmarks.
+
+``generate`` fills an empty database with destinations, hotels, room types,
+amenities, users, bookings, payments, reviews and review votes. The same
+seed and counts always produce the same rows. Distributions follow the shape
+of real booking data:
+
+* a few destinations and hotels take most of the demand (Zipf-like weights);
+* star ratings cluster around 3-4, and prices scale with stars and room size;
+* stays are mostly short, with seasonal peaks, booked weeks ahead;
+* past stays are completed or cancelled, future ones confirmed or pending;
+* no room type is ever booked beyond its ``total_rooms`` on any night, so a
+  catalog too small for the requested bookings stops early with a warning.
+
+The catalog and users are written with ``bulk_create``; bookings, payments,
+reviews and votes with ``RowWriter`` in batches. Model signals do not fire,
+so the search indexes, revenue rollups, provider ratings and reference
+data snapshot are rebuilt once at the end instead.
+"""
+import math
+import random
+from bisect import bisect
+from dataclasses import dataclass, field
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from functools import partial
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connections, models, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.bookings import analytics
+from apps.bookings.models import Booking, Payment
+from apps.hotels.models import Amenity, Destination, Hotel, HotelAmenity, RoomType
+from apps.hotels.reference import reference_data
+from apps.hotels.search import hotel_search_index
+from apps.reviews.models import Review, ReviewVote
+from apps.reviews.ratings import recompute_all
+from apps.reviews.search import review_search_index
+
+DEFAULT_BATCH_SIZE = 5000
+# Consecutive sold-out booking attempts after which the catalog counts as full
+MAX_SOLD_OUT_ATTEMPTS = 10000
+TAX_RATE = Decimal('0.12')
+CENT = Decimal('0.01')
+
+CITIES = [
+    ('Paris', 'France'), ('London', 'United Kingdom'), ('Barcelona', 'Spain'), ('Rome', 'Italy'),
+    ('Lisbon', 'Portugal'), ('Amsterdam', 'Netherlands'), ('Berlin', 'Germany'), ('Prague', 'Czechia'),
+    ('Vienna', 'Austria'), ('Athens', 'Greece'), ('Istanbul', 'Turkey'), ('Dubai', 'United Arab Emirates'),
+    ('New York', 'United States'), ('Miami', 'United States'), ('Cancun', 'Mexico'), ('Rio de Janeiro', 'Brazil'),
+    ('Buenos Aires', 'Argentina'), ('Cape Town', 'South Africa'), ('Marrakesh', 'Morocco'), ('Cairo', 'Egypt'),
+    ('Bangkok', 'Thailand'), ('Bali', 'Indonesia'), ('Singapore', 'Singapore'), ('Tokyo', 'Japan'),
+    ('Kyoto', 'Japan'), ('Seoul', 'South Korea'), ('Sydney', 'Australia'), ('Queenstown', 'New Zealand'),
+    ('Reykjavik', 'Iceland'), ('Dubrovnik', 'Croatia'), ('Santorini', 'Greece'), ('Edinburgh', 'United Kingdom'),
+]
+AMENITIES = [
+    ('Free WiFi', 'general'), ('Parking', 'general'), ('Airport shuttle', 'general'), ('24-hour front desk', 'general'),
+    ('Pet friendly', 'general'), ('Restaurant', 'general'), ('Bar', 'general'), ('Room service', 'general'),
+    ('Air conditioning', 'room'), ('Minibar', 'room'), ('Safe', 'room'), ('Balcony', 'room'), ('Bathtub', 'room'),
+    ('Kitchenette', 'room'), ('Swimming pool', 'activity'), ('Spa', 'activity'), ('Fitness centre', 'activity'),
+    ('Beach access', 'activity'), ('Tennis court', 'activity'), ('Kids club', 'activity'),
+]
+HOTEL_WORDS = ['Grand', 'Royal', 'Harbour', 'Old Town', 'Garden', 'Plaza', 'Central', 'Park', 'Riverside', 'Palace',
+               'Boutique', 'Sunset', 'Panorama', 'Heritage', 'Marina', 'Skyline']
+HOTEL_TYPES = [('hotel', 60), ('resort', 12), ('apartment', 12), ('guesthouse', 10), ('hostel', 6)]
+STARS = [(1, 5), (2, 15), (3, 40), (4, 30), (5, 10)]
+ROOM_TYPES = [
+    # name, occupancy, bed, size sqm, price multiplier
+    ('Single', 1, 'Single', 14, Decimal('0.7')),
+    ('Double', 2, 'Double', 20, Decimal('1.0')),
+    ('Twin', 2, 'Twin', 22, Decimal('1.0')),
+    ('Deluxe', 2, 'King', 30, Decimal('1.4')),
+    ('Family', 4, 'Double + bunk', 36, Decimal('1.7')),
+    ('Suite', 3, 'King', 50, Decimal('2.6')),
+]
+FIRST_NAMES = ['Alex', 'Maria', 'Jon', 'Sofia', 'Luca', 'Emma', 'Noah', 'Mia', 'Liam', 'Zoe', 'Omar', 'Yuki', 'Ana',
+               'Ivan', 'Lea', 'Sam', 'Nina', 'Theo', 'Ada', 'Ravi']
+LAST_NAMES = ['Smith', 'Garcia', 'Rossi', 'Muller', 'Silva', 'Kowalski', 'Papadopoulos', 'Nguyen', 'Tanaka', 'Kim',
+              'Dubois', 'Jensen', 'Novak', 'Costa', 'Haddad', 'Okafor', 'Singh', 'Murphy', 'Ivanova', 'Cohen']
+REVIEW_TITLES = {
+    1: ['Very disappointing', 'Would not return', 'Not as advertised'],
+    2: ['Below expectations', 'Needs work', 'Just okay at best'],
+    3: ['Decent stay', 'Fine for the price', 'Average hotel'],
+    4: ['Great stay', 'Really enjoyed it', 'Good value'],
+    5: ['Outstanding', 'Perfect getaway', 'Best hotel in town'],
+}
+REVIEW_PHRASES = [
+    'The staff were friendly and check-in was quick.', 'Our room was clean and quiet.',
+    'Breakfast had plenty of choice.', 'The location made it easy to walk everywhere.',
+    'The wifi was slow in the evenings.', 'Beds were comfortable.', 'The pool area got crowded.',
+    'Street noise kept us up at night.', 'Great view from the balcony.', 'Parking was expensive.',
+]
+PAYMENT_METHODS = [('credit_card', 60), ('debit_card', 25), ('paypal', 15)]
+CARD_BRANDS = ['Visa', 'Mastercard', 'Amex']
+
+BOOKING_COLUMNS = (
+    'id', 'booking_reference', 'user_id', 'room_type_id', 'check_in', 'check_out', 'num_guests', 'num_rooms',
+    'guest_first_name', 'guest_last_name', 'guest_email', 'guest_phone', 'special_requests', 'price_per_night',
+    'num_nights', 'subtotal', 'taxes', 'total_price', 'status', 'created_at', 'updated_at',
+)
+PAYMENT_COLUMNS = (
+    'id', 'booking_id', 'amount', 'payment_method', 'transaction_id', 'status', 'card_last4', 'card_brand',
+    'created_at', 'completed_at',
+)
+REVIEW_COLUMNS = (
+    'id', 'user_id', 'hotel_id', 'booking_id', 'overall_rating', 'cleanliness_rating', 'location_rating',
+    'service_rating', 'value_rating', 'title', 'content', 'is_verified', 'helpful_count', 'not_helpful_count',
+    'created_at', 'updated_at',
+)
+VOTE_COLUMNS = ('id', 'review_id', 'user_id', 'vote_type', 'created_at')
+
+
+@dataclass
+class Counts:
+    destinations: int = 30
+    hotels: int = 1000
+    users: int = 5000
+    bookings: int = 100000
+    review_rate: float = 0.3  # Share of completed stays that get a review
+    votes_per_review: float = 1.5
+
+
+@dataclass
+class GenerationStats:
+    created: dict = field(default_factory=dict)
+    warnings: list = field(default_factory=list)
+
+    def add(self, kind, n):
+        self.created[kind] = self.created.get(kind, 0) + n
+
+
+class Chooser:
+    """Weighted choice over a fixed population in O(log n)"""
+
+    def __init__(self, rng, population, weights):
+        self.rng = rng
+        self.population = population
+        self.cumulative = list(accumulate(weights))
+
+    def __call__(self):
+        return self.population[bisect(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+
+def zipf_weights(n, exponent=0.9):
+    return [1 / (rank ** exponent) for rank in range(1, n + 1)]
+
+
+class RowWriter:
+    """
+    Buffered ``executemany`` INSERTs of plain tuples in ``columns`` order.
+    Skipping model instances and per-field value preparation is what makes a
+    million bookings load in minutes; only date, datetime and decimal values
+    go through the backend's ``adapt_*_value`` hooks. Primary keys are
+    assigned by the caller so dependent rows can reference them before
+    anything is written.
+    """
+
+    def __init__(self, model, columns, using):
+        self.model = model
+        self.connection = connections[using]
+        quote = self.connection.ops.quote_name
+        fields = [model._meta.get_field(column) for column in columns]
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            quote(model._meta.db_table),
+            ', '.join(quote(f.column) for f in fields),
+            ', '.join(['%s'] * len(fields)),
+        )
+        ops = self.connection.ops
+        self.adapt = []
+        for i, f in enumerate(fields):
+            if isinstance(f, models.DateTimeField):
+                self.adapt.append((i, ops.adapt_datetimefield_value))
+            elif isinstance(f, models.DateField):
+                self.adapt.append((i, ops.adapt_datefield_value))
+            elif isinstance(f, models.DecimalField):
+                self.adapt.append((i, partial(ops.adapt_decimalfield_value, max_digits=f.max_digits,
+                                              decimal_places=f.decimal_places)))
+        self.rows = []
+
+    def next_id(self):
+        return (self.model.objects.using(self.connection.alias).aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def add(self, row):
+        self.rows.append(row)
+
+    def flush(self):
+        rows, self.rows = self.rows, []
+        if rows:
+            if self.adapt:
+                for n, row in enumerate(rows):
+                    row = list(row)
+                    for i, adapt in self.adapt:
+                        row[i] = adapt(row[i])
+                    rows[n] = row
+            with self.connection.cursor() as cursor:
+                cursor.executemany(self.sql, rows)
+        return len(rows)
+
+    def reset_sequence(self):
+        """Move the id sequence past the explicit keys (a no-op on SQLite)"""
+        with self.connection.cursor() as cursor:
+            for sql in self.connection.ops.sequence_reset_sql(no_style(), [self.model]):
+                cursor.execute(sql)
+
+
+class Generator:
+    def __init__(self, counts, seed=0, batch_size=DEFAULT_BATCH_SIZE, using='default', progress=None):
+        self.counts = counts
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.using = using
+        self.progress = progress
+        self.stats = GenerationStats()
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+        # Bookings span two years back and one year ahead
+        self.first_day = self.today - timedelta(days=730)
+        self.days = 1095
+
+    def _bulk(self, model, objs):
+        created = model.objects.using(self.using).bulk_create(objs, batch_size=self.batch_size)
+        self.stats.add(model._meta.model_name, len(created))
+        return created
+
+    def _report(self, message):
+        if self.progress:
+            self.progress(message)
+
+    def run(self):
+        with hotel_search_index.deferred(using=self.using), review_search_index.deferred(using=self.using):
+            with transaction.atomic(using=self.using):
+                amenities = self.amenities()
+                destinations = self.destinations()
+                hotels = self.hotels(destinations, amenities)
+                room_types = self.room_types(hotels)
+                users = self.users()
+            self.bookings(hotels, room_types, users)
+        self._report('rebuilding rollups and ratings')
+        analytics.backfill(self.first_day, self.first_day + timedelta(days=self.days + 31), using=self.using)
+        recompute_all(self.using)
+        reference_data.invalidate()
+        return self.stats
+
+    # Catalog
+
+    def amenities(self):
+        existing = set(Amenity.objects.using(self.using).values_list('name', flat=True))
+        self._bulk(Amenity, [Amenity(name=name, category=category) for name, category in AMENITIES if name not in existing])
+        return list(Amenity.objects.using(self.using).filter(name__in=[name for name, _ in AMENITIES]).order_by('name'))
+
+    def destinations(self):
+        objs = []
+        for i in range(self.counts.destinations):
+            city, country = CITIES[i % len(CITIES)]
+            if i >= len(CITIES):
+                city = f'{city} {i // len(CITIES) + 1}'
+            objs.append(Destination(
+                name=city, city=city, country=country, description=f'Discover {city}, {country}.',
+                is_featured=i < 6, external_id=f'gen-destination-{i}',
+            ))
+        return self._bulk(Destination, objs)
+
+    def hotels(self, destinations, amenities):
+        rng = self.rng
+        destination_of = Chooser(rng, destinations, zipf_weights(len(destinations), 0.8))
+        stars_of = Chooser(rng, *zip(*STARS))
+        type_of = Chooser(rng, *zip(*HOTEL_TYPES))
+        objs = []
+        for i in range(self.counts.hotels):
+            destination = destination_of()
+            name = f'{rng.choice(HOTEL_WORDS)} {rng.choice(HOTEL_WORDS)} {destination.city} {i}'
+            objs.append(Hotel(
+                name=name, destination=destination, address=f'{rng.randint(1, 400)} {rng.choice(HOTEL_WORDS)} Street',
+                latitude=Decimal(rng.uniform(-60, 70)).quantize(Decimal('0.000001')),
+                longitude=Decimal(rng.uniform(-180, 180)).quantize(Decimal('0.000001')),
+                star_rating=stars_of(), hotel_type=type_of(),
+                description=f'{name} offers comfortable rooms in the heart of {destination.city}.',
+                cancellation_policy='Free cancellation up to 48 hours before check-in',
+                external_id=f'gen-hotel-{i}',
+            ))
+        hotels = self._bulk(Hotel, objs)
+        links = []
+        for hotel in hotels:
+            # Better hotels list more amenities
+            for amenity in rng.sample(amenities, min(len(amenities), 3 + hotel.star_rating * 2 + rng.randint(0, 3))):
+                links.append(HotelAmenity(hotel=hotel, amenity=amenity))
+        self._bulk(HotelAmenity, links)
+        self._report(f'{len(hotels)} hotels')
+        return hotels
+
+    def room_types(self, hotels):
+        rng = self.rng
+        objs = []
+        for hotel in hotels:
+            base = Decimal(35 * hotel.star_rating) * Decimal(math.exp(rng.gauss(0, 0.25)))
+            kinds = rng.sample(ROOM_TYPES, rng.randint(2, 5))
+            for name, occupancy, bed, size, multiplier in sorted(kinds, key=lambda kind: kind[4]):
+                objs.append(RoomType(
+                    hotel=hotel, name=name, description=f'{name} room with {bed.lower()} bed',
+                    size_sqm=size + rng.randint(-3, 6), max_occupancy=occupancy, bed_type=bed,
+                    price_per_night=(base * multiplier).quantize(CENT), total_rooms=rng.randint(4, 40),
+                ))
+        return self._bulk(RoomType, objs)
+
+    def users(self):
+        rng = self.rng
+        password = make_password('benchmark')  # Hashing once keeps a million users cheap
+        User = get_user_model()
+        start = User.objects.using(self.using).count()
+        objs = []
+        for i in range(self.counts.users):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            username = f'gen{start + i}'
+            objs.append(User(
+                username=username, email=f'{username}@example.com', first_name=first, last_name=last,
+                password=password, phone=f'+1-555-{rng.randint(0, 9999):04d}',
+            ))
+        users = self._bulk(User, objs)
+        self._report(f'{len(users)} users')
+        return users
+
+    # Bookings and what follows from them
+
+    def bookings(self, hotels, room_types, users):
+        rng = self.rng
+        hotel_rooms = {}
+        for room_type in room_types:
+            hotel_rooms.setdefault(room_type.hotel_id, []).append(room_type)
+        hotel_of = Chooser(rng, hotels, zipf_weights(len(hotels), 0.7))
+        # Seasonal demand: summer and the December holidays peak
+        season = [1 + 0.5 * math.cos(2 * math.pi * (day - 200) / 365) + (0.4 if 350 <= day or day < 5 else 0)
+                  for day in range(366)]
+        day_of = Chooser(rng, list(range(self.days)),
+                         [season[(self.first_day + timedelta(days=d)).timetuple().tm_yday - 1] for d in range(self.days)])
+        method_of = Chooser(rng, *zip(*PAYMENT_METHODS))
+        occupancy = {room_type.pk: bytearray(self.days + 31) for room_type in room_types}
+        user_ids = [user.pk for user in users]
+        writers = {model: RowWriter(model, columns, self.using) for model, columns in (
+            (Booking, BOOKING_COLUMNS), (Payment, PAYMENT_COLUMNS), (Review, REVIEW_COLUMNS), (ReviewVote, VOTE_COLUMNS),
+        )}
+        ids = {model: writer.next_id() for model, writer in writers.items()}
+
+        made = 0
+        sold_out = 0
+        while made < self.counts.bookings and sold_out < MAX_SOLD_OUT_ATTEMPTS:
+            batch_end = min(made + self.batch_size, self.counts.bookings)
+            while made < batch_end and sold_out < MAX_SOLD_OUT_ATTEMPTS:
+                hotel = hotel_of()
+                rooms = hotel_rooms.get(hotel.pk)
+                if rooms and self._booking(rng, hotel, rng.choice(rooms), day_of, method_of, occupancy, user_ids, ids, writers):
+                    made += 1
+                    sold_out = 0
+                else:
+                    sold_out += 1
+            with transaction.atomic(using=self.using):
+                for model, writer in writers.items():
+                    self.stats.add(model._meta.model_name, writer.flush())
+            self._report(f'{made} bookings')
+        if made < self.counts.bookings:
+            self.stats.warnings.append(
+                f'Stopped at {made} of {self.counts.bookings} bookings: the catalog is sold out; add hotels'
+            )
+        for writer in writers.values():
+            writer.reset_sequence()
+
+    def _next(self, ids, model):
+        pk = ids[model]
+        ids[model] = pk + 1
+        return pk
+
+    def _booking(self, rng, hotel, room_type, day_of, method_of, occupancy, user_ids, ids, writers):
+        start = day_of()
+        nights = min(14, 1 + int(rng.expovariate(1 / 2.2)))
+        num_rooms = 1 if rng.random() < 0.92 else 2
+        nightly = occupancy[room_type.pk]
+        total_rooms = room_type.total_rooms
+        for day in range(start, start + nights):
+            if nightly[day] + num_rooms > total_rooms:
+                return False  # Sold out; demand simply goes elsewhere
+        check_in = self.first_day + timedelta(days=start)
+        check_out = check_in + timedelta(days=nights)
+        if check_out <= self.today:
+            status = 'cancelled' if rng.random() < 0.15 else 'completed'
+        elif check_in <= self.today + timedelta(days=2) or rng.random() < 0.94:
+            status = 'cancelled' if rng.random() < 0.12 else 'confirmed'
+        else:
+            status = 'pending'
+        if status != 'cancelled':
+            for day in range(start, start + nights):
+                nightly[day] += num_rooms
+        lead_days = min(int(rng.expovariate(1 / 30)), 300)
+        created_at = timezone.make_aware(
+            datetime.combine(check_in - timedelta(days=lead_days), time(rng.randint(0, 23), rng.randint(0, 59)))
+        )
+        if status == 'pending':
+            created_at = min(created_at, self.now - timedelta(minutes=rng.randint(1, 20)))
+        subtotal = room_type.price_per_night * nights * num_rooms
+        taxes = (subtotal * TAX_RATE).quantize(CENT)
+        total = subtotal + taxes
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        user_id = rng.choice(user_ids)
+        booking_id = self._next(ids, Booking)
+        reference = f'G{booking_id:09d}'
+        writers[Booking].add((
+            booking_id, reference, user_id, room_type.pk, check_in, check_out,
+            max(1, min(room_type.max_occupancy * num_rooms, 1 + int(rng.expovariate(0.8)))), num_rooms,
+            first, last, f'{first}.{last}@example.com'.lower(), f'+1-555-{rng.randint(0, 9999):04d}', '',
+            room_type.price_per_night, nights, subtotal, taxes, total, status, created_at, created_at,
+        ))
+
+        if status != 'pending':
+            method = method_of()
+            card = method != 'paypal'
+            writers[Payment].add((
+                self._next(ids, Payment), booking_id, total, method, f'TXN-{reference}',
+                'refunded' if status == 'cancelled' else 'completed',
+                f'{rng.randint(0, 9999):04d}' if card else '', rng.choice(CARD_BRANDS) if card else '',
+                created_at, created_at + timedelta(seconds=rng.randint(5, 90)),
+            ))
+        if status == 'completed' and rng.random() < self.counts.review_rate:
+            self._review(rng, hotel, booking_id, user_id, check_out, user_ids, ids, writers)
+        return True
+
+    def _review(self, rng, hotel, booking_id, user_id, check_out, user_ids, ids, writers):
+        overall = max(1, min(5, round(rng.gauss(2.3 + hotel.star_rating * 0.45, 0.9))))
+        sub = [max(1, min(5, overall + rng.choice((-1, 0, 0, 0, 1)))) for _ in range(4)]
+        written = timezone.make_aware(datetime.combine(check_out, time(12))) + timedelta(
+            days=int(rng.expovariate(1 / 5))
+        )
+        review_id = self._next(ids, Review)
+        voters = rng.sample(user_ids, min(len(user_ids), int(rng.expovariate(1 / self.counts.votes_per_review))))
+        helpful = 0
+        for voter in voters:
+            vote_type = 'helpful' if rng.random() < 0.75 else 'not_helpful'
+            helpful += vote_type == 'helpful'
+            writers[ReviewVote].add((
+                self._next(ids, ReviewVote), review_id, voter, vote_type, written + timedelta(days=rng.randint(0, 60)),
+            ))
+        writers[Review].add((
+            review_id, user_id, hotel.pk, booking_id, overall, *sub, rng.choice(REVIEW_TITLES[overall]),
+            ' '.join(rng.sample(REVIEW_PHRASES, 3)), True, helpful, len(voters) - helpful, written, written,
+        ))
+
+
+def generate(counts=None, seed=0, batch_size=DEFAULT_BATCH_SIZE, using='default', progress=None):
+    """Create a synthetic data set; returns ``GenerationStats``"""
+    return Generator(counts or Counts(), seed, batch_size, using, progress).run()
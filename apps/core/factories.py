@@ -0,0 +1,94 @@
+"""
+Builders for test data.
+
+Each ``make_*`` function saves one object with valid defaults for every
+required field; keyword arguments override them. Related objects that aren't
+passed are built as well, so ``make_booking()`` alone gives a booking with its
+guest, room type, hotel and destination. Usernames and hotel names are
+numbered so builders can be called repeatedly in one test.
+"""
+from datetime import timedelta
+from decimal import Decimal
+from itertools import count
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.bookings.models import Booking
+from apps.hotels.models import Destination, Hotel, RoomType
+from apps.reviews.models import Review
+
+TAX_RATE = Decimal('0.15')
+
+_sequence = count(1)
+
+
+def make_user(password='testpass123', **fields):
+    fields.setdefault('username', f'user{next(_sequence)}')
+    fields.setdefault('email', f'{fields["username"]}@example.com')
+    return get_user_model().objects.create_user(password=password, **fields)
+
+
+def make_destination(**fields):
+    fields.setdefault('name', 'Paris')
+    fields.setdefault('city', fields['name'])
+    fields.setdefault('country', 'France')
+    fields.setdefault('description', f'Visit {fields["name"]}')
+    return Destination.objects.create(**fields)
+
+
+def make_hotel(**fields):
+    if 'destination' not in fields and 'destination_id' not in fields:
+        fields['destination'] = make_destination()
+    fields.setdefault('name', f'Test Hotel {next(_sequence)}')
+    fields.setdefault('address', '1 Test Street')
+    fields.setdefault('star_rating', 4)
+    fields.setdefault('description', 'A test hotel')
+    fields.setdefault('cancellation_policy', 'Free cancellation up to 24 hours')
+    return Hotel.objects.create(**fields)
+
+
+def make_room_type(**fields):
+    if 'hotel' not in fields and 'hotel_id' not in fields:
+        fields['hotel'] = make_hotel()
+    fields.setdefault('name', 'Standard Room')
+    fields.setdefault('description', 'Comfortable standard room')
+    fields.setdefault('max_occupancy', 2)
+    fields.setdefault('bed_type', 'Queen Bed')
+    fields.setdefault('price_per_night', Decimal('150.00'))
+    fields.setdefault('total_rooms', 10)
+    return RoomType.objects.create(**fields)
+
+
+def make_booking(nights=5, **fields):
+    """A booking ``nights`` long starting a month from now, priced from its room type plus 15% tax"""
+    if 'user' not in fields:
+        fields['user'] = make_user()
+    if 'room_type' not in fields:
+        fields['room_type'] = make_room_type()
+    fields.setdefault('check_in', timezone.localdate() + timedelta(days=30))
+    fields.setdefault('check_out', fields['check_in'] + timedelta(days=nights))
+    fields.setdefault('num_guests', 2)
+    fields.setdefault('guest_first_name', 'John')
+    fields.setdefault('guest_last_name', 'Doe')
+    fields.setdefault('guest_email', 'john@example.com')
+    fields.setdefault('guest_phone', '+1-555-0123')
+    fields.setdefault('price_per_night', fields['room_type'].price_per_night)
+    fields.setdefault('num_nights', (fields['check_out'] - fields['check_in']).days)
+    fields.setdefault('subtotal', fields['price_per_night'] * fields['num_nights'] * fields.get('num_rooms', 1))
+    fields.setdefault('taxes', (fields['subtotal'] * TAX_RATE).quantize(Decimal('0.01')))
+    fields.setdefault('total_price', fields['subtotal'] + fields['taxes'])
+    return Booking.objects.create(**fields)
+
+
+def make_review(rating=4, **fields):
+    """A review giving ``rating`` in every category"""
+    if 'user' not in fields:
+        fields['user'] = make_user()
+    if 'hotel' not in fields:
+        fields['hotel'] = make_hotel()
+    for category in ('overall', 'cleanliness', 'location', 'service', 'value'):
+        fields.setdefault(f'{category}_rating', rating)
+    fields.setdefault('title', 'Nice stay')
+    fields.setdefault('content', 'Would stay again.')
+    return Review.objects.create(**fields)
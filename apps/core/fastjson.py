@@ -0,0 +1,44 @@
+"""
+JSON encoding for the high-volume read endpoints.
+
+orjson encodes dicts, lists, strings, numbers, dates and times in C, with no
+Python callback. Callers hand over JSON-ready data: decimals are already
+strings, as REST framework renders them (see ``apps.hotels.listing``).
+Datetimes use the same ``Z`` suffix for UTC as REST framework. Without orjson
+installed the stdlib encoder is used instead.
+"""
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(data):
+    """Encode ``data`` to UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class FastJSONResponse(HttpResponse):
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(dumps(data), **kwargs)
+
+
+class FastJSONRenderer(BaseRenderer):
+    """Drop-in for ``JSONRenderer`` on views whose data is already plain dicts"""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return dumps(data)
@@ -0,0 +1,174 @@
+"""
+SQLite FTS5 indexes kept in sync with their source tables by triggers.
+
+Each ``FullTextIndex`` describes an external-content FTS5 table shadowing a
+model's text columns. Lookups return primary keys ranked by BM25 so callers
+can page through ids before loading any rows. Backends without FTS5 fall back
+to ``icontains`` filtering.
+"""
+import re
+from contextlib import contextmanager
+
+from django.db import connections, router
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def build_match_query(text):
+    """Turn free text into an FTS5 query of quoted prefix terms"""
+    tokens = TOKEN_RE.findall(text or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+class FullTextIndex:
+    def __init__(self, model_label, columns, weights=None):
+        self.model_label = model_label
+        self.columns = list(columns)
+        self.weights = list(weights or [1.0] * len(self.columns))
+
+    @property
+    def model(self):
+        from django.apps import apps
+        return apps.get_model(self.model_label)
+
+    @property
+    def source_table(self):
+        return self.model._meta.db_table
+
+    @property
+    def table(self):
+        return f'{self.source_table}_fts'
+
+    def _connection(self, write=False):
+        route = router.db_for_write if write else router.db_for_read
+        return connections[route(self.model)]
+
+    def is_supported(self, connection=None):
+        return (connection or self._connection()).vendor == 'sqlite'
+
+    # Schema management
+
+    def create_sql(self, source_table=None):
+        source = source_table or self.source_table
+        table = f'{source}_fts'
+        cols = ', '.join(self.columns)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5({cols}, content='{source}', "
+            f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+            *self.trigger_sql(source),
+            f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+        ]
+
+    def trigger_sql(self, source_table=None):
+        source = source_table or self.source_table
+        table = f'{source}_fts'
+        cols = ', '.join(self.columns)
+        new_values = ', '.join(f'new.{c}' for c in self.columns)
+        old_values = ', '.join(f'old.{c}' for c in self.columns)
+        delete_row = (
+            f"INSERT INTO {table}({table}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+        )
+        insert_row = f'INSERT INTO {table}(rowid, {cols}) VALUES (new.id, {new_values});'
+        return [
+            f'CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {source} BEGIN {insert_row} END',
+            f'CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {source} BEGIN {delete_row} END',
+            f'CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF {cols} ON {source} '
+            f'BEGIN {delete_row} {insert_row} END',
+        ]
+
+    def drop_sql(self, source_table=None):
+        table = f'{source_table or self.source_table}_fts'
+        return [
+            *self.drop_trigger_sql(source_table),
+            f'DROP TABLE IF EXISTS {table}',
+        ]
+
+    def drop_trigger_sql(self, source_table=None):
+        table = f'{source_table or self.source_table}_fts'
+        return [f'DROP TRIGGER IF EXISTS {table}_{suffix}' for suffix in ('ai', 'ad', 'au')]
+
+    def install(self, schema_editor, source_table=None):
+        """Create the index and its triggers; safe to re-run after a table remake"""
+        if self.is_supported(schema_editor.connection):
+            for sql in self.create_sql(source_table):
+                schema_editor.execute(sql)
+
+    def uninstall(self, schema_editor, source_table=None):
+        if self.is_supported(schema_editor.connection):
+            for sql in self.drop_sql(source_table):
+                schema_editor.execute(sql)
+
+    def rebuild(self, using=None):
+        connection = connections[using] if using else self._connection(write=True)
+        if not self.is_supported(connection):
+            return
+        with connection.cursor() as cursor:
+            for sql in self.trigger_sql():
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    @contextmanager
+    def deferred(self, using=None):
+        """Drop the sync triggers for a bulk load and rebuild the index once at the end"""
+        connection = connections[using] if using else self._connection(write=True)
+        if not self.is_supported(connection):
+            yield
+            return
+        with connection.cursor() as cursor:
+            for sql in self.drop_trigger_sql():
+                cursor.execute(sql)
+        try:
+            yield
+        finally:
+            self.rebuild(using=connection.alias)
+
+    # Queries
+
+    def ranked_ids(self, text, limit=200):
+        """Primary keys matching ``text``, best BM25 score first"""
+        match = build_match_query(text)
+        if not match:
+            return []
+        connection = self._connection()
+        if not self.is_supported(connection):
+            return list(self.filter(self.model.objects.all(), text).values_list('pk', flat=True)[:limit])
+        weights = ', '.join(str(w) for w in self.weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s '
+                f'ORDER BY bm25({self.table}, {weights}) LIMIT %s',
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter(self, queryset, text):
+        """Restrict ``queryset`` to rows matching ``text``"""
+        return queryset.filter(self.q(text, queryset.db))
+
+    def q(self, text, using=None):
+        match = build_match_query(text)
+        if not match:
+            return Q(pk__in=[])
+        connection = connections[using] if using else self._connection()
+        if not self.is_supported(connection):
+            lookups = Q()
+            for column in self.columns:
+                lookups |= Q(**{f'{column}__icontains': text})
+            return lookups
+        return Q(pk__in=RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [match]))
+
+    def rank(self, text, using=None):
+        """BM25 score per row for ``text``, lower is better; NULL for rows that don't match"""
+        match = build_match_query(text)
+        connection = connections[using] if using else self._connection()
+        if not match or not self.is_supported(connection):
+            return Value(None, output_field=FloatField())
+        weights = ', '.join(str(w) for w in self.weights)
+        return RawSQL(
+            f'SELECT bm25({self.table}, {weights}) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = {self.source_table}.id',
+            [match],
+            output_field=FloatField(),
+        )
@@ -0,0 +1,74 @@
+"""
+Conditional GETs for rarely changing JSON resources.
+
+A view describes its resource with a ``Version``: a cache scope such as
+``hotel:12`` and the timestamps (and counts) that change whenever anything in
+the response does. The version is cheap to read, usually one indexed row or
+aggregate, so the ETag and Last-Modified are known before any serialization.
+Versions that include counts leave ``last_modified`` unset: a delete changes
+the count but no timestamp, and If-Modified-Since would then match a stale copy.
+A matching ``If-None-Match`` or ``If-Modified-Since`` is answered with 304
+straight away; otherwise the rendered body is served from the cache, keyed by
+the version, and only built on a miss. Stale bodies are never invalidated
+explicitly, a new version simply stops addressing them.
+"""
+import hashlib
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+DEFAULT_TIMEOUT = 3600
+
+
+@dataclass(frozen=True)
+class Version:
+    scope: str
+    stamps: tuple
+    last_modified: object = None  # Aware datetime, the newest of the stamps when all are timestamps
+
+    @property
+    def digest(self):
+        raw = '|'.join(str(stamp) for stamp in self.stamps)
+        return hashlib.sha1(f'{self.scope}|{raw}'.encode()).hexdigest()
+
+    @property
+    def etag(self):
+        return f'"{self.digest}"'
+
+    @property
+    def cache_key(self):
+        return f'httpcache:{self.scope}:{self.digest}'
+
+
+def latest(*stamps):
+    """Newest of the non-null timestamps, for ``Version.last_modified``"""
+    present = [stamp for stamp in stamps if stamp is not None]
+    return max(present) if present else None
+
+
+def conditional_json(request, version, build):
+    """
+    Respond to a GET for the resource identified by ``version``.
+
+    ``build`` returns the response data and is only called when neither the
+    client nor the cache holds the current version.
+    """
+    last_modified = int(version.last_modified.timestamp()) if version.last_modified else None
+    response = get_conditional_response(request, etag=version.etag, last_modified=last_modified)
+    if response is None:
+        body = cache.get(version.cache_key)
+        if body is None:
+            body = JSONRenderer().render(build())
+            cache.set(version.cache_key, body, getattr(settings, 'HTTP_CACHE_TIMEOUT', DEFAULT_TIMEOUT))
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = version.etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    # Clients may keep the body but must revalidate, which costs one version lookup
+    patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+    return response
@@ -0,0 +1,199 @@
+"""
+Per-request query and latency instrumentation.
+
+Every database connection gets an execute wrapper when it is opened. The
+wrapper is a pass-through unless a request is being recorded, which is
+signalled through a context variable, so queries issued from the threads used
+by ``sync_to_async`` and ``aio.gather_queries`` are still attributed to the
+request that started them.
+
+Each process keeps a bounded window of recent samples per view in
+``request_stats`` and publishes it to the shared cache every
+``REQUEST_STATS_PUBLISH_SECONDS``, where ``dump_hotspots`` merges the windows
+of all workers. With the default locmem cache only the current process is
+visible; use the file cache (``CACHE_BACKEND=file``) to collect every worker
+on a host.
+"""
+import contextvars
+import os
+import re
+import socket
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+
+PUBLISHED_KEY = 'request-stats:processes'
+PROCESS_KEY = f'request-stats:{socket.gethostname()}:{os.getpid()}'
+
+_recorder = contextvars.ContextVar('query_recorder', default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN \((?:[^()]*)\)', re.IGNORECASE)
+_SPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """SQL with literals and IN lists collapsed, so repeats of one query compare equal"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _SPACE.sub(' ', sql).strip()
+
+
+class QueryRecorder:
+    """
+    Queries recorded here also count towards the enclosing recording, if any.
+    ``lock_wait`` is the time spent in ``BEGIN``: with SQLite's IMMEDIATE
+    transactions that is the wait for the database write lock.
+    """
+    __slots__ = ('count', 'duration', 'lock_wait', 'statements', 'parent', '_lock')
+
+    def __init__(self, parent=None):
+        self.count = 0
+        self.duration = 0.0
+        self.lock_wait = 0.0
+        self.statements = Counter()
+        self.parent = parent
+        self._lock = threading.Lock()
+
+    def add(self, sql, duration):
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.statements[sql] += 1
+            if sql.startswith('BEGIN'):
+                self.lock_wait += duration
+        if self.parent is not None:
+            self.parent.add(sql, duration)
+
+    def duplicates(self):
+        """``{fingerprint: count}`` for statements run more than once"""
+        repeated = Counter()
+        for sql, count in self.statements.items():
+            repeated[fingerprint(sql)] += count
+        return {fp: count for fp, count in repeated.items() if count > 1}
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.add(sql, time.perf_counter() - started)
+
+
+def install_wrapper(sender, connection, **kwargs):
+    """``connection_created`` receiver"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def start_recording():
+    recorder = QueryRecorder(parent=_recorder.get())
+    return recorder, _recorder.set(recorder)
+
+
+def stop_recording(token):
+    _recorder.reset(token)
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class RequestStats:
+    """Rolling per-view samples of (wall ms, db ms, queries, duplicate queries)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._duplicates = {}
+        self._published_at = time.monotonic()
+
+    @property
+    def window(self):
+        return getattr(settings, 'REQUEST_STATS_WINDOW', 1000)
+
+    def add(self, view, wall_ms, db_ms, queries, duplicates):
+        with self._lock:
+            samples = self._samples.get(view)
+            if samples is None:
+                samples = self._samples[view] = deque(maxlen=self.window)
+                self._duplicates[view] = Counter()
+            samples.append((wall_ms, db_ms, queries, sum(duplicates.values())))
+            self._duplicates[view].update(duplicates)
+            publish = time.monotonic() - self._published_at >= getattr(settings, 'REQUEST_STATS_PUBLISH_SECONDS', 10)
+            if publish:
+                self._published_at = time.monotonic()
+        if publish:
+            self.publish()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view: {'samples': list(samples), 'duplicates': dict(self._duplicates[view].most_common(5))}
+                for view, samples in self._samples.items()
+            }
+
+    def publish(self):
+        """Share this process's window with ``dump_hotspots``"""
+        timeout = getattr(settings, 'REQUEST_STATS_RETENTION_SECONDS', 3600)
+        cache.set(PROCESS_KEY, self.snapshot(), timeout)
+        processes = cache.get(PUBLISHED_KEY) or set()
+        if PROCESS_KEY not in processes:
+            cache.set(PUBLISHED_KEY, processes | {PROCESS_KEY}, timeout)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._duplicates.clear()
+
+
+def collected_snapshots():
+    """Published windows of every live process, including this one"""
+    request_stats.publish()
+    keys = cache.get(PUBLISHED_KEY) or set()
+    return [snapshot for snapshot in cache.get_many(keys).values()]
+
+
+def summarize(snapshots):
+    """Merge process windows into one row per view"""
+    merged = {}
+    for snapshot in snapshots:
+        for view, data in snapshot.items():
+            entry = merged.setdefault(view, {'samples': [], 'duplicates': Counter()})
+            entry['samples'].extend(data['samples'])
+            entry['duplicates'].update(data['duplicates'])
+    rows = []
+    for view, entry in merged.items():
+        samples = entry['samples']
+        wall = sorted(sample[0] for sample in samples)
+        rows.append({
+            'view': view,
+            'requests': len(samples),
+            'p50_ms': round(_percentile(wall, 50), 2),
+            'p95_ms': round(_percentile(wall, 95), 2),
+            'p99_ms': round(_percentile(wall, 99), 2),
+            'db_ms': round(statistics.fmean(sample[1] for sample in samples), 2),
+            'queries': round(statistics.fmean(sample[2] for sample in samples), 1),
+            'max_queries': max(sample[2] for sample in samples),
+            'duplicates': round(statistics.fmean(sample[3] for sample in samples), 1),
+            'top_duplicates': entry['duplicates'].most_common(3),
+        })
+    return rows
+
+
+request_stats = RequestStats()
@@ -0,0 +1,287 @@
+"""
+Minimal asyncio HTTP/1.1 load generator for the benchmark commands.
+
+``run_load`` has each virtual client hold one keep-alive connection and
+issue GETs to one URL back to back until the deadline. ``run_mix`` replays a
+traffic model instead: every client draws its next step from weighted
+``Action``s, either a GET or a blocking callable run in a worker thread, with
+optional think time in between. Database and lock-wait time reported by the
+server in ``Server-Timing`` are summed per action. Only the standard library
+is used so benchmarks run wherever the app does.
+"""
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+NETWORK_ERRORS = (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError)
+
+
+@dataclass
+class LoadResult:
+    url: str
+    duration: float
+    latencies: list = field(default_factory=list)  # Seconds, successful requests only
+    errors: int = 0
+    statuses: dict = field(default_factory=dict)
+    db_time: float = 0.0  # Seconds, from Server-Timing
+    lock_wait: float = 0.0
+
+    @property
+    def requests(self):
+        return len(self.latencies)
+
+    @property
+    def rps(self):
+        return self.requests / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self):
+        attempts = self.requests + self.errors
+        return self.errors / attempts if attempts else 0.0
+
+    def percentile(self, pct):
+        if not self.latencies:
+            return 0.0
+        if len(self.latencies) == 1:
+            return self.latencies[0] * 1000
+        return statistics.quantiles(self.latencies, n=100)[pct - 1] * 1000
+
+    def as_dict(self):
+        return {
+            'url': self.url,
+            'requests': self.requests,
+            'errors': self.errors,
+            'error_rate': round(self.error_rate, 4),
+            'rps': round(self.rps, 1),
+            'p50_ms': round(self.percentile(50), 2),
+            'p95_ms': round(self.percentile(95), 2),
+            'p99_ms': round(self.percentile(99), 2),
+            'db_ms': round(self.db_time * 1000 / self.requests, 2) if self.requests else 0.0,
+            'lock_wait_s': round(self.lock_wait, 3),
+            'statuses': {str(status): count for status, count in self.statuses.items()},
+        }
+
+
+@dataclass
+class Action:
+    """One kind of step in a traffic mix: a GET of ``path(rng)`` or a blocking ``call(rng)``"""
+    name: str
+    weight: float
+    path: Optional[Callable] = None
+    call: Optional[Callable] = None  # May return ``{'db': ms, 'lock': ms}`` like Server-Timing
+
+
+def parse_server_timing(value):
+    """``{'db': 1.2, ...}`` in milliseconds from a Server-Timing header"""
+    timings = {}
+    for metric in value.split(','):
+        name, _, params = metric.strip().partition(';')
+        for param in params.split(';'):
+            key, _, number = param.strip().partition('=')
+            if key == 'dur':
+                try:
+                    timings[name] = float(number)
+                except ValueError:
+                    pass
+    return timings
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    return status, headers
+
+
+class _Connection:
+    """A keep-alive connection that reopens itself after errors or ``Connection: close``"""
+
+    def __init__(self, host, port, headers=None):
+        self.host = host
+        self.port = port
+        self.prefix = f'Host: {host}:{port}\r\nAccept: application/json\r\n' + ''.join(
+            f'{name}: {value}\r\n' for name, value in (headers or {}).items()
+        )
+        self.reader = self.writer = None
+
+    async def get(self, path):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            self.writer.write(f'GET {path} HTTP/1.1\r\n{self.prefix}\r\n'.encode('latin-1'))
+            await self.writer.drain()
+            status, headers = await _read_response(self.reader)
+        except NETWORK_ERRORS:
+            self.close()
+            raise
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, headers
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def _add_timing(result, timings):
+    result.db_time += timings.get('db', 0.0) / 1000
+    result.lock_wait += timings.get('lock', 0.0) / 1000
+
+
+def _record(result, status, headers, latency):
+    result.statuses[status] = result.statuses.get(status, 0) + 1
+    if status < 400:
+        result.latencies.append(latency)
+        _add_timing(result, parse_server_timing(headers.get('server-timing', '')))
+    else:
+        result.errors += 1
+
+
+async def _client(url, deadline, result, headers):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    connection = _Connection(parts.hostname, parts.port or 80, headers)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            status, response_headers = await connection.get(path)
+        except NETWORK_ERRORS:
+            result.errors += 1
+            await asyncio.sleep(0.01)
+            continue
+        _record(result, status, response_headers, time.perf_counter() - started)
+    connection.close()
+
+
+async def run_load(url, concurrency=50, duration=10.0, headers=None):
+    """Hammer ``url`` with ``concurrency`` keep-alive clients for ``duration`` seconds"""
+    result = LoadResult(url=url, duration=duration)
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(_client(url, deadline, result, headers) for _ in range(concurrency)))
+    return result
+
+
+async def _mix_client(base_url, actions, cumulative, results, deadline, rng, think, headers):
+    parts = urlsplit(base_url)
+    prefix = parts.path.rstrip('/')
+    connection = _Connection(parts.hostname, parts.port or 80, headers)
+    while time.perf_counter() < deadline:
+        action = rng.choices(actions, cum_weights=cumulative)[0]
+        result = results[action.name]
+        started = time.perf_counter()
+        if action.call is not None:
+            try:
+                timings = await asyncio.to_thread(action.call, rng)
+            except Exception as exc:
+                result.errors += 1
+                result.statuses[type(exc).__name__] = result.statuses.get(type(exc).__name__, 0) + 1
+            else:
+                result.latencies.append(time.perf_counter() - started)
+                result.statuses['ok'] = result.statuses.get('ok', 0) + 1
+                _add_timing(result, timings or {})
+        else:
+            try:
+                status, response_headers = await connection.get(prefix + action.path(rng))
+            except NETWORK_ERRORS:
+                result.errors += 1
+                await asyncio.sleep(0.01)
+                continue
+            _record(result, status, response_headers, time.perf_counter() - started)
+        if think:
+            await asyncio.sleep(rng.expovariate(1 / think))
+    connection.close()
+
+
+async def run_mix(base_url, actions, concurrency=50, duration=10.0, think=0.0, seed=0, headers=None):
+    """
+    Replay weighted ``actions`` from ``concurrency`` clients for ``duration``
+    seconds, each pausing a random ``think`` seconds on average between steps.
+    Returns ``{action name: LoadResult}``.
+    """
+    results = {action.name: LoadResult(url=action.name, duration=duration) for action in actions}
+    cumulative = list(accumulate(action.weight for action in actions))
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        _mix_client(base_url, actions, cumulative, results, deadline, random.Random(seed * 100003 + i), think, headers)
+        for i in range(concurrency)
+    ))
+    return results
+
+
+def merge(results, name='total'):
+    """One ``LoadResult`` adding up several"""
+    total = LoadResult(url=name, duration=max((r.duration for r in results), default=0.0))
+    for result in results:
+        total.latencies.extend(result.latencies)
+        total.errors += result.errors
+        total.db_time += result.db_time
+        total.lock_wait += result.lock_wait
+        for status, count in result.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + count
+    return total
+
+
+def wait_for_port(host, port, timeout=30.0):
+    """Block until something accepts connections on host:port"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+SERVERS = {
+    'uvicorn': lambda host, port, workers, threads: [
+        sys.executable, '-m', 'uvicorn', 'travel_portal_backend.asgi:application',
+        '--host', host, '--port', str(port), '--workers', str(workers), '--log-level', 'warning', '--no-access-log',
+    ],
+    'gunicorn': lambda host, port, workers, threads: [
+        sys.executable, '-m', 'gunicorn', 'travel_portal_backend.wsgi:application',
+        '--bind', f'{host}:{port}', '--workers', str(workers), '--threads', str(threads), '--log-level', 'warning',
+    ],
+}
+
+
+def start_server(base_url, server='uvicorn', workers=1, threads=1, timeout=30.0):
+    """
+    Launch this project under ``server`` (ASGI uvicorn or WSGI gunicorn) at
+    ``base_url``, with the Server-Timing headers the reports read switched on
+    """
+    parts = urlsplit(base_url)
+    port = parts.port or 80
+    env = {**os.environ, 'REQUEST_STATS_HEADERS': 'True'}
+    process = subprocess.Popen(SERVERS[server](parts.hostname, port, workers, threads), env=env)
+    deadline = time.monotonic() + timeout
+    # Fail fast when the server exits, e.g. because it is not installed
+    while process.poll() is None and time.monotonic() < deadline:
+        if wait_for_port(parts.hostname, port, timeout=0.5):
+            return process
+    process.terminate()
+    process.wait()
+    raise RuntimeError(f'{server} did not start')
@@ -0,0 +1,64 @@
+import asyncio
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.loadgen import run_load, start_server
+from apps.hotels.models import Hotel
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare requests per second of the sync and async read endpoints under many '
+        'concurrent clients. Point --base-url at a running ASGI server, or pass --serve '
+        'to start uvicorn for the run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--serve', action='store_true', help='Start uvicorn on --base-url for the run')
+        parser.add_argument('--workers', type=int, default=1, help='uvicorn workers with --serve')
+        parser.add_argument('--concurrency', type=int, default=64)
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per endpoint')
+        parser.add_argument('--query', default='hotel', help='Search text and autocomplete prefix')
+        parser.add_argument('--hotel', type=int, help='Hotel for availability and reviews (default: first active)')
+
+    def handle(self, *args, **options):
+        hotel = options['hotel'] or Hotel.objects.filter(is_active=True).order_by('pk').values_list('pk', flat=True).first()
+        if hotel is None:
+            raise CommandError('No active hotels; load some data first')
+        check_in = timezone.localdate() + timedelta(days=30)
+        stay = f'check_in={check_in}&check_out={check_in + timedelta(days=2)}'
+        query = options['query']
+        endpoints = [
+            ('autocomplete', f'/api/hotels/autocomplete/?q={query[:3]}', f'/api/hotels/async/autocomplete/?q={query[:3]}'),
+            ('hotel search', f'/api/hotels/search/?q={query}', f'/api/hotels/async/search/?q={query}'),
+            ('availability', f'/api/hotels/{hotel}/availability/?{stay}', f'/api/hotels/async/{hotel}/availability/?{stay}'),
+            ('review feed', f'/api/reviews/feed/?hotel={hotel}', f'/api/reviews/async/feed/?hotel={hotel}'),
+        ]
+
+        base = options['base_url'].rstrip('/')
+        server = self._serve(base, options['workers']) if options['serve'] else None
+        try:
+            self.stdout.write(
+                f'{options["concurrency"]} clients, {options["duration"]:g}s per endpoint\n'
+                f'{"endpoint":<14}{"sync rps":>10}{"async rps":>11}{"sync p95":>10}{"async p95":>11}{"errors":>8}'
+            )
+            for name, sync_path, async_path in endpoints:
+                sync = asyncio.run(run_load(base + sync_path, options['concurrency'], options['duration']))
+                async_ = asyncio.run(run_load(base + async_path, options['concurrency'], options['duration']))
+                self.stdout.write(
+                    f'{name:<14}{sync.rps:>10,.0f}{async_.rps:>11,.0f}'
+                    f'{sync.percentile(95):>10.1f}{async_.percentile(95):>11.1f}{sync.errors + async_.errors:>8}'
+                )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    def _serve(self, base, workers):
+        try:
+            return start_server(base, 'uvicorn', workers)
+        except RuntimeError:
+            raise CommandError('uvicorn did not start; is it installed (requirements-asgi.txt)?')
@@ -0,0 +1,174 @@
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from apps.bookings.models import Booking
+from apps.hotels.models import Destination, Hotel, RoomType
+from apps.reviews.models import Review
+
+ALIAS = 'sqlite_bench'
+
+# Django's defaults on a rollback-journal database versus the configured profile
+PROFILES = {
+    'stock': {'CONN_MAX_AGE': 0, 'OPTIONS': {'init_command': 'PRAGMA journal_mode=DELETE'}},
+    'tuned': {
+        'CONN_MAX_AGE': settings.DATABASES['default'].get('CONN_MAX_AGE', 0),
+        'OPTIONS': settings.SQLITE_OPTIONS,
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure concurrent read/write throughput on the booking and review tables of a '
+        'scratch SQLite database, with stock settings and with the tuned profile'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per profile')
+        parser.add_argument('--profile', choices=sorted(PROFILES), action='append', help='Default: all profiles')
+        parser.add_argument('--hotels', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as workdir:
+            template = Path(workdir) / 'template.sqlite3'
+            self._configure(template, PROFILES['stock'])
+            call_command('migrate', database=ALIAS, verbosity=0)
+            fixtures = self._seed(options['hotels'])
+            connections[ALIAS].close()
+
+            self.stdout.write(f'{"profile":<8}{"reads/s":>10}{"writes/s":>10}{"read p95 ms":>13}{"write p95 ms":>14}{"locked":>8}')
+            for name in options['profile'] or sorted(PROFILES):
+                database = Path(workdir) / f'{name}.sqlite3'
+                shutil.copy(template, database)
+                self._configure(database, PROFILES[name])
+                result = self._run(fixtures, options['readers'], options['writers'], options['duration'])
+                self.stdout.write(
+                    f'{name:<8}{result["reads"]:>10,.0f}{result["writes"]:>10,.0f}'
+                    f'{result["read_p95"]:>13.1f}{result["write_p95"]:>14.1f}{result["locked"]:>8}'
+                )
+            connections[ALIAS].close()
+            del connections.settings[ALIAS]
+
+    def _configure(self, path, profile):
+        if ALIAS in connections.settings:
+            connections[ALIAS].close()
+        databases = {
+            'default': settings.DATABASES['default'],
+            ALIAS: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(path), **profile},
+        }
+        connections.settings[ALIAS] = connections.configure_settings(databases)[ALIAS]
+
+    def _seed(self, hotel_count):
+        User = get_user_model()
+        users = User.objects.db_manager(ALIAS).bulk_create(
+            User(username=f'bench{i}', email=f'bench{i}@example.com') for i in range(50)
+        )
+        destination = Destination.objects.using(ALIAS).create(
+            name='Bench', city='Bench', country='Benchland', description='Benchmark data'
+        )
+        hotels = Hotel.objects.using(ALIAS).bulk_create(
+            Hotel(name=f'Bench Hotel {i}', destination=destination, address=f'{i} Bench St',
+                  star_rating=3, description='Benchmark hotel', cancellation_policy='Flexible')
+            for i in range(hotel_count)
+        )
+        room_types = RoomType.objects.using(ALIAS).bulk_create(
+            RoomType(hotel=hotel, name='Double', description='Double room', max_occupancy=2,
+                     bed_type='Double', price_per_night=Decimal('100.00'), total_rooms=20)
+            for hotel in hotels
+        )
+        return {
+            'users': [user.pk for user in users],
+            'hotels': [hotel.pk for hotel in hotels],
+            'room_types': [(rt.pk, rt.hotel_id) for rt in room_types],
+        }
+
+    def _run(self, fixtures, readers, writers, duration):
+        deadline = time.perf_counter() + duration
+        results = {'read': [], 'write': [], 'locked': 0}
+        lock = threading.Lock()
+
+        def worker(kind):
+            rng = random.Random()
+            timings, locked = [], 0
+            operation = self._write if kind == 'write' else self._read
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        operation(rng, fixtures)
+                    except OperationalError:
+                        locked += 1
+                        continue
+                    timings.append((time.perf_counter() - started) * 1000)
+                    # What request_finished does, so CONN_MAX_AGE takes effect
+                    connections[ALIAS].close_if_unusable_or_obsolete()
+            finally:
+                connections[ALIAS].close()
+            with lock:
+                results[kind].extend(timings)
+                results['locked'] += locked
+
+        threads = [threading.Thread(target=worker, args=('read',)) for _ in range(readers)]
+        threads += [threading.Thread(target=worker, args=('write',)) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {
+            'reads': len(results['read']) / duration,
+            'writes': len(results['write']) / duration,
+            'read_p95': _p95(results['read']),
+            'write_p95': _p95(results['write']),
+            'locked': results['locked'],
+        }
+
+    def _read(self, rng, fixtures):
+        room_type_id, hotel_id = rng.choice(fixtures['room_types'])
+        check_in = date.today() + timedelta(days=rng.randrange(60))
+        Booking.objects.using(ALIAS).filter(
+            room_type_id=room_type_id, status__in=['confirmed', 'pending'],
+            check_in__lt=check_in + timedelta(days=2), check_out__gt=check_in,
+        ).count()
+        list(Review.objects.using(ALIAS).filter(hotel_id=hotel_id).order_by('-created_at')[:20])
+
+    def _write(self, rng, fixtures):
+        room_type_id, hotel_id = rng.choice(fixtures['room_types'])
+        user_id = rng.choice(fixtures['users'])
+        check_in = date.today() + timedelta(days=rng.randrange(60))
+        with transaction.atomic(using=ALIAS):
+            if rng.random() < 0.5:
+                Booking.objects.using(ALIAS).create(
+                    user_id=user_id, room_type_id=room_type_id, check_in=check_in,
+                    check_out=check_in + timedelta(days=2), num_guests=2, guest_first_name='Bench',
+                    guest_last_name='Guest', guest_email='bench@example.com', guest_phone='+1-555-0100',
+                    price_per_night=Decimal('100.00'), num_nights=2, subtotal=Decimal('200.00'),
+                    taxes=Decimal('0.00'), total_price=Decimal('200.00'), status='confirmed',
+                )
+            else:
+                rating = rng.randint(1, 5)
+                Review.objects.using(ALIAS).create(
+                    user_id=user_id, hotel_id=hotel_id, overall_rating=rating, cleanliness_rating=rating,
+                    location_rating=rating, service_rating=rating, value_rating=rating,
+                    title='Benchmark stay', content='Written by the SQLite benchmark',
+                )
+
+
+def _p95(timings):
+    if len(timings) < 2:
+        return timings[0] if timings else 0.0
+    return statistics.quantiles(timings, n=20)[-1]
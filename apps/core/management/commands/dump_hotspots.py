@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.core.instrumentation import collected_snapshots, summarize
+
+SORT_KEYS = ('p95_ms', 'p99_ms', 'p50_ms', 'queries', 'duplicates', 'db_ms', 'requests')
+
+
+class Command(BaseCommand):
+    help = (
+        'Show the slowest and chattiest views from the request stats published by running workers. '
+        'Workers share stats through the cache, so run with the same CACHE_BACKEND as the servers.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', choices=SORT_KEYS, default='p95_ms')
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--json', action='store_true', help='Print rows as JSON')
+
+    def handle(self, *args, **options):
+        rows = sorted(summarize(collected_snapshots()), key=lambda row: row[options['sort']], reverse=True)
+        rows = rows[:options['limit']]
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        if not rows:
+            self.stdout.write('No requests recorded yet')
+            return
+        self.stdout.write(
+            f'{"view":<36}{"reqs":>7}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"db ms":>8}{"queries":>9}{"max":>6}{"dups":>6}'
+        )
+        for row in rows:
+            self.stdout.write(
+                f'{row["view"][:35]:<36}{row["requests"]:>7}{row["p50_ms"]:>9.1f}{row["p95_ms"]:>9.1f}'
+                f'{row["p99_ms"]:>9.1f}{row["db_ms"]:>8.1f}{row["queries"]:>9.1f}{row["max_queries"]:>6}'
+                f'{row["duplicates"]:>6.1f}'
+            )
+            for statement, count in row['top_duplicates']:
+                self.stdout.write(f'    {count:>5}x {statement[:110]}')
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.datagen import DEFAULT_BATCH_SIZE, Counts, generate
+from apps.hotels.models import Hotel
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill an empty database with deterministic synthetic destinations, hotels, users, '
+        'bookings, payments and reviews for benchmarking. The same --seed and counts give '
+        'the same data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--destinations', type=int, default=30)
+        parser.add_argument('--hotels', type=int, default=1000)
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--bookings', type=int, default=100000)
+        parser.add_argument('--review-rate', type=float, default=0.3, help='Share of completed stays reviewed')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Rows per INSERT and per transaction')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if Hotel.objects.using(using).filter(external_id__startswith='gen-').exists():
+            raise CommandError('Synthetic data is already loaded; run flush first for a reproducible data set')
+        counts = Counts(
+            destinations=options['destinations'], hotels=options['hotels'], users=options['users'],
+            bookings=options['bookings'], review_rate=options['review_rate'],
+        )
+        started = time.perf_counter()
+        stats = generate(counts, options['seed'], options['batch_size'], using, progress=self._progress)
+        for kind, n in stats.created.items():
+            self.stdout.write(f'{kind:<14}{n:>12,}')
+        for warning in stats.warnings:
+            self.stderr.write(self.style.WARNING(warning))
+        self.stdout.write(self.style.SUCCESS(f'Generated data in {time.perf_counter() - started:.1f}s'))
+
+    def _progress(self, message):
+        self.stdout.write(message)
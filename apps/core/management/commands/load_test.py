@@ -0,0 +1,102 @@
+import asyncio
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.core.loadgen import SERVERS, merge, run_mix, start_server
+from apps.core.traffic import DEFAULT_MIX, LockSampler, Traffic, parse_mix
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a mix of searches, hotel pages, availability checks, review reads and bookings '
+        'against a running server and report throughput, latency percentiles, error rates and '
+        'database lock-wait time. Point --base-url at a server, or pass --serve to start one. '
+        'Database and lock-wait times need REQUEST_STATS_HEADERS on the server; --serve enables it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--serve', choices=sorted(SERVERS), help='Start this server on --base-url for the run')
+        parser.add_argument('--workers', type=int, default=1, help='Server processes with --serve')
+        parser.add_argument('--threads', type=int, default=4, help='Threads per gunicorn worker with --serve')
+        parser.add_argument('--concurrency', type=int, default=32, help='Virtual users')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds')
+        parser.add_argument('--think', type=float, default=0, help='Mean pause between a user\'s requests, in ms')
+        parser.add_argument('--mix', default='', help=(
+            'Action weights, e.g. search=30,booking=10; unlisted actions keep their default '
+            f'({", ".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())})'
+        ))
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--json', help='Write the results to this file as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            mix = {**DEFAULT_MIX, **parse_mix(options['mix'])} if options['mix'] else DEFAULT_MIX
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        traffic = Traffic()
+        if not traffic.hotels:
+            raise CommandError('No active hotels; run generate_data first')
+        actions = traffic.actions(mix)
+
+        base = options['base_url'].rstrip('/')
+        server = None
+        if options['serve']:
+            try:
+                server = start_server(base, options['serve'], options['workers'], options['threads'])
+            except RuntimeError:
+                raise CommandError(f'{options["serve"]} did not start; is it installed?')
+        sampler = LockSampler() if connection.vendor == 'postgresql' else None
+        try:
+            if sampler is not None:
+                sampler.start()
+            results = asyncio.run(run_mix(
+                base, actions, options['concurrency'], options['duration'], options['think'] / 1000, options['seed'],
+            ))
+        finally:
+            sampled_lock_wait = sampler.stop() if sampler is not None else None
+            if server is not None:
+                server.terminate()
+                server.wait()
+            traffic.cleanup()
+
+        total = merge(results.values())
+        self._print(options, actions, results, total, sampled_lock_wait)
+        if options['json']:
+            report = {
+                'base_url': base,
+                'concurrency': options['concurrency'],
+                'duration': options['duration'],
+                'think_ms': options['think'],
+                'mix': {action.name: action.weight for action in actions},
+                'actions': {name: result.as_dict() for name, result in results.items()},
+                'total': total.as_dict(),
+                'sampled_lock_wait_s': sampled_lock_wait,
+            }
+            with open(options['json'], 'w') as f:
+                json.dump(report, f, indent=2)
+                f.write('\n')
+
+    def _print(self, options, actions, results, total, sampled_lock_wait):
+        weights = sum(action.weight for action in actions)
+        self.stdout.write(
+            f'{options["concurrency"]} users for {options["duration"]:g}s, mix: '
+            + ', '.join(f'{action.name} {action.weight / weights:.0%}' for action in actions)
+        )
+        self.stdout.write(
+            f'{"action":<14}{"requests":>9}{"rps":>8}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}'
+            f'{"errors":>8}{"db ms":>8}{"lock s":>8}'
+        )
+        for result in [*results.values(), total]:
+            row = result.as_dict()
+            self.stdout.write(
+                f'{row["url"]:<14}{row["requests"]:>9}{row["rps"]:>8.1f}{row["p50_ms"]:>9.1f}{row["p95_ms"]:>9.1f}'
+                f'{row["p99_ms"]:>9.1f}{row["error_rate"]:>8.1%}{row["db_ms"]:>8.1f}{row["lock_wait_s"]:>8.2f}'
+            )
+        failures = {status: count for status, count in total.statuses.items() if status != 'ok' and str(status)[0] not in '123'}
+        if failures:
+            self.stdout.write(f'failures: {", ".join(f"{status} x{count}" for status, count in failures.items())}')
+        if sampled_lock_wait is not None:
+            self.stdout.write(f'backend lock wait sampled from pg_stat_activity: {sampled_lock_wait:.2f}s')
@@ -0,0 +1,72 @@
+import statistics
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.profiling import folded, load_profiles
+
+
+class Command(BaseCommand):
+    help = (
+        'Summarize the request profiles saved by ProfilingMiddleware, list them, or merge their '
+        'stacks into folded flame-graph input (flamegraph.pl, inferno, speedscope)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=('summary', 'list', 'folded'), default='summary')
+        parser.add_argument('--output', help='Write to this file instead of stdout')
+        parser.add_argument('--dir', help='Profile directory (default: PROFILING_DIR)')
+        parser.add_argument('--view', help='Only profiles of this view name, e.g. hotels:search')
+        parser.add_argument('--url', help='Only profiles whose URL contains this text')
+        parser.add_argument('--min-ms', type=float, default=0, help='Only requests at least this slow')
+        parser.add_argument('--trigger', choices=('slow', 'sample'), help='Only profiles kept for this reason')
+        parser.add_argument('--weight', choices=('ms', 'samples'), default='ms', help='Folded stack values')
+
+    def handle(self, *args, **options):
+        profiles = [
+            profile for profile in load_profiles(options['dir'])
+            if (not options['view'] or profile['view'] == options['view'])
+            and (not options['url'] or options['url'] in profile['url'])
+            and (not options['trigger'] or profile['trigger'] == options['trigger'])
+            and profile['duration_ms'] >= options['min_ms']
+        ]
+        if not profiles:
+            raise CommandError('No matching profiles; enable PROFILING_ENABLED and send some traffic first')
+        lines = getattr(self, f'_{options["format"]}')(profiles, options)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+            self.stdout.write(f'Wrote {len(profiles)} profiles to {options["output"]}')
+        else:
+            for line in lines:
+                self.stdout.write(line)
+
+    def _folded(self, profiles, options):
+        return folded(profiles, options['weight'])
+
+    def _list(self, profiles, options):
+        lines = [f'{"when":<20}{"ms":>9}{"orm":>8}{"ser":>8}{"queries":>9}  {"status":<7}url']
+        for profile in profiles:
+            time_ms = profile['time_ms']
+            queries = sum(query['count'] for query in profile['queries'])
+            lines.append(
+                f'{profile["timestamp"][:19]:<20}{profile["duration_ms"]:>9.1f}{time_ms["orm"]:>8.1f}'
+                f'{time_ms["serializer"]:>8.1f}{queries:>9}  {profile["status"]:<7}{profile["method"]} {profile["url"]}'
+            )
+        return lines
+
+    def _summary(self, profiles, options):
+        by_view = defaultdict(list)
+        for profile in profiles:
+            by_view[profile['view']].append(profile)
+        lines = [f'{"view":<32}{"profiles":>9}{"mean ms":>9}{"max ms":>9}{"view":>7}{"orm":>7}{"ser":>7}{"queries":>9}']
+        for view, group in sorted(by_view.items(), key=lambda item: -sum(p['duration_ms'] for p in item[1])):
+            sampled = sum(sum(p['time_ms'].values()) for p in group) or 1
+            share = {kind: sum(p['time_ms'][kind] for p in group) / sampled for kind in ('view', 'orm', 'serializer')}
+            lines.append(
+                f'{view[:31]:<32}{len(group):>9}{statistics.fmean(p["duration_ms"] for p in group):>9.1f}'
+                f'{max(p["duration_ms"] for p in group):>9.1f}{share["view"]:>7.0%}{share["orm"]:>7.0%}'
+                f'{share["serializer"]:>7.0%}'
+                f'{statistics.fmean(sum(q["count"] for q in p["queries"]) for p in group):>9.1f}'
+            )
+        return lines
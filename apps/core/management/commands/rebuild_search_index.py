@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from apps.hotels.search import hotel_search_index
+from apps.reviews.search import review_search_index
+
+
+class Command(BaseCommand):
+    help = 'Reinstall full-text triggers and rebuild the hotel and review search indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=None, help='Database alias to rebuild')
+
+    def handle(self, *args, **options):
+        for index in (hotel_search_index, review_search_index):
+            index.rebuild(using=options['database'])
+            self.stdout.write(f'Rebuilt {index.table}')
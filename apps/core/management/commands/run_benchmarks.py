@@ -0,0 +1,66 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import benchmarks
+from apps.hotels.models import Hotel
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the hot paths (availability, listing, search, review feed, booking creation) against the '
+        'loaded data and write a JSON report. Pass --compare with an earlier report to see the change.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=list(benchmarks.SCENARIOS),
+                            help='Run only this scenario (repeatable)')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this file')
+        parser.add_argument('--compare', help='Earlier JSON report to compare against')
+        parser.add_argument('--max-regression', type=float,
+                            help='Fail when any p50 is this many percent slower than the --compare report')
+
+    def handle(self, *args, **options):
+        if not Hotel.objects.filter(is_active=True).exists():
+            raise CommandError('No active hotels; run generate_data first')
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        report = benchmarks.run(options['scenario'], options['iterations'], options['warmup'], options['seed'])
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+                f.write('\n')
+
+        self.stdout.write(
+            f'{"scenario":<16}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"mean ms":>9}{"queries":>9}{"errors":>8}'
+        )
+        for name, row in report['scenarios'].items():
+            self.stdout.write(
+                f'{name:<16}{row["p50_ms"]:>9.2f}{row["p95_ms"]:>9.2f}{row["p99_ms"]:>9.2f}'
+                f'{row["mean_ms"]:>9.2f}{row["queries"]:>9.1f}{row["errors"]:>8}'
+            )
+            for failure, count in row.get('failures', {}).items():
+                self.stdout.write(f'  {count} x {failure}')
+        if baseline is not None:
+            self._compare(baseline, report, options['max_regression'])
+
+    def _compare(self, baseline, report, max_regression):
+        self.stdout.write(f'\nagainst {baseline["meta"].get("commit") or "baseline"}')
+        self.stdout.write(f'{"scenario":<16}{"p50 ms":>18}{"change":>9}{"p95 ms":>18}{"change":>9}{"queries":>14}')
+        regressions = []
+        for row in benchmarks.compare(baseline, report):
+            p50, p95, queries = row['p50_ms'], row['p95_ms'], row['queries']
+            self.stdout.write(
+                f'{row["scenario"]:<16}{p50[0]:>8.2f} -> {p50[1]:<6.2f}{p50[2]:>+8.1f}%'
+                f'{p95[0]:>8.2f} -> {p95[1]:<6.2f}{p95[2]:>+8.1f}%{queries[0]:>6.1f} -> {queries[1]:<5.1f}'
+            )
+            if max_regression is not None and p50[2] > max_regression:
+                regressions.append(row['scenario'])
+        if regressions:
+            raise CommandError(f'p50 regressed more than {max_regression:g}% in: {", ".join(regressions)}')
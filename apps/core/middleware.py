@@ -0,0 +1,142 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import request_stats, start_recording, stop_recording
+from .profiling import profiler
+from .routers import pin_to_primary, replica_aliases
+
+PIN_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class PrimaryPinMiddleware:
+    """
+    Route a client's reads to the primary database for the rest of a
+    writing request and for ``REPLICA_PIN_SECONDS`` afterwards, which covers
+    replication lag.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        writing = request.method not in SAFE_METHODS
+        if writing or PIN_COOKIE in request.COOKIES:
+            with pin_to_primary():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+        return self._set_pin(request, response)
+
+    async def _acall(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        writing = request.method not in SAFE_METHODS
+        if writing or PIN_COOKIE in request.COOKIES:
+            with pin_to_primary():
+                response = await self.get_response(request)
+        else:
+            response = await self.get_response(request)
+        return self._set_pin(request, response)
+
+    def _set_pin(self, request, response):
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 5), httponly=True, samesite='Lax'
+            )
+        return response
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Record query count, database time, write-lock wait, duplicate statements
+    and wall time for each request. Totals go into ``Server-Timing`` and ``X-Query-Count``
+    / ``X-Duplicate-Queries`` headers and into the per-view rolling stats
+    read by ``dump_hotspots``. Place it first so the timing covers the
+    other middleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'REQUEST_STATS_ENABLED', True)
+        self.headers = getattr(settings, 'REQUEST_STATS_HEADERS', settings.DEBUG)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        if not self.enabled:
+            return self.get_response(request)
+        started = time.perf_counter()
+        recorder, token = start_recording()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_recording(token)
+        return self._record(request, response, recorder, started)
+
+    async def _acall(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        started = time.perf_counter()
+        recorder, token = start_recording()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_recording(token)
+        return self._record(request, response, recorder, started)
+
+    def _record(self, request, response, recorder, started):
+        wall_ms = (time.perf_counter() - started) * 1000
+        db_ms = recorder.duration * 1000
+        duplicates = recorder.duplicates()
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        request_stats.add(view, wall_ms, db_ms, recorder.count, duplicates)
+        if self.headers:
+            response['Server-Timing'] = (
+                f'db;dur={db_ms:.1f}, lock;dur={recorder.lock_wait * 1000:.1f}, app;dur={wall_ms:.1f}'
+            )
+            response['X-Query-Count'] = str(recorder.count)
+            response['X-Duplicate-Queries'] = str(sum(duplicates.values()))
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Keep stack samples of sampled and slow requests (see ``profiling``).
+    Removed from the stack unless ``PROFILING_ENABLED``. Sync only, because
+    samples are taken per thread: under ASGI, Django then runs the request
+    in one worker thread, which is the price of profiling it.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        capture = profiler.start()
+        recorder, token = start_recording()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_recording(token)
+            duration_ms = profiler.stop(capture)
+        if profiler.wanted(capture, duration_ms):
+            profiler.save(capture, request, response, duration_ms, recorder)
+        return response
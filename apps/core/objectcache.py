@@ -0,0 +1,116 @@
+"""
+Read-through cache of model instances.
+
+Each object is stored under ``objcache:<model>:<pk>:<version>``, where the
+version is a token kept under its own key. Invalidating an object replaces
+its token rather than deleting entries, so a reader that loaded the old row
+just before a write can only store it under a version nobody asks for any
+more. Tokens are fresh nanosecond stamps, never counters, so an evicted token
+can't come back and resurrect a stale entry.
+
+Versions are bumped from ``post_save``/``post_delete`` of the model and of the
+dependent models named in ``depends_on``, both immediately and again when
+the surrounding transaction commits. Writes that skip signals (``update()``,
+``bulk_create()``, raw SQL) must call ``invalidate`` themselves.
+
+Misses are loaded from the primary (``using``): a replica row that lags the
+write behind the current token would otherwise be cached as current until
+the next write.
+"""
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+
+class ObjectCache:
+    def __init__(self, queryset, depends_on=None, alias='default', timeout=None, using='default'):
+        """
+        ``queryset`` loads objects on a miss and decides what is cached with
+        them (``select_related``/``prefetch_related``). Pass a function
+        returning the queryset when it uses ``Prefetch`` objects: their inner
+        querysets are shared by every clone and pick up hints from whichever
+        request last used them, so they must not be shared between threads.
+        ``depends_on`` maps a dependent model to the foreign key attname
+        pointing at the cached object, or to a callable returning the
+        affected primary keys.
+        """
+        self.queryset = queryset
+        self.model = self.get_queryset().model
+        self.depends_on = depends_on or {}
+        self.alias = alias
+        self.timeout = timeout
+        self.using = using
+        self.prefix = f'objcache:{self.model._meta.label_lower}'
+
+    def get_queryset(self):
+        return self.queryset() if callable(self.queryset) else self.queryset.all()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _version_key(self, pk):
+        return f'{self.prefix}:{pk}:v'
+
+    def _versions(self, pks):
+        keys = {pk: self._version_key(pk) for pk in pks}
+        found = self.cache.get_many(keys.values())
+        versions = {pk: found.get(key) for pk, key in keys.items()}
+        missing = [pk for pk, version in versions.items() if version is None]
+        for pk in missing:
+            # add() keeps a token another process or an invalidation stored first
+            self.cache.add(keys[pk], time.time_ns(), None)
+        if missing:
+            found = self.cache.get_many([keys[pk] for pk in missing])
+            versions.update((pk, found.get(keys[pk])) for pk in missing)
+        return versions
+
+    def get_many(self, pks):
+        """``{pk: instance}`` for the given keys; missing rows are simply absent"""
+        pks = list(dict.fromkeys(pks))
+        if not pks:
+            return {}
+        object_keys = {pk: f'{self.prefix}:{pk}:{version}' for pk, version in self._versions(pks).items()}
+        found = self.cache.get_many(object_keys.values())
+        objects = {pk: found[key] for pk, key in object_keys.items() if key in found}
+        missing = [pk for pk in pks if pk not in objects]
+        if missing:
+            loaded = self.get_queryset().using(self.using).in_bulk(missing)
+            self.cache.set_many({object_keys[pk]: obj for pk, obj in loaded.items()}, self.timeout)
+            objects.update(loaded)
+        return objects
+
+    def get(self, pk):
+        return self.get_many([pk]).get(pk)
+
+    def invalidate(self, pks):
+        pks = [pk for pk in pks if pk is not None]
+        if pks:
+            stamp = time.time_ns()
+            self.cache.set_many({self._version_key(pk): stamp + i for i, pk in enumerate(pks)}, None)
+
+    def _invalidate_on_commit(self, pks, using):
+        pks = list(pks)
+        self.invalidate(pks)
+        # A reader between now and commit would cache the old row again
+        transaction.on_commit(lambda: self.invalidate(pks), using=using)
+
+    def connect(self):
+        """Wire up invalidation signals; call from ``AppConfig.ready``"""
+        uid = f'{self.prefix}:invalidate'
+
+        def own(sender, instance, using='default', **kwargs):
+            self._invalidate_on_commit([instance.pk], using)
+
+        post_save.connect(own, sender=self.model, weak=False, dispatch_uid=uid)
+        post_delete.connect(own, sender=self.model, weak=False, dispatch_uid=uid)
+        for dependent, target in self.depends_on.items():
+            def dependent_changed(sender, instance, using='default', target=target, **kwargs):
+                pks = target(instance) if callable(target) else [getattr(instance, target)]
+                self._invalidate_on_commit(pks, using)
+
+            dependent_uid = f'{uid}:{dependent._meta.label_lower}'
+            post_save.connect(dependent_changed, sender=dependent, weak=False, dispatch_uid=dependent_uid)
+            post_delete.connect(dependent_changed, sender=dependent, weak=False, dispatch_uid=dependent_uid)
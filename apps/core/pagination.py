@@ -0,0 +1,51 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# Changelists are counted exactly up to here; see EstimatedCountPaginator
+MAX_EXACT_COUNT = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for very large admin changelists.
+
+    Querysets are counted exactly up to ``MAX_EXACT_COUNT`` rows. Past that,
+    unfiltered ones are sized from table statistics (PostgreSQL's
+    ``reltuples``, SQLite's ``sqlite_stat1`` once ``ANALYZE`` has run) and
+    filtered ones stop at the cap, leaving later pages unlinked.
+    """
+    max_exact_count = MAX_EXACT_COUNT
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        count = queryset.order_by()[:self.max_exact_count].count()
+        if count < self.max_exact_count or queryset.query.where:
+            return count
+        estimate = estimate_table_rows(queryset)
+        return max(count, estimate or 0)
+
+
+def estimate_table_rows(queryset):
+    """Row count for the queryset's table from planner statistics, or None if there are none"""
+    table = queryset.model._meta.db_table
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            # Every row for the table starts with its row count
+            cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    return estimate if estimate > 0 else None
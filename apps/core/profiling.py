@@ -0,0 +1,183 @@
+"""
+Opt-in stack-sampling profiler for slow requests.
+
+While profiling is enabled, one daemon thread per process takes a snapshot of
+the stack of every thread serving a request every ``PROFILING_INTERVAL_MS``.
+When the request finishes the samples are kept if it was picked by
+``PROFILING_SAMPLE_RATE`` or took at least ``PROFILING_SLOW_MS``, and are
+dropped otherwise. A slow request can't be recognised until it is over, so
+sampling rather than ``cProfile`` is what makes the latency trigger possible:
+it costs a few percent, whereas deterministic profiling would have to run on
+every request and could not produce the full stacks a flame graph needs.
+
+Each kept profile is a JSON file in ``PROFILING_DIR`` holding the URL, view,
+status, duration, the statements run, the time split between the ORM,
+serializers and the rest of the view, and folded stacks.
+``profile_report`` merges them into flame-graph input.
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+ORM_MODULES = ('django.db.',)
+SERIALIZER_MODULES = ('rest_framework.serializers', 'rest_framework.fields', 'rest_framework.relations',
+                      'rest_framework.renderers', 'apps.core.fastjson')
+
+_labels = {}  # Code object -> frame label
+
+
+def _label(code, module):
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, 'co_qualname', code.co_name)  # co_qualname is new in Python 3.11
+        label = _labels[code] = f'{module}:{name}'
+    return label
+
+
+def _classify(labels):
+    """'orm', 'serializer' or 'view' for a root-to-leaf stack, judged by the innermost match"""
+    for label in reversed(labels):
+        module = label.partition(':')[0]
+        if module.startswith(ORM_MODULES):
+            return 'orm'
+        if module.startswith(SERIALIZER_MODULES) or module.endswith('.serializers'):
+            return 'serializer'
+    return 'view'
+
+
+class Capture:
+    __slots__ = ('stacks', 'started', 'sampled')
+
+    def __init__(self, sampled):
+        self.stacks = Counter()
+        self.started = time.perf_counter()
+        self.sampled = sampled
+
+    def add(self, frame):
+        labels = []
+        while frame is not None:
+            labels.append(_label(frame.f_code, frame.f_globals.get('__name__', '?')))
+            frame = frame.f_back
+        labels.reverse()
+        self.stacks[tuple(labels)] += 1
+
+
+class Profiler:
+    def __init__(self):
+        self._active = {}  # Thread ident -> Capture
+        self._lock = threading.Lock()
+        self._sampling = threading.Lock()  # Held while a round of samples is taken
+        self._thread = None
+        self._saved = 0
+
+    @property
+    def interval(self):
+        return getattr(settings, 'PROFILING_INTERVAL_MS', 5) / 1000
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._sample, name='request-profiler', daemon=True)
+                    self._thread.start()
+
+    def _sample(self):
+        while True:
+            time.sleep(self.interval)
+            if not self._active:
+                continue
+            with self._sampling:
+                frames = sys._current_frames()
+                for ident, capture in list(self._active.items()):
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        capture.add(frame)
+                del frames
+
+    def start(self):
+        self._ensure_thread()
+        capture = Capture(sampled=random.random() < getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0))
+        self._active[threading.get_ident()] = capture
+        return capture
+
+    def stop(self, capture):
+        """Stop sampling the current thread; no sample is added to ``capture`` after this returns"""
+        duration_ms = (time.perf_counter() - capture.started) * 1000
+        with self._sampling:
+            self._active.pop(threading.get_ident(), None)
+        return duration_ms
+
+    def wanted(self, capture, duration_ms):
+        return capture.sampled or duration_ms >= getattr(settings, 'PROFILING_SLOW_MS', 1000)
+
+    def save(self, capture, request, response, duration_ms, recorder):
+        """Write the profile to ``PROFILING_DIR``; returns its path"""
+        directory = Path(settings.PROFILING_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        interval_ms = self.interval * 1000
+        split = Counter()
+        for stack, count in capture.stacks.items():
+            split[_classify(stack)] += count * interval_ms
+        match = getattr(request, 'resolver_match', None)
+        profile = {
+            'timestamp': timezone.now().isoformat(),
+            'method': request.method,
+            'url': request.get_full_path(),
+            'view': match.view_name if match else 'unresolved',
+            'status': response.status_code,
+            'duration_ms': round(duration_ms, 2),
+            'trigger': 'sample' if capture.sampled else 'slow',
+            'interval_ms': interval_ms,
+            'time_ms': {kind: round(split[kind], 1) for kind in ('view', 'orm', 'serializer')},
+            'db_ms': round(recorder.duration * 1000, 2),
+            'queries': [{'sql': sql, 'count': count} for sql, count in recorder.statements.most_common()],
+            'stacks': [[';'.join(stack), count] for stack, count in capture.stacks.most_common()],
+        }
+        self._saved += 1
+        path = directory / f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{self._saved}.json'
+        path.write_text(json.dumps(profile))
+        self._prune(directory)
+        return path
+
+    def _prune(self, directory):
+        limit = getattr(settings, 'PROFILING_MAX_FILES', 1000)
+        files = sorted(directory.glob('*.json'), key=lambda path: path.stat().st_mtime)
+        for path in files[:max(0, len(files) - limit)]:
+            path.unlink(missing_ok=True)
+
+
+def load_profiles(directory=None):
+    """Saved profiles, oldest first"""
+    directory = Path(directory or settings.PROFILING_DIR)
+    profiles = []
+    for path in sorted(directory.glob('*.json'), key=lambda path: path.stat().st_mtime):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # Pruned or half-written by another worker
+    return profiles
+
+
+def folded(profiles, weight='ms'):
+    """
+    Merge profiles into ``frame;frame;frame value`` lines, the folded format
+    read by flamegraph.pl, inferno and speedscope. ``weight`` is ``'ms'``
+    (estimated from the sampling interval) or ``'samples'``.
+    """
+    totals = Counter()
+    for profile in profiles:
+        scale = profile['interval_ms'] if weight == 'ms' else 1
+        for stack, count in profile['stacks']:
+            totals[stack] += count * scale
+    return [f'{stack} {round(value)}' for stack, value in sorted(totals.items()) if round(value) > 0]
+
+
+profiler = Profiler()
@@ -0,0 +1,67 @@
+"""
+Primary/replica database routing.
+
+Catalog and review reads are spread over the aliases in
+``settings.DATABASE_REPLICAS``; everything else, and every write, uses
+``default``. Reads are pinned to the primary while ``pin_to_primary`` is
+active (``PrimaryPinMiddleware`` does this for a short window after a
+user writes) and inside transactions on the primary, so a user always
+reads their own writes.
+"""
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# App labels whose reads may be served by a replica
+REPLICA_READ_APPS = {'hotels', 'reviews'}
+
+_pinned = contextvars.ContextVar('pinned_to_primary', default=False)
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+@contextmanager
+def pin_to_primary():
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if (
+            not replicas
+            or model._meta.app_label not in REPLICA_READ_APPS
+            or is_pinned()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        pool = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary and receive its schema through replication
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,18 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    $(function() {
+        $('.admin-autocomplete-filter select').on('change', function() {
+            const container = $(this).closest('.admin-autocomplete-filter');
+            const base = container.data('base-url');
+            if (!this.value) {
+                window.location = base;
+                return;
+            }
+            const separator = base.length > 1 ? '&' : '';
+            const param = encodeURIComponent(container.data('param'));
+            window.location = base + separator + param + '=' + encodeURIComponent(this.value);
+        });
+    });
+}
@@ -0,0 +1,143 @@
+"""
+Test helpers that fail on N+1 query patterns.
+
+A query auditor records every statement run inside it (including those from
+``sync_to_async`` threads, see ``instrumentation``), groups the SELECTs by
+fingerprint and fails when one fingerprint runs more than ``threshold``
+times. That is the signature of a lazy relation or property read in a loop,
+such as ``Hotel.review_count`` or ``Booking.__str__`` over a queryset.
+
+``QueryAuditMixin`` audits every request made through ``self.client``;
+``audit_queries`` and ``assertNoRepeatedQueries`` audit arbitrary code.
+
+``TestRunner`` is the project's test runner (``TEST_RUNNER``); see its
+docstring for what it does to keep the suite fast.
+"""
+from functools import wraps
+
+from django.db import connections
+from django.db.models.signals import post_migrate
+from django.test import Client, override_settings
+from django.test.runner import DiscoverRunner
+
+from apps.bookings import postgres
+from apps.hotels.search import hotel_search_index
+from apps.reviews.search import review_search_index
+
+from .instrumentation import fingerprint, start_recording, stop_recording
+
+DEFAULT_THRESHOLD = 2
+
+
+class RepeatedQueries(AssertionError):
+    pass
+
+
+class QueryAuditor:
+    def __init__(self, threshold=DEFAULT_THRESHOLD, label=None):
+        self.threshold = threshold
+        self.label = label
+        self.recorder = None
+
+    def __enter__(self):
+        self.recorder, self._token = start_recording()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stop_recording(self._token)
+        if exc_type is None:
+            self.check()
+
+    def repeated(self):
+        """``{fingerprint: count}`` for SELECTs above the threshold, worst first"""
+        counts = {}
+        for sql, count in self.recorder.statements.items():
+            if sql.lstrip()[:6].upper() == 'SELECT':
+                key = fingerprint(sql)
+                counts[key] = counts.get(key, 0) + count
+        offenders = {key: count for key, count in counts.items() if count > self.threshold}
+        return dict(sorted(offenders.items(), key=lambda item: -item[1]))
+
+    def check(self):
+        offenders = self.repeated()
+        if offenders:
+            lines = [f'  {count}x {statement}' for statement, count in offenders.items()]
+            where = f' in {self.label}' if self.label else ''
+            raise RepeatedQueries(
+                f'Repeated queries{where} (threshold {self.threshold}); '
+                'load the relation with select_related/prefetch_related or annotate it:\n' + '\n'.join(lines)
+            )
+
+
+def audit_queries(func=None, *, threshold=DEFAULT_THRESHOLD):
+    """Decorator running ``func`` (a test method or any callable) under a ``QueryAuditor``"""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with QueryAuditor(threshold, label=func.__qualname__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate(func) if func is not None else decorate
+
+
+class AuditedClient(Client):
+    """Test client that audits each request separately"""
+    query_threshold = DEFAULT_THRESHOLD
+
+    def request(self, **request):
+        label = f'{request.get("REQUEST_METHOD", "GET")} {request.get("PATH_INFO", "")}'
+        with QueryAuditor(self.query_threshold, label=label):
+            return super().request(**request)
+
+
+class QueryAuditMixin:
+    """Make ``self.client`` fail the test when a request repeats a query"""
+    client_class = AuditedClient
+
+    def assertNoRepeatedQueries(self, threshold=DEFAULT_THRESHOLD):
+        return QueryAuditor(threshold, label=self.id())
+
+
+# Schema objects created by RunPython migrations rather than from models, by app label
+MIGRATION_ONLY_SCHEMA = {
+    'hotels': [hotel_search_index.install],
+    'reviews': [review_search_index.install],
+    'bookings': [postgres.install],
+}
+
+
+def install_migration_only_schema(sender, app_config, using, **kwargs):
+    """Add what the skipped migrations would have created to a test database built from models"""
+    connection = connections[using]
+    if connection.settings_dict['TEST'].get('MIGRATE', True):
+        return
+    with connection.schema_editor() as schema_editor:
+        for install in MIGRATION_ONLY_SCHEMA.get(app_config.label, ()):
+            install(schema_editor)
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the suite with a cheap password hasher (PBKDF2 costs about half a
+    second per ``create_user``) and builds test databases straight from the
+    models unless ``TEST_MIGRATE`` is set, adding the FTS5 indexes and
+    PostgreSQL triggers that only migrations create. SQLite test databases
+    live in memory; ``--parallel`` workers get forked copies.
+    """
+    password_hashers = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._hashers = override_settings(PASSWORD_HASHERS=self.password_hashers)
+        self._hashers.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._hashers.disable()
+        super().teardown_test_environment(**kwargs)
+
+    def setup_databases(self, **kwargs):
+        post_migrate.connect(install_migration_only_schema, dispatch_uid='install_migration_only_schema')
+        try:
+            return super().setup_databases(**kwargs)
+        finally:
+            post_migrate.disconnect(dispatch_uid='install_migration_only_schema')
@@ -0,0 +1,498 @@
+import json
+import random
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.http import HttpResponse
+from django.test import LiveServerTestCase, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+
+from apps.bookings.models import Booking, HotelDailyStats, Payment
+from apps.hotels.models import Destination, Hotel, HotelImage, RoomType
+from apps.reviews.models import ProviderRating, Review
+from .benchmarks import measure
+from .datagen import Counts, Generator, generate
+from .factories import make_user
+from .instrumentation import collected_snapshots, fingerprint, request_stats, start_recording, stop_recording, summarize
+from .loadgen import parse_server_timing
+from .middleware import PIN_COOKIE, PrimaryPinMiddleware, ProfilingMiddleware, QueryInstrumentationMiddleware
+from .pagination import MAX_EXACT_COUNT, EstimatedCountPaginator
+from .profiling import _label, load_profiles
+from .routers import PrimaryReplicaRouter, is_pinned, pin_to_primary
+from .testing import AuditedClient, QueryAuditMixin, QueryAuditor, RepeatedQueries, audit_queries
+from .traffic import DEFAULT_MIX, Traffic, parse_mix
+
+User = get_user_model()
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            make_user(username=f'user{i}')
+
+    def test_small_tables_are_counted_exactly(self):
+        """Test tables below the cap are counted, whatever gaps deletes left in their keys"""
+        User.objects.filter(username__in=['user0', 'user2']).delete()
+        paginator = EstimatedCountPaginator(User.objects.order_by('pk'), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 3)
+
+    @skipUnless(connection.vendor == 'sqlite', 'sqlite_stat1 is SQLite-only')
+    def test_large_tables_use_planner_statistics(self):
+        """Test unfiltered querysets past the cap are sized from ANALYZE, filtered ones stop at the cap"""
+        class SmallCap(EstimatedCountPaginator):
+            max_exact_count = 2
+
+        self.assertEqual(SmallCap(User.objects.order_by('pk'), 2).count, 2)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        User.objects.filter(username='user4').delete()  # Statistics lag until the next ANALYZE
+        self.assertEqual(SmallCap(User.objects.order_by('pk'), 2).count, 5)
+        self.assertEqual(SmallCap(User.objects.filter(username__startswith='user').order_by('pk'), 2).count, 2)
+
+    def test_filtered_count_is_exact_below_cap(self):
+        """Test filtered querysets are counted exactly"""
+        paginator = EstimatedCountPaginator(User.objects.filter(username__in=['user1', 'user3']).order_by('pk'), 2)
+        self.assertEqual(paginator.count, 2)
+        self.assertGreater(MAX_EXACT_COUNT, paginator.count)
+
+    def test_empty_table(self):
+        """Test an empty table has no pages"""
+        User.objects.all().delete()
+        self.assertEqual(EstimatedCountPaginator(User.objects.order_by('pk'), 2).count, 0)
+
+
+class LazyAdminFilterTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        admin = User.objects.create_superuser(username='admin', password='admin123', email='a@example.com')
+        self.client.force_login(admin)
+        self.destination = Destination.objects.create(name='Nice', city='Nice', country='France', description='Riviera')
+        self.hotels = [
+            Hotel.objects.create(
+                name=f'Riviera Hotel {i}', destination=self.destination, address=f'{i} Promenade',
+                star_rating=3, description='Test', cancellation_policy='Flexible'
+            )
+            for i in range(3)
+        ]
+
+    def test_review_changelist_does_not_list_every_hotel(self):
+        """Test the hotel filter loads no hotels until one is selected"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:reviews_review_changelist'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'admin-autocomplete-filter')
+        self.assertFalse([q for q in queries if 'FROM "hotels_hotel"' in q['sql']])
+
+    def test_selected_hotel_is_rendered(self):
+        """Test the selected hotel is loaded and shown in the filter"""
+        hotel = self.hotels[1]
+        response = self.client.get(reverse('admin:reviews_review_changelist'), {'hotel__id__exact': hotel.pk})
+        self.assertContains(response, f'<option value="{hotel.pk}" selected>{hotel.name}</option>', html=True)
+
+    def test_filter_options_come_from_autocomplete_view(self):
+        """Test the admin autocomplete endpoint pages through hotels"""
+        response = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'reviews', 'model_name': 'review', 'field_name': 'hotel', 'term': 'Riviera',
+        })
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_country_values_are_cached(self):
+        """Test distinct countries are only queried once"""
+        url = reverse('admin:hotels_hotel_changelist')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertContains(response, '?destination__country=France')
+        self.assertFalse([q for q in queries if 'DISTINCT' in q['sql']])
+
+
+@skipUnless(connection.vendor == 'sqlite', 'SQLite profile only')
+class SQLiteProfileTests(TestCase):
+    def test_pragmas_applied_on_connect(self):
+        """Test every connection gets the tuned pragmas"""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], settings.SQLITE_PRAGMAS['busy_timeout'])
+
+
+class TestDatabaseTests(TestCase):
+    def test_models_match_migrations(self):
+        """Test the models, which test databases are built from, need no new migrations"""
+        call_command('makemigrations', check=True, dry_run=True, stdout=StringIO())
+
+    @skipUnless(connection.vendor == 'sqlite', 'FTS5 indexes are SQLite-only')
+    def test_migration_only_schema_is_installed(self):
+        """Test the FTS5 tables created by RunPython migrations exist without running them"""
+        tables = connection.introspection.table_names()
+        self.assertIn('hotels_hotel_fts', tables)
+        self.assertIn('reviews_review_fts', tables)
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_catalog_reads_go_to_replicas(self):
+        """Test hotel and review reads use a replica, bookings and users the primary"""
+        self.assertEqual(self.router.db_for_read(Hotel), 'replica')
+        self.assertEqual(self.router.db_for_read(Review), 'replica')
+        self.assertEqual(self.router.db_for_read(Booking), 'default')
+        self.assertEqual(self.router.db_for_read(User), 'default')
+        self.assertEqual(self.router.db_for_write(Hotel), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'hotels'))
+
+    def test_pinned_reads_use_primary(self):
+        """Test pinning sends catalog reads to the primary"""
+        with pin_to_primary():
+            self.assertEqual(self.router.db_for_read(Hotel), 'default')
+        self.assertEqual(self.router.db_for_read(Hotel), 'replica')
+
+    def test_middleware_pins_after_write(self):
+        """Test a write pins the client to the primary until the cookie lapses"""
+        seen = []
+
+        def view(request):
+            seen.append(is_pinned())
+            return HttpResponse()
+
+        middleware = PrimaryPinMiddleware(view)
+        factory = RequestFactory()
+        response = middleware(factory.post('/api/bookings/'))
+        self.assertIn(PIN_COOKIE, response.cookies)
+        middleware(factory.get('/api/hotels/search/'))
+        pinned = factory.get('/api/hotels/search/')
+        pinned.COOKIES[PIN_COOKIE] = '1'
+        middleware(pinned)
+        self.assertEqual(seen, [True, False, True])
+
+
+class QueryInstrumentationTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        request_stats.reset()
+        self.destination = Destination.objects.create(name='Nice', city='Nice', country='France', description='Riviera')
+
+    def test_fingerprint_collapses_literals(self):
+        """Test statements differing only in literals share a fingerprint"""
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'x'"),
+            fingerprint("SELECT  * FROM t WHERE id IN (%s) AND name = 'it''s'"),
+        )
+
+    @override_settings(REQUEST_STATS_HEADERS=True)
+    def test_headers_and_duplicates(self):
+        """Test N+1 style repeats are counted per request and reported"""
+        def view(request):
+            for hotel_id in (1, 2, 3):
+                list(Hotel.objects.filter(pk=hotel_id))
+            Destination.objects.count()
+            return HttpResponse()
+
+        response = QueryInstrumentationMiddleware(view)(RequestFactory().get('/'))
+        self.assertEqual(response['X-Query-Count'], '4')
+        self.assertEqual(response['X-Duplicate-Queries'], '3')
+        self.assertIn('db;dur=', response['Server-Timing'])
+        [row] = summarize(collected_snapshots())
+        self.assertEqual((row['view'], row['requests'], row['max_queries']), ('unresolved', 1, 4))
+
+    @override_settings(REQUEST_STATS_HEADERS=False)
+    def test_headers_can_be_withheld(self):
+        """Test query counts stay out of responses while stats are still collected"""
+        response = QueryInstrumentationMiddleware(lambda request: HttpResponse())(RequestFactory().get('/'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotIn('X-Query-Count', response)
+        self.assertEqual(summarize(collected_snapshots())[0]['requests'], 1)
+
+    @override_settings(REQUEST_STATS_HEADERS=True)
+    def test_real_requests_and_hotspot_dump(self):
+        """Test resolved views are keyed by URL name and dumped slowest first"""
+        response = self.client.get(reverse('hotels:destination-detail', kwargs={'pk': self.destination.pk}))
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        out = StringIO()
+        call_command('dump_hotspots', stdout=out)
+        self.assertIn('hotels:destination-detail', out.getvalue())
+
+
+def image_names(request):
+    return HttpResponse(', '.join(str(image) for image in HotelImage.objects.all()))
+
+
+urlpatterns = [path('images/', image_names)]
+
+
+class QueryAuditorTests(TestCase):
+    def setUp(self):
+        destination = Destination.objects.create(name='Nice', city='Nice', country='France', description='Riviera')
+        self.hotels = [
+            Hotel.objects.create(
+                name=f'Riviera Hotel {i}', destination=destination, address=f'{i} Promenade',
+                star_rating=3, description='Test', cancellation_policy='Flexible'
+            )
+            for i in range(4)
+        ]
+        for hotel in self.hotels:
+            HotelImage.objects.create(hotel=hotel, image='hotels/front.jpg')
+
+    def test_lazy_relations_in_loops_fail(self):
+        """Test review_count and HotelImage.__str__ over a queryset are reported"""
+        with self.assertRaisesMessage(RepeatedQueries, '4x SELECT'):
+            with QueryAuditor():
+                [hotel.review_count for hotel in Hotel.objects.all()]
+        with self.assertRaises(RepeatedQueries):
+            with QueryAuditor():
+                [str(image) for image in HotelImage.objects.all()]
+
+    def test_loaded_relations_pass(self):
+        """Test the same loops with select_related stay under the threshold"""
+        with QueryAuditor() as audit:
+            [hotel.review_count for hotel in Hotel.objects.select_related('rating')]
+            [str(image) for image in HotelImage.objects.select_related('hotel')]
+        self.assertEqual(audit.repeated(), {})
+
+    def test_decorator_and_threshold(self):
+        """Test the decorator audits a whole call and respects its threshold"""
+        @audit_queries(threshold=4)
+        def four_lookups():
+            return [str(image) for image in HotelImage.objects.all()]
+
+        four_lookups()
+        with self.assertRaises(RepeatedQueries):
+            audit_queries(threshold=3)(four_lookups.__wrapped__)()
+
+    def test_nested_recordings_reach_the_outer_one(self):
+        """Test queries recorded by the request middleware also reach an enclosing auditor"""
+        outer, outer_token = start_recording()
+        inner, inner_token = start_recording()
+        list(Hotel.objects.all())
+        stop_recording(inner_token)
+        stop_recording(outer_token)
+        self.assertEqual((inner.count, outer.count), (1, 1))
+
+    @override_settings(ROOT_URLCONF=__name__)
+    def test_client_requests_are_audited(self):
+        """Test an N+1 inside a view fails the request made through the audited client"""
+        with self.assertRaises(RepeatedQueries):
+            AuditedClient().get('/images/')
+
+
+SMALL = Counts(destinations=3, hotels=12, users=30, bookings=400)
+
+
+class GenerateDataTests(TestCase):
+    def snapshot(self):
+        return (
+            list(Hotel.objects.order_by('pk').values_list('name', 'star_rating')),
+            list(Booking.objects.order_by('pk').values_list('booking_reference', 'check_in', 'status', 'total_price')),
+            list(Review.objects.order_by('pk').values_list('overall_rating', 'helpful_count')),
+        )
+
+    def test_same_seed_same_data(self):
+        """Test a seed reproduces the data set and another seed does not"""
+        snapshots = []
+        for seed in (7, 7, 8):
+            with transaction.atomic():
+                generate(SMALL, seed=seed, batch_size=100)
+                snapshots.append(self.snapshot())
+                transaction.set_rollback(True)
+        self.assertEqual(snapshots[0], snapshots[1])
+        self.assertNotEqual(snapshots[0], snapshots[2])
+
+    def test_generated_data_is_consistent(self):
+        """Test inventory, payments, reviews and the rebuilt rollups and ratings agree with the bookings"""
+        stats = generate(SMALL, batch_size=100)
+        self.assertEqual(stats.created['booking'], 400)
+        self.assertEqual(Booking.objects.count(), 400)
+        nightly = Counter()
+        for booking in Booking.objects.exclude(status='cancelled').select_related('room_type'):
+            for night in range(booking.num_nights):
+                key = (booking.room_type, booking.check_in + timedelta(days=night))
+                nightly[key] += booking.num_rooms
+                self.assertLessEqual(nightly[key], booking.room_type.total_rooms)
+        self.assertFalse(Payment.objects.filter(booking__status='pending').exists())
+        self.assertEqual(Payment.objects.count(), Booking.objects.exclude(status='pending').count())
+        self.assertFalse(Review.objects.exclude(booking__status='completed').exists())
+        review = Review.objects.filter(helpful_count__gt=0).first()
+        self.assertEqual(review.votes.filter(vote_type='helpful').count(), review.helpful_count)
+        self.assertEqual(
+            HotelDailyStats.objects.aggregate(nights=Sum('room_nights'))['nights'],
+            sum(b.num_nights * b.num_rooms for b in Booking.objects.all()),
+        )
+        self.assertEqual(
+            ProviderRating.objects.aggregate(total=Sum('total_reviews'))['total'], Review.objects.count()
+        )
+
+    def test_sold_out_catalog_stops_early(self):
+        """Test asking for more bookings than the catalog holds ends with a warning instead of spinning"""
+        class TinyCatalog(Generator):
+            def room_types(self, hotels):
+                room_types = super().room_types(hotels)
+                RoomType.objects.filter(pk__in=[r.pk for r in room_types]).update(total_rooms=1)
+                for room_type in room_types:
+                    room_type.total_rooms = 1
+                return room_types
+
+        generator = TinyCatalog(Counts(destinations=1, hotels=1, users=5, bookings=5000), batch_size=500)
+        generator.days = 20
+        stats = generator.run()
+        self.assertLess(stats.created['booking'], 5000)
+        self.assertEqual(Booking.objects.count(), stats.created['booking'])
+        self.assertIn('sold out', stats.warnings[0])
+
+    def test_command_refuses_to_load_twice(self):
+        """Test generate_data reports counts and will not mix two data sets"""
+        out = StringIO()
+        call_command('generate_data', hotels=4, users=5, bookings=20, destinations=2, stdout=out)
+        self.assertIn('booking', out.getvalue())
+        self.assertEqual(Booking.objects.count(), 20)
+        with self.assertRaisesMessage(Exception, 'already loaded'):
+            call_command('generate_data', stdout=StringIO())
+
+
+class MeasureTests(SimpleTestCase):
+    def test_failures_are_reported(self):
+        """Test failed calls are counted by exception type and message"""
+        outcomes = iter([True, ValueError('no rooms left'), False, ValueError('no rooms left'), True])
+
+        def call():
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        result = measure(call, 5)
+        self.assertEqual(result['errors'], 3)
+        self.assertEqual(result['failures'], {'ValueError: no rooms left': 2, 'unsuccessful response': 1})
+
+
+class RunBenchmarksTests(TestCase):
+    def test_report_and_compare(self):
+        """Test every scenario runs cleanly, the report is written and bookings are cleaned up"""
+        generate(SMALL, batch_size=100)
+        bookings = Booking.objects.count()
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = Path(tmp) / 'report.json'
+            call_command('run_benchmarks', iterations=3, warmup=1, output=str(report_path), stdout=StringIO())
+            report = json.loads(report_path.read_text())
+            out = StringIO()
+            call_command('run_benchmarks', iterations=3, warmup=0, compare=str(report_path), stdout=out)
+        self.assertEqual(
+            set(report['scenarios']), {'availability', 'listing', 'search', 'review_feed', 'booking_create'}
+        )
+        for name, row in report['scenarios'].items():
+            self.assertEqual(row['errors'], 0, (name, row['failures']))
+            self.assertGreater(row['queries'], 0, name)
+        self.assertEqual(report['meta']['rows']['booking'], bookings)
+        self.assertIn('availability', out.getvalue().split('against')[1])
+        self.assertEqual(Booking.objects.count(), bookings)
+
+
+class TrafficModelTests(TestCase):
+    def test_parse_mix(self):
+        """Test mix weights parse and unknown actions or all-zero mixes are rejected"""
+        self.assertEqual(parse_mix('search=30, booking=0'), {'search': 30.0, 'booking': 0.0})
+        with self.assertRaisesMessage(ValueError, 'Unknown action'):
+            parse_mix('checkout=5')
+        with self.assertRaisesMessage(ValueError, 'positive weight'):
+            parse_mix('booking=0')
+
+    def test_server_timing(self):
+        """Test Server-Timing durations are read by metric name"""
+        timings = parse_server_timing('db;dur=1.5, lock;dur=0.2, app;desc="x";dur=9')
+        self.assertEqual(timings, {'db': 1.5, 'lock': 0.2, 'app': 9.0})
+
+    def test_booking_step_records_lock_wait_and_cleans_up(self):
+        """Test the in-process booking step reports database and lock time and its bookings are removed"""
+        generate(SMALL, batch_size=100)
+        bookings = Booking.objects.count()
+        traffic = Traffic()
+        timings = traffic.booking(random.Random(1))
+        self.assertEqual(set(timings), {'db', 'lock'})
+        self.assertGreater(timings['db'], 0)
+        self.assertEqual(Booking.objects.count(), bookings + 1)
+        traffic.cleanup()
+        self.assertEqual(Booking.objects.count(), bookings)
+
+
+@override_settings(REQUEST_STATS_HEADERS=True)
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_mixed_traffic_report(self):
+        """Test a short run against the live server reports every read action without errors"""
+        generate(SMALL, batch_size=100)
+        mix = ','.join(f'{name}={weight}' for name, weight in {**DEFAULT_MIX, 'booking': 0}.items())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'load.json'
+            call_command(
+                'load_test', base_url=self.live_server_url, duration=1.5, concurrency=4, mix=mix,
+                json=str(path), stdout=StringIO(),
+            )
+            report = json.loads(path.read_text())
+        self.assertNotIn('booking', report['actions'])
+        self.assertEqual(report['total']['errors'], 0)
+        self.assertGreater(report['total']['requests'], 0)
+        self.assertGreater(report['actions']['availability']['db_ms'], 0)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def slow_view(self, request):
+        list(Hotel.objects.all())
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return HttpResponse()
+
+    def test_disabled_by_default(self):
+        """Test the middleware drops out of the stack unless enabled"""
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(self.slow_view)
+
+    def test_labels_without_qualified_names(self):
+        """Test frames are labelled on Pythons whose code objects lack co_qualname (before 3.11)"""
+        class OldCode:
+            co_name = 'handler'
+
+        self.assertEqual(_label(OldCode(), 'apps.views'), 'apps.views:handler')
+
+    def test_slow_request_is_saved_and_reported(self):
+        """Test a request over PROFILING_SLOW_MS is kept with its queries and folded into flame-graph lines"""
+        with self.settings(PROFILING_ENABLED=True, PROFILING_SLOW_MS=20, PROFILING_INTERVAL_MS=1, PROFILING_DIR=self.dir):
+            ProfilingMiddleware(self.slow_view)(RequestFactory().get('/slow/?x=1'))
+            ProfilingMiddleware(lambda request: HttpResponse())(RequestFactory().get('/fast/'))
+            [profile] = load_profiles()
+            self.assertEqual((profile['url'], profile['trigger'], profile['status']), ('/slow/?x=1', 'slow', 200))
+            self.assertGreaterEqual(profile['duration_ms'], 50)
+            self.assertEqual(sum(query['count'] for query in profile['queries']), 1)
+            self.assertTrue(any('slow_view' in stack for stack, count in profile['stacks']))
+
+            out = StringIO()
+            call_command('profile_report', format='folded', stdout=out)
+            lines = out.getvalue().splitlines()
+            self.assertTrue(lines)
+            for line in lines:
+                stack, value = line.rsplit(' ', 1)
+                self.assertGreater(int(value), 0)
+            with self.assertRaises(CommandError):
+                call_command('profile_report', view='hotels:search', stdout=StringIO())
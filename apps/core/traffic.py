@@ -0,0 +1,172 @@
+"""
+Traffic model for ``load_test``.
+
+The default mix approximates a travel site's front end: mostly searches,
+hotel pages and availability checks, a steady trickle of review reads and a
+few bookings. Hotels are drawn with Zipf-like weights over the most reviewed
+hotels, so caches and hot rows behave as they would with real demand.
+
+There is no booking endpoint in the HTTP API, so the ``booking`` step runs
+the checkout services (``place_hold`` then ``confirm_hold``) in a worker
+thread of the load tool, against the same database as the server. That keeps
+write contention in the picture: with SQLite every booking queues for the
+single write lock, and the time spent waiting is reported as lock wait.
+"""
+import threading
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.utils import timezone
+
+from apps.bookings.holds import confirm_hold, place_hold
+from apps.bookings.models import Booking
+from apps.hotels.models import Destination, Hotel, RoomType
+
+from .datagen import zipf_weights
+from .instrumentation import start_recording, stop_recording
+from .loadgen import Action
+
+DEFAULT_MIX = {
+    'search': 20,
+    'autocomplete': 15,
+    'listing': 10,
+    'hotel_detail': 20,
+    'availability': 20,
+    'review_feed': 10,
+    'booking': 5,
+}
+SEARCH_TERMS = ['hotel', 'beach', 'central', 'grand', 'spa', 'garden', 'harbour', 'palace', 'royal', 'park']
+POPULAR_HOTELS = 500
+
+
+def parse_mix(text):
+    """``'search=30,booking=10'`` to ``{'search': 30.0, 'booking': 10.0}``"""
+    mix = {}
+    for part in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise ValueError(f'Unknown action {name!r}; choose from {", ".join(DEFAULT_MIX)}')
+        mix[name] = float(weight)
+        if mix[name] < 0:
+            raise ValueError(f'Weight for {name} must not be negative')
+    if not any(mix.values()):
+        raise ValueError('The mix needs at least one positive weight')
+    return mix
+
+
+class Traffic:
+    """Request builders for each action, drawing on the loaded catalog"""
+
+    def __init__(self):
+        self.hotels = list(
+            Hotel.objects.filter(is_active=True)
+            .order_by('-rating__total_reviews', 'pk').values_list('pk', flat=True)[:POPULAR_HOTELS]
+        )
+        self.hotel_weights = list(zipf_weights(len(self.hotels), 0.8))
+        self.destinations = list(Destination.objects.order_by('pk').values_list('pk', 'city'))
+        self.room_types = list(RoomType.objects.filter(hotel_id__in=self.hotels[:100]).order_by('pk'))
+        self.user = get_user_model().objects.order_by('pk').first()
+        self.pages = max(1, len(self.hotels) // 20)
+        self.created = []  # Bookings to delete after the run
+        self.today = timezone.localdate()
+
+    def hotel(self, rng):
+        return rng.choices(self.hotels, weights=self.hotel_weights)[0]
+
+    def search(self, rng):
+        if self.destinations and rng.random() < 0.5:
+            return f'/api/hotels/search/?q={rng.choice(self.destinations)[1].split()[0]}'
+        return f'/api/hotels/search/?q={rng.choice(SEARCH_TERMS)}'
+
+    def autocomplete(self, rng):
+        term = rng.choice(self.destinations)[1] if self.destinations else rng.choice(SEARCH_TERMS)
+        return f'/api/hotels/autocomplete/?q={term[:rng.randint(2, 4)]}'
+
+    def listing(self, rng):
+        if self.destinations and rng.random() < 0.4:
+            return f'/api/hotels/?destination={rng.choice(self.destinations)[0]}'
+        return f'/api/hotels/?page={rng.randint(1, self.pages)}'
+
+    def hotel_detail(self, rng):
+        return f'/api/hotels/{self.hotel(rng)}/'
+
+    def availability(self, rng):
+        # Most searches look a few weeks ahead
+        check_in = self.today + timedelta(days=min(int(rng.expovariate(1 / 30)) + 1, 300))
+        check_out = check_in + timedelta(days=rng.randint(1, 7))
+        return f'/api/hotels/{self.hotel(rng)}/availability/?check_in={check_in}&check_out={check_out}'
+
+    def review_feed(self, rng):
+        return f'/api/reviews/feed/?hotel={self.hotel(rng)}'
+
+    def booking(self, rng):
+        room_type = rng.choice(self.room_types)
+        check_in = self.today + timedelta(days=rng.randint(14, 300))
+        nights = rng.randint(1, 5)
+        recorder, token = start_recording()
+        try:
+            hold = place_hold(room_type, check_in, check_in + timedelta(days=nights), user=self.user)
+            subtotal = room_type.price_per_night * nights
+            taxes = (subtotal * Decimal('0.12')).quantize(Decimal('0.01'))
+            booking = confirm_hold(
+                hold.token, user=self.user, num_guests=1, guest_first_name='Load', guest_last_name='Test',
+                guest_email='load@example.com', guest_phone='+1-555-0000',
+                price_per_night=room_type.price_per_night, num_nights=nights,
+                subtotal=subtotal, taxes=taxes, total_price=subtotal + taxes,
+            )
+        finally:
+            stop_recording(token)
+        self.created.append(booking.pk)
+        return {'db': recorder.duration * 1000, 'lock': recorder.lock_wait * 1000}
+
+    def actions(self, mix):
+        actions = []
+        for name, weight in mix.items():
+            if weight <= 0:
+                continue
+            if name == 'booking':
+                if self.room_types and self.user is not None:
+                    actions.append(Action(name, weight, call=self.booking))
+            else:
+                actions.append(Action(name, weight, path=getattr(self, name)))
+        return actions
+
+    def cleanup(self):
+        """Delete the bookings made by the run; signals keep rollups and caches right"""
+        Booking.objects.filter(pk__in=self.created).delete()
+
+
+class LockSampler(threading.Thread):
+    """
+    Estimate PostgreSQL lock-wait time by sampling ``pg_stat_activity`` for
+    backends waiting on a lock. SQLite lock waits are measured directly, as
+    time spent in ``BEGIN IMMEDIATE``, so this is only needed on PostgreSQL.
+    """
+    SQL = (
+        "SELECT count(*) FROM pg_stat_activity "
+        "WHERE wait_event_type = 'Lock' AND datname = current_database()"
+    )
+
+    def __init__(self, using='default', interval=0.05):
+        super().__init__(daemon=True)
+        self.using = using
+        self.interval = interval
+        self.waited = 0.0  # Seconds of backend time spent waiting on locks
+        self._stop_event = threading.Event()
+
+    def run(self):
+        connection = connections[self.using]
+        try:
+            with connection.cursor() as cursor:
+                while not self._stop_event.wait(self.interval):
+                    cursor.execute(self.SQL)
+                    self.waited += cursor.fetchone()[0] * self.interval
+        finally:
+            connection.close()
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.waited
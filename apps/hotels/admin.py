@@ -1,5 +1,8 @@
 from django.contrib import admin
+from apps.core.admin_filters import AutocompleteListFilter, CachedValuesListFilter
+from apps.core.admin_search import FullTextSearchMixin
 from .models import Destination, Hotel, HotelImage, Amenity, HotelAmenity, RoomType, RoomAmenity
+from .search import hotel_search_index
 
 
 class HotelImageInline(admin.TabularInline):
@@ -10,6 +13,7 @@ class HotelImageInline(admin.TabularInline):
 class HotelAmenityInline(admin.TabularInline):
     model = HotelAmenity
     extra = 1
+    autocomplete_fields = ['amenity']
 
 
 class RoomTypeInline(admin.TabularInline):
@@ -21,17 +25,23 @@ class RoomTypeInline(admin.TabularInline):
 @admin.register(Destination)
 class DestinationAdmin(admin.ModelAdmin):
     list_display = ['name', 'city', 'country', 'is_featured', 'created_at']
-    list_filter = ['is_featured', 'country']
+    list_filter = ['is_featured', ('country', CachedValuesListFilter)]
     search_fields = ['name', 'city', 'country']
     list_editable = ['is_featured']
 
 
 @admin.register(Hotel)
-class HotelAdmin(admin.ModelAdmin):
+class HotelAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'destination', 'star_rating', 'hotel_type', 'is_active', 'created_at']
-    list_filter = ['star_rating', 'hotel_type', 'is_active', 'destination__country']
+    list_filter = [
+        ('star_rating', CachedValuesListFilter), 'hotel_type', 'is_active',
+        ('destination__country', CachedValuesListFilter),
+    ]
     search_fields = ['name', 'destination__city', 'address']
+    search_index = hotel_search_index
     list_editable = ['is_active']
+    list_select_related = ['destination']
+    autocomplete_fields = ['destination']
     inlines = [HotelImageInline, HotelAmenityInline, RoomTypeInline]
     fieldsets = (
         ('Basic Information', {
@@ -52,9 +62,11 @@ class HotelAdmin(admin.ModelAdmin):
 @admin.register(HotelImage)
 class HotelImageAdmin(admin.ModelAdmin):
     list_display = ['hotel', 'is_primary', 'order', 'caption']
-    list_filter = ['is_primary', 'hotel']
+    list_filter = ['is_primary', ('hotel', AutocompleteListFilter)]
     search_fields = ['hotel__name', 'caption']
     list_editable = ['is_primary', 'order']
+    list_select_related = ['hotel']
+    autocomplete_fields = ['hotel']
 
 
 @admin.register(Amenity)
@@ -67,5 +79,7 @@ class AmenityAdmin(admin.ModelAdmin):
 @admin.register(RoomType)
 class RoomTypeAdmin(admin.ModelAdmin):
     list_display = ['hotel', 'name', 'price_per_night', 'max_occupancy', 'total_rooms']
-    list_filter = ['hotel', 'max_occupancy']
+    list_filter = [('hotel', AutocompleteListFilter), ('max_occupancy', CachedValuesListFilter)]
     search_fields = ['hotel__name', 'name']
+    list_select_related = ['hotel']
+    autocomplete_fields = ['hotel']
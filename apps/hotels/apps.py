@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+
+WARMUP_UID = 'hotels:warm-reference-data'
 
 
 class HotelsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.hotels"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .cache import hotel_cache
+        hotel_cache.connect()
+        # Queries don't belong in ready(); load reference data as the first request starts
+        request_started.connect(warm_reference_data, dispatch_uid=WARMUP_UID)
+
+
+def warm_reference_data(sender, **kwargs):
+    from .reference import reference_data
+    request_started.disconnect(dispatch_uid=WARMUP_UID)
+    reference_data.warm()
@@ -0,0 +1,59 @@
+"""
+Async versions of the read-heavy catalog endpoints, for ASGI deployments.
+
+Responses match the sync views in ``views.py`` so clients can switch between
+them; only the execution model differs.
+"""
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from apps.core.aio import invalid_page, page_bounds, page_out_of_range, paginated_response
+from .autocomplete import DEFAULT_LIMIT, catalog_autocomplete
+from .availability import InvalidStay, ahotel_availability, parse_stay
+from .cache import hotel_cache
+from .models import Hotel
+from .search import hotel_search_index
+from .serializers import HotelSummarySerializer
+from .views import MAX_AUTOCOMPLETE_LIMIT, MAX_SEARCH_RESULTS
+
+
+@require_GET
+async def autocomplete(request):
+    query = request.GET.get('q', '')
+    try:
+        limit = min(int(request.GET.get('limit', DEFAULT_LIMIT)), MAX_AUTOCOMPLETE_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    if catalog_autocomplete.current():
+        suggestions = catalog_autocomplete.search(query, max(limit, 1))
+    else:
+        # First use, or a change made by another process, builds the index from the database
+        suggestions = await sync_to_async(catalog_autocomplete.search)(query, max(limit, 1))
+    return JsonResponse({'query': query, 'results': [s.as_dict() for s in suggestions]})
+
+
+@require_GET
+async def search(request):
+    ranked = await sync_to_async(hotel_search_index.ranked_ids)(request.GET.get('q', ''), MAX_SEARCH_RESULTS)
+    active = {pk async for pk in Hotel.objects.filter(pk__in=ranked, is_active=True).values_list('pk', flat=True)}
+    ranked = [pk for pk in ranked if pk in active]
+    bounds = page_bounds(request)
+    if bounds is None or page_out_of_range(bounds[2], bounds[0], len(ranked)):
+        return invalid_page()
+    start, end, page = bounds
+    page_ids = ranked[start:end]
+    hotels = await sync_to_async(hotel_cache.get_many)(page_ids)
+    results = HotelSummarySerializer([hotels[pk] for pk in page_ids if pk in hotels], many=True).data
+    return paginated_response(request, len(ranked), page, results)
+
+
+@require_GET
+async def availability(request, pk):
+    try:
+        check_in, check_out, num_rooms = parse_stay(request.GET)
+    except InvalidStay as exc:
+        return JsonResponse({'detail': str(exc)}, status=400)
+    if not await Hotel.objects.filter(pk=pk, is_active=True).aexists():
+        return JsonResponse({'detail': 'No Hotel matches the given query.'}, status=404)
+    return JsonResponse(await ahotel_availability(pk, check_in, check_out, num_rooms))
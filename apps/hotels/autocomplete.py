@@ -0,0 +1,289 @@
+"""
+In-memory prefix index for the destination search box.
+
+Destinations and hotels are indexed once per process on first use, so
+keystroke lookups never touch the database. The signal handlers in
+``apps.hotels.signals`` and ``apps.reviews.signals`` patch the index of the
+process that made the write and publish a new token in the shared cache;
+other processes notice it within ``AUTOCOMPLETE_CHECK_SECONDS`` and rebuild
+on their next lookup. Imports, which bypass the signals, only publish.
+"""
+import bisect
+import heapq
+import threading
+import time
+import unicodedata
+import uuid
+from dataclasses import dataclass
+from itertools import chain
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+MIN_PREFIX_LENGTH = 1
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 25
+# Prefixes matching more keys than this (one or two letters, common words)
+# keep their top MAX_LIMIT suggestions between lookups instead of ranking
+# every match each time
+BROAD_PREFIX_KEYS = 256
+TOKEN_KEY = 'autocomplete:catalog'
+
+
+def normalize(text):
+    """Lower-case, strip accents and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().replace(',', ' ').split())
+
+
+def _terms(*values):
+    """Every word-start suffix of each value, so 'york' matches 'New York'"""
+    terms = set()
+    for value in values:
+        words = normalize(value).split()
+        for i in range(len(words)):
+            terms.add(' '.join(words[i:]))
+    return terms
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    kind: str
+    id: int
+    label: str
+    popularity: int
+
+    def as_dict(self):
+        return {'type': self.kind, 'id': self.id, 'label': self.label}
+
+
+class PrefixIndex:
+    """Sorted array of (term, -popularity, kind, id) keys searched with bisect"""
+
+    def __init__(self):
+        self._keys = []
+        self._entries = {}
+        self._top = {}  # Broad prefix -> its best MAX_LIMIT suggestions
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @classmethod
+    def build(cls, entries):
+        """Index ``(suggestion, terms)`` pairs with a single sort"""
+        index = cls()
+        for suggestion, terms in entries:
+            keys = _keys(suggestion, terms)
+            index._keys.extend(keys)
+            index._entries[(suggestion.kind, suggestion.id)] = (suggestion, keys)
+        index._keys.sort()
+        return index
+
+    def add(self, suggestion, terms):
+        with self._lock:
+            old = self._drop((suggestion.kind, suggestion.id))
+            keys = _keys(suggestion, terms)
+            for key in keys:
+                bisect.insort(self._keys, key)
+            self._entries[(suggestion.kind, suggestion.id)] = (suggestion, keys)
+            self._patch_top(old, (suggestion, keys))
+
+    def remove(self, kind, id):
+        with self._lock:
+            old = self._drop((kind, id))
+            if old is not None:
+                self._patch_top(old, None)
+
+    def _drop(self, ident):
+        entry = self._entries.pop(ident, None)
+        if entry is not None:
+            for key in entry[1]:
+                i = bisect.bisect_left(self._keys, key)
+                if i < len(self._keys) and self._keys[i] == key:
+                    del self._keys[i]
+        return entry
+
+    def _patch_top(self, old, new):
+        """
+        Keep cached top lists right after an entry changed. Everything outside
+        a full list ranks below all of it, so the list stays exact unless the
+        entry falls out of it: then the next lookup ranks the prefix again.
+        """
+        if not self._top:
+            return
+        old_prefixes = _prefixes(old[1]) if old else set()
+        new_prefixes = _prefixes(new[1]) if new else set()
+        ident = (old or new)[0].kind, (old or new)[0].id
+        for prefix in (old_prefixes | new_prefixes) & self._top.keys():
+            top = self._top[prefix]
+            rest = [s for s in top if (s.kind, s.id) != ident]
+            was_full = len(top) >= MAX_LIMIT
+            dropped = len(rest) < len(top)
+            if prefix in new_prefixes:
+                rest.append(new[0])
+                rest.sort(key=_rank)
+                if len(rest) > MAX_LIMIT:
+                    del rest[MAX_LIMIT:]
+                elif was_full and dropped and rest[-1] is new[0]:
+                    del self._top[prefix]
+                    continue
+            elif was_full and dropped:
+                del self._top[prefix]
+                continue
+            self._top[prefix] = rest
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        prefix = normalize(prefix)
+        if len(prefix) < MIN_PREFIX_LENGTH:
+            return []
+        with self._lock:
+            top = self._top.get(prefix)
+            if top is not None and limit <= MAX_LIMIT:
+                return top[:limit]
+            start = bisect.bisect_left(self._keys, (prefix,))
+            end = bisect.bisect_left(self._keys, (prefix + '\uffff',), start)
+            if end - start <= BROAD_PREFIX_KEYS or limit > MAX_LIMIT:
+                return self._best(start, end, limit)
+            top = self._top[prefix] = self._best(start, end, MAX_LIMIT)
+            return top[:limit]
+
+    def _best(self, start, end, limit):
+        seen = {}
+        for _, neg_popularity, kind, id in self._keys[start:end]:
+            seen.setdefault((kind, id), neg_popularity)
+        best = heapq.nsmallest(limit, seen.items(), key=lambda item: (item[1], item[0]))
+        return [self._entries[key][0] for key, _ in best]
+
+
+def _rank(suggestion):
+    return -suggestion.popularity, suggestion.kind, suggestion.id
+
+
+def _prefixes(keys):
+    return {term[:length] for term, *_ in keys for length in range(1, len(term) + 1)}
+
+
+class CatalogAutocomplete:
+    """Destination and hotel suggestions ranked by popularity"""
+
+    def __init__(self):
+        self.index = PrefixIndex()
+        self.ready = False
+        self._token = None
+        self._checked_at = 0.0
+        self._build_lock = threading.Lock()
+
+    def current(self):
+        """Whether lookups can be answered without rebuilding from the database"""
+        interval = getattr(settings, 'AUTOCOMPLETE_CHECK_SECONDS', 5)
+        if self.ready and time.monotonic() - self._checked_at >= interval:
+            self._checked_at = time.monotonic()
+            if cache.get(TOKEN_KEY) != self._token:
+                self.ready = False
+        return self.ready
+
+    def ensure_built(self):
+        if not self.current():
+            with self._build_lock:
+                if not self.ready:
+                    self.rebuild()
+
+    def rebuild(self):
+        # Token first: a change published during the queries forces another build
+        token = cache.get(TOKEN_KEY)
+        destinations = (_destination_entry(destination) for destination in _destination_queryset())
+        hotels = (_hotel_entry(hotel) for hotel in _hotel_queryset())
+        self.index = PrefixIndex.build(chain(destinations, hotels))
+        self._token = token
+        self._checked_at = time.monotonic()
+        self.ready = True
+
+    def invalidate(self):
+        """Tell every process, this one included, to rebuild on its next lookup"""
+        cache.set(TOKEN_KEY, uuid.uuid4().hex, None)
+        self.ready = False
+
+    def _publish(self):
+        # This process patched its own index; the others rebuild. Keep ours
+        # unless someone else published since it was built or checked.
+        token = uuid.uuid4().hex
+        current = cache.get(TOKEN_KEY) == self._token
+        cache.set(TOKEN_KEY, token, None)
+        if current:
+            self._token = token
+        else:
+            self.ready = False
+
+    def search(self, prefix, limit=DEFAULT_LIMIT):
+        self.ensure_built()
+        return self.index.search(prefix, limit)
+
+    def refresh_destination(self, destination_id):
+        """Re-index a destination and the hotels whose labels embed it"""
+        if self.ready:
+            destination = _destination_queryset().filter(pk=destination_id).first()
+            if destination is None:
+                self.index.remove('destination', destination_id)
+            else:
+                self.index.add(*_destination_entry(destination))
+                for hotel in _hotel_queryset().filter(destination_id=destination_id):
+                    self.index.add(*_hotel_entry(hotel))
+        self._publish()
+
+    def refresh_hotel(self, hotel_id, destination_id=None):
+        """Re-index a hotel, after saves and after reviews change its rank"""
+        if self.ready:
+            hotel = _hotel_queryset().filter(pk=hotel_id).first()
+            if hotel is None:
+                self.index.remove('hotel', hotel_id)
+            else:
+                self.index.add(*_hotel_entry(hotel))
+                destination_id = hotel.destination_id
+            if destination_id is not None:
+                # Hotel counts drive destination ranking
+                destination = _destination_queryset().filter(pk=destination_id).first()
+                if destination is not None:
+                    self.index.add(*_destination_entry(destination))
+        self._publish()
+
+    def remove_destination(self, destination_id):
+        if self.ready:
+            self.index.remove('destination', destination_id)
+        self._publish()
+
+
+def _keys(suggestion, terms):
+    return [(term, -suggestion.popularity, suggestion.kind, suggestion.id) for term in terms]
+
+
+def _destination_queryset():
+    from .models import Destination
+    return Destination.objects.annotate(
+        active_hotels=Count('hotels', filter=Q(hotels__is_active=True))
+    ).only('id', 'name', 'city', 'country', 'is_featured')
+
+
+def _hotel_queryset():
+    from .models import Hotel
+    return Hotel.objects.filter(is_active=True).select_related('destination', 'rating').only(
+        'id', 'name', 'destination_id', 'destination__city', 'destination__country', 'rating__total_reviews'
+    )
+
+
+def _destination_entry(destination):
+    # Featured destinations outrank equally sized ones
+    popularity = destination.active_hotels * 2 + (1 if destination.is_featured else 0)
+    suggestion = Suggestion('destination', destination.id, str(destination), popularity)
+    return suggestion, _terms(destination.name, destination.city, destination.country)
+
+
+def _hotel_entry(hotel):
+    label = f"{hotel.name}, {hotel.destination.city}, {hotel.destination.country}"
+    suggestion = Suggestion('hotel', hotel.id, label, hotel.review_count)
+    return suggestion, _terms(hotel.name)
+
+
+catalog_autocomplete = CatalogAutocomplete()
@@ -0,0 +1,108 @@
+"""
+Per-hotel availability, pricing and guest score for a stay.
+
+The page needs four independent lookups. ``hotel_availability`` runs them
+one after another for the sync view; ``ahotel_availability`` runs them
+concurrently for the async view. Both share the same queries and assembly.
+"""
+from datetime import date
+from functools import partial
+
+from django.db.models import Sum
+
+from apps.bookings.holds import active_holds
+from apps.bookings.models import Booking
+from apps.bookings.postgres import overlapping
+from apps.core.aio import gather_queries
+from apps.reviews.models import ProviderRating
+from .models import RoomType
+
+ACTIVE_STATUSES = ['confirmed', 'pending']
+
+
+class InvalidStay(ValueError):
+    pass
+
+
+def parse_stay(params):
+    """(check_in, check_out, num_rooms) from query parameters"""
+    try:
+        check_in = date.fromisoformat(params['check_in'])
+        check_out = date.fromisoformat(params['check_out'])
+        num_rooms = int(params.get('rooms', 1))
+    except (KeyError, ValueError):
+        raise InvalidStay('Expected check_in and check_out as YYYY-MM-DD and an integer rooms')
+    if check_out <= check_in or num_rooms < 1:
+        raise InvalidStay('check_out must be after check_in and rooms at least 1')
+    return check_in, check_out, num_rooms
+
+
+def room_types(hotel_id):
+    return list(
+        RoomType.objects.filter(hotel_id=hotel_id).order_by('price_per_night')
+        .values('id', 'name', 'max_occupancy', 'bed_type', 'price_per_night', 'total_rooms')
+    )
+
+
+def booked_rooms(hotel_id, check_in, check_out):
+    """Rooms taken by overlapping active bookings per room type, counted as RoomType.is_available does"""
+    bookings = overlapping(
+        Booking.objects.filter(room_type__hotel_id=hotel_id, status__in=ACTIVE_STATUSES), check_in, check_out
+    )
+    return dict(bookings.order_by().values('room_type_id').annotate(n=Sum('num_rooms')).values_list('room_type_id', 'n'))
+
+
+def held_rooms(hotel_id, check_in, check_out):
+    holds = active_holds().filter(room_type__hotel_id=hotel_id, check_in__lt=check_out, check_out__gt=check_in)
+    return dict(holds.order_by().values('room_type_id').annotate(n=Sum('num_rooms')).values_list('room_type_id', 'n'))
+
+
+def guest_score(hotel_id):
+    rating = ProviderRating.objects.filter(hotel_id=hotel_id).values('avg_rating', 'total_reviews').first()
+    return rating or {'avg_rating': 0, 'total_reviews': 0}
+
+
+def _lookups(hotel_id, check_in, check_out):
+    return [
+        partial(room_types, hotel_id),
+        partial(booked_rooms, hotel_id, check_in, check_out),
+        partial(held_rooms, hotel_id, check_in, check_out),
+        partial(guest_score, hotel_id),
+    ]
+
+
+def build(hotel_id, check_in, check_out, num_rooms, types, booked, held, score):
+    nights = (check_out - check_in).days
+    rooms = []
+    for room_type in types:
+        free = room_type['total_rooms'] - booked.get(room_type['id'], 0) - held.get(room_type['id'], 0)
+        rooms.append({
+            'id': room_type['id'],
+            'name': room_type['name'],
+            'max_occupancy': room_type['max_occupancy'],
+            'bed_type': room_type['bed_type'],
+            'price_per_night': str(room_type['price_per_night']),
+            'total_price': str(room_type['price_per_night'] * nights * num_rooms),
+            'rooms_left': max(free, 0),
+            'available': free >= num_rooms,
+        })
+    return {
+        'hotel': hotel_id,
+        'check_in': check_in.isoformat(),
+        'check_out': check_out.isoformat(),
+        'nights': nights,
+        'rooms': num_rooms,
+        'guest_score': float(score['avg_rating']),
+        'review_count': score['total_reviews'],
+        'room_types': rooms,
+    }
+
+
+def hotel_availability(hotel_id, check_in, check_out, num_rooms=1):
+    results = [lookup() for lookup in _lookups(hotel_id, check_in, check_out)]
+    return build(hotel_id, check_in, check_out, num_rooms, *results)
+
+
+async def ahotel_availability(hotel_id, check_in, check_out, num_rooms=1):
+    results = await gather_queries(*_lookups(hotel_id, check_in, check_out))
+    return build(hotel_id, check_in, check_out, num_rooms, *results)
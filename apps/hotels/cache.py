@@ -0,0 +1,49 @@
+"""
+Cached hotel objects for the read paths.
+
+``hotel_cache`` holds each hotel with its destination, room types (and their
+amenities), amenity links and images already loaded, so a cached hotel can be
+serialized without touching the database. The guest rating is left out: it
+changes with every review and is read live.
+"""
+from django.db.models import Prefetch
+
+from apps.core.objectcache import ObjectCache
+from .models import Amenity, Destination, Hotel, HotelAmenity, HotelImage, RoomAmenity, RoomType
+
+
+def _room_type_hotels(room_amenity):
+    return RoomType.objects.filter(pk=room_amenity.room_type_id).values_list('hotel_id', flat=True)
+
+
+def _destination_hotels(destination):
+    return Hotel.objects.filter(destination_id=destination.pk).values_list('pk', flat=True)
+
+
+def _amenity_hotels(amenity):
+    linked = HotelAmenity.objects.filter(amenity_id=amenity.pk).values_list('hotel_id', flat=True)
+    rooms = RoomAmenity.objects.filter(amenity_id=amenity.pk).values_list('room_type__hotel_id', flat=True)
+    return set(linked) | set(rooms)
+
+
+def hotel_queryset():
+    return Hotel.objects.select_related('destination').prefetch_related(
+        'images',
+        Prefetch('hotel_amenities', HotelAmenity.objects.select_related('amenity')),
+        Prefetch('room_types', RoomType.objects.prefetch_related(
+            Prefetch('room_amenities', RoomAmenity.objects.select_related('amenity'))
+        )),
+    )
+
+
+hotel_cache = ObjectCache(
+    hotel_queryset,
+    depends_on={
+        RoomType: 'hotel_id',
+        HotelImage: 'hotel_id',
+        HotelAmenity: 'hotel_id',
+        RoomAmenity: _room_type_hotels,
+        Destination: _destination_hotels,
+        Amenity: _amenity_hotels,
+    },
+)
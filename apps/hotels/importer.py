@@ -0,0 +1,315 @@
+"""
+Streaming supplier catalog import.
+
+Feed records are buffered per entity type and upserted in batches with
+``bulk_create(update_conflicts=True)`` keyed on ``external_id`` (``name`` for
+amenities). Foreign keys in the feed refer to parent ``external_id`` values and
+are resolved through in-memory id maps, so a batch costs a handful of queries
+regardless of its size. Children whose parent is neither in the database nor
+in the feed so far are held back and retried once the whole feed has been
+read, so a feed need not list parents first. A hotel record that carries an
+``amenities`` field (even an empty one) replaces the hotel's amenity links;
+records without the field leave them alone. Search index maintenance is
+suspended for the run and
+rebuilt once at the end. ``bulk_create`` skips the signals, so the run ends by
+telling every process to reload its reference data snapshot and autocomplete
+index.
+"""
+import csv
+import json
+import time
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from .autocomplete import catalog_autocomplete
+from .cache import hotel_cache
+from .reference import reference_data
+from .models import Amenity, Destination, Hotel, HotelAmenity, HotelImage, RoomType
+from .search import hotel_search_index
+from .versions import touch_hotels
+
+DEFAULT_BATCH_SIZE = 1000
+LIST_SEPARATOR = '|'
+
+
+class FeedError(Exception):
+    """Raised for feeds that cannot be read at all"""
+
+
+@dataclass
+class ImportStats:
+    created: dict = field(default_factory=dict)
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+    rows: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def count(self, kind, n):
+        self.created[kind] = self.created.get(kind, 0) + n
+
+    def error(self, message):
+        self.skipped += 1
+        if len(self.errors) < 100:
+            self.errors.append(message)
+
+
+# Upsert order: parents before children
+ENTITY_ORDER = ['amenity', 'destination', 'hotel', 'room_type', 'hotel_image']
+
+ENTITY_MODELS = {
+    'amenity': Amenity,
+    'destination': Destination,
+    'hotel': Hotel,
+    'room_type': RoomType,
+    'hotel_image': HotelImage,
+}
+
+# Child entity -> (parent entity, feed column, foreign key attname)
+PARENT_REFS = {
+    'hotel': ('destination', 'destination', 'destination_id'),
+    'room_type': ('hotel', 'hotel', 'hotel_id'),
+    'hotel_image': ('hotel', 'hotel', 'hotel_id'),
+}
+
+
+def read_records(stream, fmt, entity=None):
+    """Yield feed records one at a time from a CSV or JSON-lines stream"""
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            if entity:
+                row.setdefault('type', entity)
+            yield row
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise FeedError(f'Line {line_number}: invalid JSON ({exc})') from exc
+            if entity:
+                record.setdefault('type', entity)
+            yield record
+    else:
+        raise FeedError(f'Unsupported feed format: {fmt}')
+
+
+def _key_field(model):
+    return 'name' if model is Amenity else 'external_id'
+
+
+def _coerce(model, record):
+    """
+    Convert raw feed values to model values. Absent columns get field
+    defaults; a missing required number, date or the like raises ValueError.
+    """
+    values = {}
+    for model_field in model._meta.concrete_fields:
+        if model_field.primary_key or model_field.is_relation or not model_field.editable:
+            continue
+        raw = record.get(model_field.name)
+        if raw is None or raw == '':
+            if model_field.has_default():
+                values[model_field.attname] = model_field.get_default()
+            elif model_field.null:
+                values[model_field.attname] = None
+            elif model_field.empty_strings_allowed:
+                values[model_field.attname] = ''
+            else:
+                raise ValueError(f'missing required field {model_field.name!r}')
+        elif model_field.get_internal_type() == 'BooleanField' and isinstance(raw, str):
+            values[model_field.attname] = raw.strip().lower() in ('1', 'true', 'yes', 'y')
+        else:
+            value = model_field.to_python(raw)
+            model_field.run_validators(value)
+            values[model_field.attname] = value
+    return values
+
+
+def _update_fields(model):
+    key = _key_field(model)
+    return [
+        f.name for f in model._meta.concrete_fields
+        if not f.primary_key and f.name != key and f.name != 'created_at'
+        and (f.editable or f.name == 'updated_at')
+    ]
+
+
+class CatalogImporter:
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, using='default', progress=None):
+        self.batch_size = batch_size
+        self.using = using
+        self.progress = progress
+        self.stats = ImportStats()
+        self.id_maps = {entity: {} for entity in ENTITY_ORDER}
+        self.buffers = {entity: {} for entity in ENTITY_ORDER}
+        self.hotel_amenities = {}
+        self.deferred = {entity: {} for entity in PARENT_REFS}
+        self._final_pass = False
+        self._created_amenities = False
+        self._pending = 0
+
+    def run(self, records):
+        """Import every record, then rebuild derived indexes once"""
+        with hotel_search_index.deferred(using=self.using):
+            for record in records:
+                self.add(record)
+            self.flush()
+            self._flush_deferred()
+        transaction.on_commit(self._invalidate_snapshots, using=self.using)
+        return self.stats
+
+    def _flush_deferred(self):
+        """Retry children whose parents came later in the feed; report those still orphaned"""
+        self._final_pass = True
+        for entity, rows in self.deferred.items():
+            self.buffers[entity].update(rows)
+            self._pending += len(rows)
+            rows.clear()
+        self.flush()
+        self.hotel_amenities.clear()
+
+    def _invalidate_snapshots(self):
+        if self.stats.created.get('amenity') or self._created_amenities:
+            reference_data.amenities.invalidate()
+        if self.stats.created.get('destination'):
+            reference_data.destinations.invalidate()
+        if any(self.stats.created.get(entity) for entity in ('destination', 'hotel')):
+            catalog_autocomplete.invalidate()
+
+    def add(self, record):
+        self.stats.rows += 1
+        entity = (record.get('type') or '').strip()
+        model = ENTITY_MODELS.get(entity)
+        if model is None:
+            self.stats.error(f'Row {self.stats.rows}: unknown type {entity!r}')
+            return
+        key = (record.get(_key_field(model)) or '').strip()
+        if not key:
+            self.stats.error(f'Row {self.stats.rows}: missing {_key_field(model)} for {entity}')
+            return
+        try:
+            values = _coerce(model, record)
+        except Exception as exc:
+            self.stats.error(f'Row {self.stats.rows}: {entity} {key}: {exc}')
+            return
+        values[_key_field(model)] = key
+        parent = record.get(PARENT_REFS[entity][1]) if entity in PARENT_REFS else None
+        self.buffers[entity][key] = (values, (parent or '').strip())
+        if entity == 'hotel' and 'amenities' in record:
+            names = record['amenities'] or []
+            if isinstance(names, str):
+                names = names.split(LIST_SEPARATOR)
+            self.hotel_amenities[key] = [n.strip() for n in names if n.strip()]
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with transaction.atomic(using=self.using):
+            for entity in ENTITY_ORDER:
+                if entity == 'hotel' and self.hotel_amenities:
+                    self._ensure_amenities()
+                buffer = self.buffers[entity]
+                if buffer:
+                    self._upsert(entity, buffer)
+                    buffer.clear()
+                if entity == 'hotel' and self.hotel_amenities:
+                    self._link_amenities()
+        self._pending = 0
+        if self.progress:
+            self.progress(self.stats)
+
+    def _resolve(self, entity, keys):
+        """Fill the id map for parent keys not seen in this run"""
+        id_map = self.id_maps[entity]
+        missing = {k for k in keys if k and k not in id_map}
+        if missing:
+            model = ENTITY_MODELS[entity]
+            key_field = _key_field(model)
+            rows = model.objects.using(self.using).filter(**{f'{key_field}__in': missing})
+            id_map.update(rows.values_list(key_field, 'pk'))
+        return id_map
+
+    def _upsert(self, entity, buffer):
+        model = ENTITY_MODELS[entity]
+        key_field = _key_field(model)
+        objs = []
+        if entity in PARENT_REFS:
+            parent_entity, _, attname = PARENT_REFS[entity]
+            parents = self._resolve(parent_entity, {parent for _, parent in buffer.values()})
+        for key, (values, parent) in buffer.items():
+            if entity in PARENT_REFS:
+                if parent not in parents:
+                    if self._final_pass:
+                        self.stats.error(f'{entity} {key}: unknown {parent_entity} {parent!r}')
+                    else:
+                        self.deferred[entity][key] = (values, parent)
+                    continue
+                values[attname] = parents[parent]
+            objs.append(model(**values))
+        if not objs:
+            return
+        model.objects.using(self.using).bulk_create(
+            objs,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=[key_field],
+            update_fields=_update_fields(model),
+        )
+        self.stats.count(entity, len(objs))
+        self._resolve(entity, [getattr(obj, key_field) for obj in objs])
+        # bulk_create skips the signals that version and invalidate cached hotels
+        if entity == 'hotel':
+            hotel_cache.invalidate([self.id_maps['hotel'][obj.external_id] for obj in objs])
+        elif entity == 'destination':
+            destinations = [self.id_maps['destination'][obj.external_id] for obj in objs]
+            hotel_cache.invalidate(
+                Hotel.objects.using(self.using).filter(destination_id__in=destinations).values_list('pk', flat=True)
+            )
+        elif PARENT_REFS.get(entity, ('',))[0] == 'hotel':
+            touch_hotels({obj.hotel_id for obj in objs}, using=self.using)
+
+    def _ensure_amenities(self):
+        # Amenities named by hotels but absent from the feed are created as 'general'
+        names = {name for names in self.hotel_amenities.values() for name in names}
+        known = self._resolve('amenity', names)
+        new = [Amenity(name=name, category='general') for name in names if name not in known]
+        if new:
+            Amenity.objects.using(self.using).bulk_create(new, ignore_conflicts=True)
+            self._created_amenities = True
+            self._resolve('amenity', [a.name for a in new])
+
+    def _link_amenities(self):
+        """Make each imported hotel's amenity links exactly those its record lists"""
+        hotels = self.id_maps['hotel']
+        amenities = self.id_maps['amenity']
+        imported = {key: names for key, names in self.hotel_amenities.items() if key in hotels}
+        wanted = {
+            (hotels[hotel_key], amenities[name])
+            for hotel_key, names in imported.items() for name in names if name in amenities
+        }
+        existing = HotelAmenity.objects.using(self.using).filter(
+            hotel_id__in=[hotels[key] for key in imported]
+        ).values_list('pk', 'hotel_id', 'amenity_id')
+        stale = [pk for pk, hotel_id, amenity_id in existing if (hotel_id, amenity_id) not in wanted]
+        if stale:
+            HotelAmenity.objects.using(self.using).filter(pk__in=stale).delete()
+        links = [HotelAmenity(hotel_id=hotel_id, amenity_id=amenity_id) for hotel_id, amenity_id in wanted]
+        HotelAmenity.objects.using(self.using).bulk_create(links, batch_size=self.batch_size, ignore_conflicts=True)
+        self.stats.count('hotel_amenity', len(links))
+        # Hotels held back for a later parent keep their names until they are imported
+        for key in imported:
+            del self.hotel_amenities[key]
@@ -0,0 +1,92 @@
+"""
+Fast path for hotel listings.
+
+``hotel_cards`` builds the same dicts as ``HotelCardSerializer`` straight
+from ``values()`` rows: one query for the hotels and one per nested relation,
+then plain dict assembly. Nothing is instantiated per row beyond the dicts,
+so the cost no longer grows with serializer field introspection. Decimal
+columns are turned into strings here, as REST framework renders them, so the
+cards are plain JSON values.
+"""
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db.models import DecimalField, F, Prefetch
+from django.utils.encoding import filepath_to_uri
+
+from .models import Hotel, HotelAmenity, HotelImage, RoomType
+
+HOTEL_COLUMNS = (
+    'id', 'name', 'address', 'latitude', 'longitude', 'star_rating', 'hotel_type',
+    'check_in_time', 'check_out_time', 'updated_at',
+)
+IMAGE_COLUMNS = ('id', 'image', 'caption', 'is_primary', 'order')
+ROOM_TYPE_COLUMNS = ('id', 'name', 'max_occupancy', 'bed_type', 'price_per_night', 'total_rooms')
+
+
+def _decimal_columns(model, columns):
+    return tuple(column for column in columns if isinstance(model._meta.get_field(column), DecimalField))
+
+
+HOTEL_DECIMALS = _decimal_columns(Hotel, HOTEL_COLUMNS)
+ROOM_TYPE_DECIMALS = _decimal_columns(RoomType, ROOM_TYPE_COLUMNS)
+
+
+def hotel_card_queryset():
+    """The ORM route to the same data, for ``HotelCardSerializer``"""
+    return Hotel.objects.select_related('destination').prefetch_related(
+        Prefetch('images', HotelImage.objects.order_by('-is_primary', 'order', 'id')),
+        Prefetch('hotel_amenities', HotelAmenity.objects.select_related('amenity').order_by('amenity__name')),
+        Prefetch('room_types', RoomType.objects.order_by('price_per_night', 'id')),
+    )
+
+
+def _media_url_builder():
+    """``storage.url`` without the per-call ``urljoin`` when files are stored locally"""
+    if isinstance(default_storage, FileSystemStorage):
+        base = default_storage.base_url
+        return lambda name: base + filepath_to_uri(name).lstrip('/') if name else None
+    return lambda name: default_storage.url(name) if name else None
+
+
+def _stringify(row, columns):
+    for column in columns:
+        if row[column] is not None:
+            row[column] = str(row[column])
+    return row
+
+
+def _grouped(queryset, columns, decimals=()):
+    """``{hotel_id: [row, ...]}`` keeping the queryset order"""
+    groups = {}
+    for values in queryset.values_list('hotel_id', *columns):
+        groups.setdefault(values[0], []).append(_stringify(dict(zip(columns, values[1:])), decimals))
+    return groups
+
+
+def hotel_cards(hotel_ids):
+    """Listing dicts for ``hotel_ids``, in that order; unknown ids are skipped"""
+    rows = Hotel.objects.filter(pk__in=hotel_ids).values(
+        *HOTEL_COLUMNS, city=F('destination__city'), country=F('destination__country')
+    )
+    hotels = {row['id']: _stringify(row, HOTEL_DECIMALS) for row in rows}
+    images = HotelImage.objects.filter(hotel_id__in=hotels).order_by('-is_primary', 'order', 'id')
+    images = _grouped(images, IMAGE_COLUMNS)
+    rooms = RoomType.objects.filter(hotel_id__in=hotels).order_by('price_per_night', 'id')
+    rooms = _grouped(rooms, ROOM_TYPE_COLUMNS, ROOM_TYPE_DECIMALS)
+    amenities = {}
+    links = HotelAmenity.objects.filter(hotel_id__in=hotels).order_by('amenity__name')
+    for hotel_id, name in links.values_list('hotel_id', 'amenity__name'):
+        amenities.setdefault(hotel_id, []).append(name)
+
+    media_url = _media_url_builder()
+    cards = []
+    for pk in hotel_ids:
+        card = hotels.get(pk)
+        if card is None:
+            continue
+        card['images'] = hotel_images = images.get(pk, [])
+        for image in hotel_images:
+            image['image'] = media_url(image['image'])
+        card['amenities'] = amenities.get(pk, [])
+        card['room_types'] = rooms.get(pk, [])
+        cards.append(card)
+    return cards
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.hotels.importer import DEFAULT_BATCH_SIZE, ENTITY_ORDER, CatalogImporter, FeedError, read_records
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream a supplier catalog feed (CSV or JSON lines) into destinations, hotels, '
+        'room types, amenities and images, upserting on external_id'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('feed', help="Feed file path, or '-' for stdin")
+        parser.add_argument('--format', choices=sorted(set(FORMATS.values())), help='Defaults to the file extension')
+        parser.add_argument('--type', dest='entity', choices=ENTITY_ORDER,
+                            help='Entity type for feeds without a type column')
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or FORMATS.get(Path(options['feed']).suffix.lower())
+        if fmt is None:
+            raise CommandError('Cannot infer the feed format; pass --format')
+
+        verbose = options['verbosity'] > 1
+        importer = CatalogImporter(
+            batch_size=options['batch_size'],
+            using=options['database'],
+            progress=self._report_progress if verbose else None,
+        )
+        stream = sys.stdin if options['feed'] == '-' else open(options['feed'], newline='', encoding='utf-8')
+        try:
+            stats = importer.run(read_records(stream, fmt, options['entity']))
+        except FeedError as exc:
+            raise CommandError(str(exc)) from exc
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for entity, count in stats.created.items():
+            self.stdout.write(f'{entity}: {count} upserted')
+        for message in stats.errors:
+            self.stderr.write(message)
+        self.stdout.write(self.style.SUCCESS(
+            f'{stats.rows} rows in {stats.elapsed:.1f}s ({stats.rows_per_second:,.0f} rows/s), '
+            f'{stats.skipped} skipped'
+        ))
+
+    def _report_progress(self, stats):
+        self.stdout.write(f'{stats.rows} rows, {stats.rows_per_second:,.0f} rows/s')
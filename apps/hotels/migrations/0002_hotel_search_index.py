@@ -0,0 +1,49 @@
+from django.db import migrations
+
+# Frozen copy of apps.hotels.search.hotel_search_index as of this migration
+INSTALL_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS hotels_hotel_fts USING fts5(name, address, description, "
+    "content='hotels_hotel', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS hotels_hotel_fts_ai AFTER INSERT ON hotels_hotel BEGIN "
+    "INSERT INTO hotels_hotel_fts(rowid, name, address, description) "
+    "VALUES (new.id, new.name, new.address, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS hotels_hotel_fts_ad AFTER DELETE ON hotels_hotel BEGIN "
+    "INSERT INTO hotels_hotel_fts(hotels_hotel_fts, rowid, name, address, description) "
+    "VALUES ('delete', old.id, old.name, old.address, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS hotels_hotel_fts_au AFTER UPDATE OF name, address, description ON hotels_hotel "
+    "BEGIN INSERT INTO hotels_hotel_fts(hotels_hotel_fts, rowid, name, address, description) "
+    "VALUES ('delete', old.id, old.name, old.address, old.description); "
+    "INSERT INTO hotels_hotel_fts(rowid, name, address, description) "
+    "VALUES (new.id, new.name, new.address, new.description); END",
+    "INSERT INTO hotels_hotel_fts(hotels_hotel_fts) VALUES ('rebuild')",
+]
+
+UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS hotels_hotel_fts_ai",
+    "DROP TRIGGER IF EXISTS hotels_hotel_fts_ad",
+    "DROP TRIGGER IF EXISTS hotels_hotel_fts_au",
+    "DROP TABLE IF EXISTS hotels_hotel_fts",
+]
+
+
+def install_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in INSTALL_SQL:
+            schema_editor.execute(sql)
+
+
+def uninstall_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in UNINSTALL_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_index, uninstall_index),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:49
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+# The 0002 index SQL, frozen with it: CREATE ... IF NOT EXISTS plus a rebuild
+INDEX_SQL = import_module("apps.hotels.migrations.0002_hotel_search_index").INSTALL_SQL
+
+
+def reinstall_index(apps, schema_editor):
+    # Adding or removing a unique column rebuilds hotels_hotel on SQLite,
+    # dropping its triggers, so they are restored both ways
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in INDEX_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0002_hotel_search_index"),
+    ]
+
+    operations = [
+        # Unapplying runs the operations backwards, so this restores the
+        # triggers after the columns are removed
+        migrations.RunPython(migrations.RunPython.noop, reinstall_index),
+        migrations.AddField(
+            model_name="destination",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="hotel",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="hotelimage",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="roomtype",
+            name="external_id",
+            field=models.CharField(blank=True, max_length=100, null=True, unique=True),
+        ),
+        migrations.RunPython(reinstall_index, migrations.RunPython.noop),
+    ]
@@ -4,6 +4,7 @@ from django.core.validators import MinValueValidator, MaxValueValidator
 
 class Destination(models.Model):
     """Travel destinations"""
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)  # Supplier feed key
     name = models.CharField(max_length=200)
     country = models.CharField(max_length=100)
     city = models.CharField(max_length=100)
@@ -11,11 +12,23 @@ class Destination(models.Model):
     image = models.ImageField(upload_to='destinations/')
     is_featured = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.city}, {self.country}"
 
 
+class HotelQuerySet(models.QuerySet):
+    def by_guest_score(self):
+        """Best rated first, read from the provider_ratings rollup"""
+        return self.select_related('rating').order_by(
+            models.F('rating__avg_rating').desc(nulls_last=True), '-rating__total_reviews', 'pk'
+        )
+
+    def with_min_guest_score(self, score):
+        return self.filter(rating__avg_rating__gte=score)
+
+
 class Hotel(models.Model):
     """Hotel listings"""
     HOTEL_TYPES = [
@@ -26,6 +39,7 @@ class Hotel(models.Model):
         ('hostel', 'Hostel'),
     ]
 
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     name = models.CharField(max_length=200)
     destination = models.ForeignKey(Destination, on_delete=models.CASCADE, related_name='hotels')
     address = models.CharField(max_length=300)
@@ -41,19 +55,21 @@ class Hotel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = HotelQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
     @property
     def average_rating(self):
-        reviews = self.reviews.all()
-        if reviews.exists():
-            return sum(r.overall_rating for r in reviews) / reviews.count()
-        return 0
+        # Maintained in provider_ratings by apps.reviews.ratings
+        rating = getattr(self, 'rating', None)
+        return float(rating.avg_rating) if rating else 0
 
     @property
     def review_count(self):
-        return self.reviews.count()
+        rating = getattr(self, 'rating', None)
+        return rating.total_reviews if rating else 0
 
     @property
     def starting_price(self):
@@ -65,6 +81,7 @@ class Hotel(models.Model):
 
 class HotelImage(models.Model):
     """Hotel images"""
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='images')
     image = models.ImageField(upload_to='hotels/')
     caption = models.CharField(max_length=200, blank=True)
@@ -83,6 +100,7 @@ class Amenity(models.Model):
     name = models.CharField(max_length=100, unique=True)
     icon = models.CharField(max_length=50, blank=True)
     category = models.CharField(max_length=50)  # e.g., 'general', 'room', 'activity'
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = 'Amenities'
@@ -104,6 +122,7 @@ class HotelAmenity(models.Model):
 
 class RoomType(models.Model):
     """Different room types available in a hotel"""
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, related_name='room_types')
     name = models.CharField(max_length=100)
     description = models.TextField()
@@ -117,16 +136,18 @@ class RoomType(models.Model):
     def __str__(self):
         return f"{self.hotel.name} - {self.name}"
 
-    def is_available(self, check_in, check_out):
-        """Check if room is available for given dates"""
+    def is_available(self, check_in, check_out, num_rooms=1):
+        """Check if room is available for given dates, counting unexpired checkout holds"""
+        from apps.bookings.holds import held_rooms
         from apps.bookings.models import Booking
-        overlapping_bookings = Booking.objects.filter(
-            room_type=self,
-            status__in=['confirmed', 'pending'],
-            check_in__lt=check_out,
-            check_out__gt=check_in
-        ).count()
-        return overlapping_bookings < self.total_rooms
+        from apps.bookings.postgres import overlapping
+        booked = overlapping(
+            Booking.objects.filter(room_type=self, status__in=['confirmed', 'pending']),
+            check_in,
+            check_out,
+        ).aggregate(rooms=models.Sum('num_rooms'))['rooms'] or 0
+        held = held_rooms(self, check_in, check_out)
+        return booked + held + num_rooms <= self.total_rooms
 
 
 class RoomAmenity(models.Model):
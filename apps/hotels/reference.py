@@ -0,0 +1,151 @@
+"""
+In-process snapshot of the small reference tables (amenities, destinations).
+
+Listings and filter sidebars read these on every request, so each worker
+keeps them in memory as immutable typed rows and answers without queries.
+Snapshots are loaded when the first request starts (queries in
+``AppConfig.ready`` run before the database may be usable) and reloaded when:
+
+* a save or delete in this process fires the invalidation signal, or
+* another process has published a newer token in the shared cache, checked
+  at most every ``REFERENCE_DATA_CHECK_SECONDS``.
+
+Each table holds at most ``REFERENCE_DATA_MAX_ROWS`` rows. A table that
+outgrows the bound stops being served as a full listing and falls back to
+the database, while single-row lookups go through a bounded LRU.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Generic, Optional, TypeVar
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class AmenityRef:
+    id: int
+    name: str
+    icon: str
+    category: str
+
+
+@dataclass(frozen=True)
+class DestinationRef:
+    id: int
+    name: str
+    city: str
+    country: str
+    is_featured: bool
+
+    def __str__(self):
+        return f"{self.city}, {self.country}"
+
+
+class ReferenceTable(Generic[T]):
+    def __init__(self, model_label, row_type, ordering):
+        self.model_label = model_label
+        self.row_type = row_type
+        self.ordering = ordering
+        self.columns = [f.name for f in fields(row_type)]
+        self.token_key = f'reference-data:{model_label.lower()}'
+        self._lock = threading.Lock()
+        self._rows = None  # Ordered tuple, or None when not loaded or too large
+        self._by_id = {}
+        self._lru = OrderedDict()
+        self._token = None
+        self._checked_at = 0.0
+        self._loaded = False
+
+    @property
+    def max_rows(self):
+        return getattr(settings, 'REFERENCE_DATA_MAX_ROWS', 5000)
+
+    def _queryset(self):
+        # From the primary: a replica lagging behind the write that changed the
+        # token would be snapshotted as current until the next invalidation
+        model = apps.get_model(self.model_label)
+        return model.objects.using('default').order_by(*self.ordering).values_list(*self.columns)
+
+    def load(self):
+        # Token first: an invalidation during the query then forces another load
+        token = cache.get(self.token_key)
+        rows = [self.row_type(*values) for values in self._queryset()[:self.max_rows + 1]]
+        complete = len(rows) <= self.max_rows
+        with self._lock:
+            self._rows = tuple(rows) if complete else None
+            self._by_id = {row.id: row for row in rows} if complete else {}
+            self._lru.clear()
+            self._token = token
+            self._checked_at = time.monotonic()
+            self._loaded = True
+
+    def _fresh(self):
+        if not self._loaded:
+            self.load()
+            return
+        interval = getattr(settings, 'REFERENCE_DATA_CHECK_SECONDS', 5)
+        if time.monotonic() - self._checked_at < interval:
+            return
+        self._checked_at = time.monotonic()
+        if cache.get(self.token_key) != self._token:
+            self.load()
+
+    def invalidate(self):
+        """Drop this process's snapshot and tell the others to reload theirs"""
+        cache.set(self.token_key, uuid.uuid4().hex, None)
+        self._loaded = False
+
+    def all(self) -> tuple:
+        """Every row in table order"""
+        self._fresh()
+        rows = self._rows
+        if rows is None:
+            return tuple(self.row_type(*values) for values in self._queryset())
+        return rows
+
+    def get(self, pk) -> Optional[T]:
+        self._fresh()
+        if self._rows is not None:
+            return self._by_id.get(pk)
+        with self._lock:
+            if pk in self._lru:
+                self._lru.move_to_end(pk)
+                return self._lru[pk]
+        values = self._queryset().filter(pk=pk).first()
+        row = self.row_type(*values) if values else None
+        with self._lock:
+            self._lru[pk] = row
+            if len(self._lru) > self.max_rows:
+                self._lru.popitem(last=False)
+        return row
+
+
+class ReferenceData:
+    def __init__(self):
+        self.amenities: ReferenceTable[AmenityRef] = ReferenceTable(
+            'hotels.Amenity', AmenityRef, ('category', 'name')
+        )
+        self.destinations: ReferenceTable[DestinationRef] = ReferenceTable(
+            'hotels.Destination', DestinationRef, ('country', 'city', 'name')
+        )
+
+    def tables(self):
+        return (self.amenities, self.destinations)
+
+    def warm(self):
+        for table in self.tables():
+            table.load()
+
+    def invalidate(self):
+        for table in self.tables():
+            table.invalidate()
+
+
+reference_data = ReferenceData()
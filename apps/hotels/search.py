@@ -0,0 +1,4 @@
+from apps.core.fulltext import FullTextIndex
+
+# Name matches weigh most, then address, then the free-text description
+hotel_search_index = FullTextIndex('hotels.Hotel', ['name', 'address', 'description'], weights=[10.0, 2.0, 1.0])
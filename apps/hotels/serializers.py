@@ -0,0 +1,89 @@
+from rest_framework import serializers
+
+from .models import Destination, Hotel, HotelImage, RoomType
+
+
+class HotelSummarySerializer(serializers.ModelSerializer):
+    city = serializers.CharField(source='destination.city', read_only=True)
+    country = serializers.CharField(source='destination.country', read_only=True)
+
+    class Meta:
+        model = Hotel
+        fields = ['id', 'name', 'city', 'country', 'address', 'star_rating', 'hotel_type']
+
+
+class HotelImageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HotelImage
+        fields = ['id', 'image', 'caption', 'is_primary', 'order']
+
+
+class RoomTypeSerializer(serializers.ModelSerializer):
+    amenities = serializers.SerializerMethodField()
+
+    class Meta:
+        model = RoomType
+        fields = [
+            'id', 'name', 'description', 'size_sqm', 'max_occupancy', 'bed_type',
+            'price_per_night', 'total_rooms', 'image', 'amenities',
+        ]
+
+    def get_amenities(self, obj):
+        return [link.amenity.name for link in obj.room_amenities.all()]
+
+
+class HotelDetailSerializer(serializers.ModelSerializer):
+    destination = serializers.SerializerMethodField()
+    amenities = serializers.SerializerMethodField()
+    images = HotelImageSerializer(many=True, read_only=True)
+    room_types = RoomTypeSerializer(many=True, read_only=True)
+    average_rating = serializers.FloatField(read_only=True)
+    total_reviews = serializers.IntegerField(source='review_count', read_only=True)
+
+    class Meta:
+        model = Hotel
+        fields = [
+            'id', 'name', 'destination', 'address', 'latitude', 'longitude', 'star_rating', 'hotel_type',
+            'description', 'check_in_time', 'check_out_time', 'cancellation_policy',
+            'average_rating', 'total_reviews', 'amenities', 'images', 'room_types', 'updated_at',
+        ]
+
+    def get_destination(self, obj):
+        destination = obj.destination
+        return {'id': destination.pk, 'name': destination.name, 'city': destination.city, 'country': destination.country}
+
+    def get_amenities(self, obj):
+        return [link.amenity.name for link in obj.hotel_amenities.all()]
+
+
+class DestinationDetailSerializer(serializers.ModelSerializer):
+    hotels = HotelSummarySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Destination
+        fields = ['id', 'name', 'city', 'country', 'description', 'image', 'is_featured', 'hotels', 'updated_at']
+
+
+class HotelCardRoomTypeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RoomType
+        fields = ['id', 'name', 'max_occupancy', 'bed_type', 'price_per_night', 'total_rooms']
+
+
+class HotelCardSerializer(serializers.ModelSerializer):
+    """Reference shape for ``listing.hotel_cards``, which the list endpoint serves"""
+    city = serializers.CharField(source='destination.city', read_only=True)
+    country = serializers.CharField(source='destination.country', read_only=True)
+    images = HotelImageSerializer(many=True, read_only=True)
+    amenities = serializers.SerializerMethodField()
+    room_types = HotelCardRoomTypeSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Hotel
+        fields = [
+            'id', 'name', 'city', 'country', 'address', 'latitude', 'longitude', 'star_rating', 'hotel_type',
+            'check_in_time', 'check_out_time', 'updated_at', 'images', 'amenities', 'room_types',
+        ]
+
+    def get_amenities(self, obj):
+        return [link.amenity.name for link in obj.hotel_amenities.all()]
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import catalog_autocomplete
+from .models import Amenity, Destination, Hotel, HotelAmenity, HotelImage, RoomAmenity, RoomType
+from .reference import reference_data
+from .versions import touch_hotels
+
+
+@receiver(post_save, sender=Destination)
+def index_destination(sender, instance, **kwargs):
+    transaction.on_commit(lambda: catalog_autocomplete.refresh_destination(instance.pk))
+
+
+@receiver(post_delete, sender=Destination)
+def unindex_destination(sender, instance, **kwargs):
+    destination_id = instance.pk
+    transaction.on_commit(lambda: catalog_autocomplete.remove_destination(destination_id))
+
+
+@receiver(post_save, sender=Hotel)
+def index_hotel(sender, instance, **kwargs):
+    transaction.on_commit(lambda: catalog_autocomplete.refresh_hotel(instance.pk))
+
+
+@receiver(post_delete, sender=Hotel)
+def unindex_hotel(sender, instance, **kwargs):
+    hotel_id, destination_id = instance.pk, instance.destination_id
+    transaction.on_commit(lambda: catalog_autocomplete.refresh_hotel(hotel_id, destination_id))
+
+
+@receiver([post_save, post_delete], sender=RoomType)
+@receiver([post_save, post_delete], sender=HotelImage)
+@receiver([post_save, post_delete], sender=HotelAmenity)
+def touch_parent_hotel(sender, instance, **kwargs):
+    # Hotel.updated_at versions the cached hotel page, children included
+    touch_hotels([instance.hotel_id], using=kwargs.get('using', 'default'))
+
+
+@receiver([post_save, post_delete], sender=RoomAmenity)
+def touch_room_hotel(sender, instance, **kwargs):
+    using = kwargs.get('using', 'default')
+    touch_hotels(RoomType.objects.using(using).filter(pk=instance.room_type_id).values_list('hotel_id', flat=True), using)
+
+
+@receiver(post_save, sender=Amenity)
+def touch_amenity_hotels(sender, instance, **kwargs):
+    # Hotel pages show amenity names; deletes reach them through the cascaded links
+    using = kwargs.get('using', 'default')
+    linked = Q(hotel_amenities__amenity=instance) | Q(room_types__room_amenities__amenity=instance)
+    touch_hotels(Hotel.objects.using(using).filter(linked).values_list('pk', flat=True), using)
+
+
+@receiver([post_save, post_delete], sender=Amenity)
+def refresh_amenities(sender, **kwargs):
+    reference_data.amenities.invalidate()
+    transaction.on_commit(reference_data.amenities.invalidate)
+
+
+@receiver([post_save, post_delete], sender=Destination)
+def refresh_destinations(sender, **kwargs):
+    reference_data.destinations.invalidate()
+    transaction.on_commit(reference_data.destinations.invalidate)
@@ -1,3 +1,648 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.factories import make_review
+from apps.core.fastjson import dumps
+from apps.core.testing import QueryAuditMixin
+from .autocomplete import (
+    BROAD_PREFIX_KEYS, MAX_LIMIT, TOKEN_KEY, PrefixIndex, Suggestion, catalog_autocomplete, normalize,
+)
+from .cache import hotel_cache
+from apps.bookings.models import Booking
+from .listing import hotel_card_queryset, hotel_cards
+from .models import Amenity, Destination, Hotel, HotelAmenity, HotelImage, RoomType
+from .reference import reference_data
+from .search import hotel_search_index
+from .serializers import HotelCardSerializer
+
+
+class PrefixIndexTests(TestCase):
+    def test_normalize_strips_accents_and_case(self):
+        """Test normalization folds accents, case and punctuation"""
+        self.assertEqual(normalize('  São  Paulo, Brasil '), 'sao paulo brasil')
+
+    def test_search_ranks_by_popularity(self):
+        """Test matches are ordered by popularity"""
+        index = PrefixIndex()
+        index.add(Suggestion('destination', 1, 'Paris, France', 5), {'paris'})
+        index.add(Suggestion('destination', 2, 'Parma, Italy', 9), {'parma'})
+        index.add(Suggestion('destination', 3, 'Rome, Italy', 20), {'rome'})
+        self.assertEqual([s.id for s in index.search('par')], [2, 1])
+
+    def test_remove_drops_all_terms(self):
+        """Test removing an entry clears every indexed term"""
+        index = PrefixIndex()
+        index.add(Suggestion('hotel', 1, 'Grand Hotel', 0), {'grand hotel', 'hotel'})
+        index.remove('hotel', 1)
+        self.assertEqual(index.search('hotel'), [])
+        self.assertEqual(len(index), 0)
+
+    def test_broad_prefixes_stay_ranked_through_changes(self):
+        """Test cached top lists for broad prefixes follow rank changes and removals"""
+        index = PrefixIndex.build(
+            (Suggestion('hotel', i, f'Hotel {i}', i), {f'hotel {i}'}) for i in range(BROAD_PREFIX_KEYS * 2)
+        )
+        top = BROAD_PREFIX_KEYS * 2 - 1
+        self.assertEqual([s.id for s in index.search('h', 2)], [top, top - 1])
+        index.add(Suggestion('hotel', 0, 'Hotel 0', 1000), {'hotel 0'})
+        self.assertEqual([s.id for s in index.search('h', 2)], [0, top])
+        index.remove('hotel', 0)
+        index.add(Suggestion('hotel', top, f'Hotel {top}', 0), {f'hotel {top}'})
+        self.assertEqual([s.id for s in index.search('h', MAX_LIMIT)], list(range(top - 1, top - 1 - MAX_LIMIT, -1)))
+
+
+class CatalogAutocompleteTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        self.paris = Destination.objects.create(
+            name='Paris', city='Paris', country='France', description='City of Light'
+        )
+        self.new_york = Destination.objects.create(
+            name='New York', city='New York', country='USA', description='Big Apple'
+        )
+        self.hotel = Hotel.objects.create(
+            name='Hotel Parisien', destination=self.paris, address='1 Rue Test',
+            star_rating=4, description='Test', cancellation_policy='Flexible'
+        )
+        catalog_autocomplete.rebuild()
+
+    def test_matches_word_starts(self):
+        """Test a later word in the name is matched by its prefix"""
+        labels = [s.label for s in catalog_autocomplete.search('york')]
+        self.assertEqual(labels, ['New York, USA'])
+
+    def test_search_needs_no_queries(self):
+        """Test lookups are answered from memory"""
+        with self.assertNumQueries(0):
+            catalog_autocomplete.search('par')
+
+    def test_destination_with_hotels_ranks_first(self):
+        """Test destinations are ranked above less popular hotels"""
+        results = catalog_autocomplete.search('paris')
+        self.assertEqual(results[0].kind, 'destination')
+        self.assertEqual(results[1].label, 'Hotel Parisien, Paris, France')
+
+    def test_index_follows_saves_and_deletes(self):
+        """Test the index is updated incrementally after commits"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.new_york.city = 'Brooklyn'
+            self.new_york.save()
+        self.assertEqual(catalog_autocomplete.search('brook')[0].label, 'Brooklyn, USA')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.delete()
+        self.assertEqual([s.kind for s in catalog_autocomplete.search('parisien')], [])
+
+    def test_inactive_hotels_are_not_suggested(self):
+        """Test deactivated hotels drop out of the index"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel.is_active = False
+            self.hotel.save()
+        self.assertEqual(catalog_autocomplete.search('hotel'), [])
+
+    def test_other_processes_changes_are_picked_up(self):
+        """Test a token published elsewhere makes the next lookup rebuild from the database"""
+        Destination.objects.filter(pk=self.new_york.pk).update(city='Brooklyn')  # No signals
+        self.assertEqual(catalog_autocomplete.search('brook'), [])
+        cache.set(TOKEN_KEY, 'from-another-worker')
+        with self.settings(AUTOCOMPLETE_CHECK_SECONDS=0):
+            self.assertEqual(catalog_autocomplete.search('brook')[0].label, 'Brooklyn, USA')
+
+    def test_reviews_rerank_hotels(self):
+        """Test review counts reach the ranking without a rebuild"""
+        other = Hotel.objects.create(
+            name='Hotel Paris Opera', destination=self.paris, address='2 Rue Test',
+            star_rating=3, description='Test', cancellation_policy='Flexible'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            make_review(hotel=other)
+        self.assertEqual([s.id for s in catalog_autocomplete.search('hotel')], [other.pk, self.hotel.pk])
+
+    def test_autocomplete_endpoint(self):
+        """Test the API returns ranked suggestions"""
+        response = self.client.get(reverse('hotels:autocomplete'), {'q': 'Par', 'limit': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [
+            {'type': 'destination', 'id': self.paris.id, 'label': 'Paris, France'},
+        ])
+
+
+class HotelSearchTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        self.destination = Destination.objects.create(
+            name='Lisbon', city='Lisbon', country='Portugal', description='Hills'
+        )
+        self.riverside = Hotel.objects.create(
+            name='Riverside Lodge', destination=self.destination, address='1 Quay',
+            star_rating=3, description='Quiet rooms overlooking the Tagus', cancellation_policy='Flexible'
+        )
+        self.central = Hotel.objects.create(
+            name='Central Suites', destination=self.destination, address='2 Praça',
+            star_rating=4, description='Rooftop pool near the riverside promenade', cancellation_policy='Flexible'
+        )
+
+    def test_name_matches_rank_above_description(self):
+        """Test BM25 weighting puts name matches first"""
+        self.assertEqual(hotel_search_index.ranked_ids('riverside'), [self.riverside.id, self.central.id])
+
+    def test_prefix_and_accent_insensitive(self):
+        """Test partial words and accents match"""
+        self.assertEqual(hotel_search_index.ranked_ids('praca'), [self.central.id])
+        self.assertEqual(hotel_search_index.ranked_ids('roof'), [self.central.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test triggers keep the index in sync"""
+        self.central.description = 'Spa and sauna'
+        self.central.save()
+        self.assertEqual(hotel_search_index.ranked_ids('rooftop'), [])
+        self.assertEqual(hotel_search_index.ranked_ids('sauna'), [self.central.id])
+        self.riverside.delete()
+        self.assertEqual(hotel_search_index.ranked_ids('riverside'), [])
+
+    def test_punctuation_only_query(self):
+        """Test queries without words return nothing"""
+        self.assertEqual(hotel_search_index.ranked_ids('"*)'), [])
+
+    def test_search_endpoint_skips_inactive_hotels(self):
+        """Test the API returns ranked active hotels"""
+        self.riverside.is_active = False
+        self.riverside.save()
+        response = self.client.get(reverse('hotels:search'), {'q': 'riverside'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['results'][0]['name'], 'Central Suites')
+
+    def test_admin_search_uses_index(self):
+        """Test admin changelist search matches descriptions and cities"""
+        from django.contrib.admin.sites import site
+        admin = site._registry[Hotel]
+        queryset, _ = admin.get_search_results(None, Hotel.objects.all(), 'tagus')
+        self.assertEqual(list(queryset), [self.riverside])
+        queryset, _ = admin.get_search_results(None, Hotel.objects.all(), 'lisb')
+        self.assertEqual(queryset.count(), 2)
+        queryset, _ = admin.get_search_results(None, Hotel.objects.all(), 'lisb pool')
+        self.assertEqual(list(queryset), [self.central])
+
+    def test_admin_changelist_ranks_matches(self):
+        """Test the changelist orders search hits by relevance"""
+        get_user_model().objects.create_superuser(username='admin', password='testpass123')
+        self.client.login(username='admin', password='testpass123')
+        response = self.client.get(reverse('admin:hotels_hotel_changelist'), {'q': 'riverside'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.riverside, self.central])
+        response = self.client.get(reverse('admin:hotels_hotel_changelist'), {'q': 'riverside', 'o': '1'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.central, self.riverside])
+
+
+class ImportCatalogTests(TestCase):
+    FEED = [
+        {'type': 'destination', 'external_id': 'D1', 'name': 'Kyoto', 'city': 'Kyoto', 'country': 'Japan',
+         'description': 'Temples'},
+        {'type': 'amenity', 'name': 'WiFi', 'category': 'general'},
+        {'type': 'hotel', 'external_id': 'H1', 'destination': 'D1', 'name': 'Gion Ryokan', 'address': '1 Gion',
+         'star_rating': 4, 'description': 'Tatami rooms and onsen', 'cancellation_policy': 'Flexible',
+         'amenities': ['WiFi', 'Onsen']},
+        {'type': 'room_type', 'external_id': 'R1', 'hotel': 'H1', 'name': 'Tatami Suite', 'description': 'Suite',
+         'max_occupancy': 3, 'bed_type': 'Futon', 'price_per_night': '220.50', 'total_rooms': 4},
+        {'type': 'hotel_image', 'external_id': 'I1', 'hotel': 'H1', 'image': 'hotels/gion.jpg', 'is_primary': True},
+        {'type': 'room_type', 'external_id': 'R2', 'hotel': 'MISSING', 'name': 'Orphan', 'description': 'x',
+         'max_occupancy': 1, 'bed_type': 'Single', 'price_per_night': '10', 'total_rooms': 1},
+    ]
+
+    def _write(self, name, content):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, name)
+        with open(path, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def _import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_catalog', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_resolves_references_in_batches(self):
+        """Test a JSON-lines feed creates the catalog with foreign keys resolved"""
+        path = self._write('feed.jsonl', '\n'.join(json.dumps(r) for r in self.FEED))
+        out, err = self._import(path, '--batch-size', '2')
+
+        hotel = Hotel.objects.get(external_id='H1')
+        self.assertEqual(hotel.destination.external_id, 'D1')
+        self.assertEqual(hotel.room_types.get().price_per_night, Decimal('220.50'))
+        self.assertTrue(hotel.images.get().is_primary)
+        self.assertEqual(
+            sorted(hotel.hotel_amenities.values_list('amenity__name', flat=True)), ['Onsen', 'WiFi']
+        )
+        self.assertIn("unknown hotel 'MISSING'", err)
+        self.assertIn('rows/s', out)
+
+    def test_reimport_updates_in_place(self):
+        """Test re-importing a feed upserts rather than duplicating"""
+        path = self._write('feed.jsonl', '\n'.join(json.dumps(r) for r in self.FEED[:3]))
+        self._import(path)
+        updated = dict(self.FEED[2], name='Gion Garden Ryokan', star_rating=5)
+        path = self._write('update.jsonl', json.dumps(updated))
+        self._import(path)
+
+        self.assertEqual(Hotel.objects.count(), 1)
+        hotel = Hotel.objects.get(external_id='H1')
+        self.assertEqual((hotel.name, hotel.star_rating), ('Gion Garden Ryokan', 5))
+
+    def test_search_index_rebuilt_after_import(self):
+        """Test imported hotels are searchable and triggers are back in place"""
+        path = self._write('feed.jsonl', '\n'.join(json.dumps(r) for r in self.FEED[:3]))
+        self._import(path)
+        hotel = Hotel.objects.get(external_id='H1')
+        self.assertEqual(hotel_search_index.ranked_ids('onsen'), [hotel.id])
+        hotel.description = 'Garden views'
+        hotel.save()
+        self.assertEqual(hotel_search_index.ranked_ids('garden'), [hotel.id])
+
+    def test_children_may_come_before_their_parents(self):
+        """Test rows whose parent arrives in a later batch are imported at the end, true orphans reported"""
+        path = self._write('feed.jsonl', '\n'.join(json.dumps(r) for r in reversed(self.FEED)))
+        out, err = self._import(path, '--batch-size', '1')
+        hotel = Hotel.objects.get(external_id='H1')
+        self.assertEqual(hotel.destination.external_id, 'D1')
+        self.assertEqual(list(hotel.room_types.values_list('external_id', flat=True)), ['R1'])
+        self.assertEqual(hotel.images.count(), 1)
+        self.assertEqual(sorted(hotel.hotel_amenities.values_list('amenity__name', flat=True)), ['Onsen', 'WiFi'])
+        self.assertIn("unknown hotel 'MISSING'", err)
+        self.assertNotIn('H1', err)
+
+    def test_reimport_replaces_amenity_links(self):
+        """Test a hotel's amenities field replaces its links, and records without the field keep them"""
+        path = self._write('feed.jsonl', '\n'.join(json.dumps(r) for r in self.FEED[:3]))
+        self._import(path)
+        hotel = Hotel.objects.get(external_id='H1')
+        self._import(self._write('fewer.jsonl', json.dumps(dict(self.FEED[2], amenities=['Onsen']))))
+        self.assertEqual(list(hotel.hotel_amenities.values_list('amenity__name', flat=True)), ['Onsen'])
+        unlisted = {k: v for k, v in self.FEED[2].items() if k != 'amenities'}
+        self._import(self._write('unlisted.jsonl', json.dumps(unlisted)))
+        self.assertEqual(list(hotel.hotel_amenities.values_list('amenity__name', flat=True)), ['Onsen'])
+
+    def test_import_refreshes_snapshots_everywhere(self):
+        """Test imports, which skip signals, make every process reload reference data and autocomplete"""
+        reference_data.warm()
+        catalog_autocomplete.rebuild()
+        tokens = [cache.get(reference_data.amenities.token_key), cache.get(reference_data.destinations.token_key),
+                  cache.get(TOKEN_KEY)]
+        path = self._write('feed.jsonl', '\n'.join(json.dumps(r) for r in self.FEED[:3]))
+        with self.captureOnCommitCallbacks(execute=True):
+            self._import(path)
+        for key, token in zip([reference_data.amenities.token_key, reference_data.destinations.token_key, TOKEN_KEY],
+                              tokens):
+            self.assertNotEqual(cache.get(key), token)
+        self.assertEqual([a.name for a in reference_data.amenities.all()], ['Onsen', 'WiFi'])
+        self.assertEqual(catalog_autocomplete.search('kyo')[0].label, 'Kyoto, Japan')
+
+    def test_csv_feed_with_type_option(self):
+        """Test CSV feeds take the entity type from --type and validate values"""
+        path = self._write('destinations.csv', (
+            'external_id,name,city,country,description,is_featured\n'
+            'D9,Porto,Porto,Portugal,Port wine,yes\n'
+        ))
+        self._import(path, '--type', 'destination')
+        self.assertTrue(Destination.objects.get(external_id='D9').is_featured)
+
+        path = self._write('hotels.csv', (
+            'external_id,destination,name,address,star_rating,description,cancellation_policy\n'
+            'H9,D9,Ribeira Inn,1 Cais,9,River views,Flexible\n'
+        ))
+        out, err = self._import(path, '--type', 'hotel')
+        self.assertFalse(Hotel.objects.filter(external_id='H9').exists())
+        self.assertIn('H9', err)
+
+    def test_rows_missing_required_fields_are_skipped(self):
+        """Test a row without a required value is reported and the rest of its batch still imports"""
+        incomplete = {k: v for k, v in self.FEED[2].items() if k != 'star_rating'}
+        path = self._write('feed.jsonl', '\n'.join(json.dumps(r) for r in [self.FEED[0], incomplete]))
+        out, err = self._import(path)
+        self.assertIn("hotel H1: missing required field 'star_rating'", err)
+        self.assertFalse(Hotel.objects.exists())
+        self.assertTrue(Destination.objects.filter(external_id='D1').exists())
+
+
+class AsyncCatalogViewTests(QueryAuditMixin, TransactionTestCase):
+    """Async views answer like their sync counterparts (committed data: lookups run on other threads)"""
+
+    def setUp(self):
+        destination = Destination.objects.create(name='Porto', city='Porto', country='Portugal', description='Wine')
+        self.hotel = Hotel.objects.create(
+            name='Douro Riverside', destination=destination, address='1 Ribeira',
+            star_rating=4, description='Port cellars across the river', cancellation_policy='Flexible'
+        )
+        self.room_type = RoomType.objects.create(
+            hotel=self.hotel, name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('120.00'), total_rooms=2
+        )
+        self.check_in = date.today() + timedelta(days=20)
+        user = get_user_model().objects.create_user(username='guest', password='pass12345')
+        Booking.objects.create(
+            user=user, room_type=self.room_type, check_in=self.check_in,
+            check_out=self.check_in + timedelta(days=2), num_guests=2, guest_first_name='Test',
+            guest_last_name='Guest', guest_email='guest@example.com', guest_phone='+1-555-0100',
+            price_per_night=Decimal('120.00'), num_nights=2, subtotal=Decimal('240.00'),
+            taxes=Decimal('0.00'), total_price=Decimal('240.00'), status='confirmed',
+        )
+
+    def _both(self, name, query, **kwargs):
+        sync = self.client.get(reverse(f'hotels:{name}', kwargs=kwargs), query)
+        async_ = self.client.get(reverse(f'hotels:{name}-async', kwargs=kwargs), query)
+        self.assertEqual(sync.status_code, async_.status_code)
+        return sync.json(), async_.json()
+
+    def test_availability_matches_sync(self):
+        """Test the concurrent lookups assemble the same availability"""
+        stay = {'check_in': self.check_in.isoformat(), 'check_out': (self.check_in + timedelta(days=3)).isoformat()}
+        sync, async_ = self._both('availability', stay, pk=self.hotel.pk)
+        self.assertEqual(sync, async_)
+        self.assertEqual(async_['room_types'][0]['rooms_left'], 1)
+        self.assertEqual(async_['room_types'][0]['total_price'], '360.00')
+
+        sync, async_ = self._both('availability', {**stay, 'rooms': 2}, pk=self.hotel.pk)
+        self.assertFalse(async_['room_types'][0]['available'])
+
+    def test_multi_room_bookings_count_every_room(self):
+        """Test a booking of two rooms leaves none of the two free"""
+        Booking.objects.filter(room_type=self.room_type).update(num_rooms=2)
+        stay = {'check_in': self.check_in.isoformat(), 'check_out': (self.check_in + timedelta(days=3)).isoformat()}
+        sync, async_ = self._both('availability', stay, pk=self.hotel.pk)
+        self.assertEqual(sync, async_)
+        self.assertEqual(async_['room_types'][0]['rooms_left'], 0)
+        self.assertFalse(async_['room_types'][0]['available'])
+
+    def test_search_and_autocomplete_match_sync(self):
+        """Test search and autocomplete bodies are identical"""
+        sync, async_ = self._both('search', {'q': 'river'})
+        self.assertEqual(sync, async_)
+        self.assertEqual(async_['count'], 1)
+        catalog_autocomplete.ready = False
+        sync, async_ = self._both('autocomplete', {'q': 'dou'})
+        self.assertEqual(sync, async_)
+
+    def test_bad_input(self):
+        """Test validation and missing hotels map to 400 and 404"""
+        response = self.client.get(reverse('hotels:availability-async', kwargs={'pk': self.hotel.pk}), {'check_in': 'x'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('hotels:availability-async', kwargs={'pk': 0}),
+                                   {'check_in': '2030-01-01', 'check_out': '2030-01-02'})
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalCatalogTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        reference_data.invalidate()
+        self.destination = Destination.objects.create(name='Porto', city='Porto', country='Portugal', description='Wine')
+        self.hotel = Hotel.objects.create(
+            name='Douro Riverside', destination=self.destination, address='1 Ribeira',
+            star_rating=4, description='Port cellars across the river', cancellation_policy='Flexible'
+        )
+        self.url = reverse('hotels:detail', kwargs={'pk': self.hotel.pk})
+
+    def test_hotel_detail_revalidates_with_etag(self):
+        """Test a matching If-None-Match gets 304 from the version lookup alone"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['destination']['city'], 'Porto')
+        self.assertIn('Last-Modified', response)
+        with self.assertNumQueries(1):
+            revalidated = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+
+    def test_cached_body_skips_serialization(self):
+        """Test repeat loads serve the rendered body from the cache"""
+        first = self.client.get(self.url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.content, first.content)
+
+    def test_body_follows_the_database_not_the_object_cache(self):
+        """Test a new version is never served from a stale cached hotel, as in a worker that missed the invalidation"""
+        self.client.get(self.url)
+        hotel_cache.get(self.hotel.pk)
+        Hotel.objects.filter(pk=self.hotel.pk).update(name='Douro Palace', updated_at=timezone.now())
+        self.assertEqual(hotel_cache.get(self.hotel.pk).name, 'Douro Riverside')
+        self.assertEqual(self.client.get(self.url).json()['name'], 'Douro Palace')
+
+    def test_child_changes_bump_the_version(self):
+        """Test room types and amenity links change the hotel ETag"""
+        etag = self.client.get(self.url)['ETag']
+        RoomType.objects.create(
+            hotel=self.hotel, name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('120.00'), total_rooms=2
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['room_types'][0]['name'], 'Double')
+        etag = response['ETag']
+        HotelAmenity.objects.create(hotel=self.hotel, amenity=Amenity.objects.create(name='Pool', category='general'))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.json()['amenities'], ['Pool'])
+
+    def test_amenity_changes_bump_the_version(self):
+        """Test renaming a linked amenity changes the hotel ETag and body"""
+        amenity = Amenity.objects.create(name='Pool', category='general')
+        HotelAmenity.objects.create(hotel=self.hotel, amenity=amenity)
+        etag = self.client.get(self.url)['ETag']
+        amenity.name = 'Rooftop pool'
+        amenity.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['amenities'], ['Rooftop pool'])
+
+    def test_destination_and_amenities(self):
+        """Test destination pages track their hotels and amenity lists revalidate"""
+        url = reverse('hotels:destination-detail', kwargs={'pk': self.destination.pk})
+        response = self.client.get(url)
+        self.assertEqual([h['name'] for h in response.json()['hotels']], ['Douro Riverside'])
+        self.hotel.is_active = False
+        self.hotel.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.json()['hotels'], [])
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        Amenity.objects.create(name='Spa', category='general')
+        response = self.client.get(reverse('hotels:amenities'))
+        self.assertEqual(response.json()[0]['name'], 'Spa')
+        self.assertEqual(
+            self.client.get(reverse('hotels:amenities'), HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+
+
+    def test_deletes_are_not_hidden_by_if_modified_since(self):
+        """Test versions that count rows send no Last-Modified, so a delete is never answered with 304"""
+        Amenity.objects.create(name='Spa', category='general')
+        Amenity.objects.create(name='Gym', category='general')
+        url = reverse('hotels:amenities')
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        since = http_date(time.time() + 60)
+        Amenity.objects.filter(name='Gym').delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a['name'] for a in response.json()], ['Spa'])
+
+        url = reverse('hotels:destination-detail', kwargs={'pk': self.destination.pk})
+        self.assertNotIn('Last-Modified', self.client.get(url))
+        self.assertIn('Last-Modified', self.client.get(self.url))
+
+
+class HotelObjectCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.destination = Destination.objects.create(name='Porto', city='Porto', country='Portugal', description='Wine')
+        self.hotels = [
+            Hotel.objects.create(
+                name=f'Hotel {i}', destination=self.destination, address=f'{i} Ribeira',
+                star_rating=4, description='Riverside', cancellation_policy='Flexible'
+            )
+            for i in range(3)
+        ]
+        self.room_type = RoomType.objects.create(
+            hotel=self.hotels[0], name='Double', description='Double room', max_occupancy=2,
+            bed_type='Double', price_per_night=Decimal('120.00'), total_rooms=2
+        )
+
+    def test_hits_skip_the_database(self):
+        """Test a warmed batch, relations included, is served without queries"""
+        pks = [hotel.pk for hotel in self.hotels]
+        self.assertEqual(set(hotel_cache.get_many(pks)), set(pks))
+        with self.assertNumQueries(0):
+            hotels = hotel_cache.get_many(pks)
+            self.assertEqual(hotels[pks[0]].destination.city, 'Porto')
+            self.assertEqual([rt.name for rt in hotels[pks[0]].room_types.all()], ['Double'])
+        self.assertEqual(hotel_cache.get_many([0]), {})
+
+    def test_own_and_dependent_writes_invalidate(self):
+        """Test saves of the hotel, its room types and its destination bump the version"""
+        hotel = self.hotels[0]
+        hotel_cache.get(hotel.pk)
+        self.room_type.name = 'Twin'
+        self.room_type.save()
+        self.assertEqual([rt.name for rt in hotel_cache.get(hotel.pk).room_types.all()], ['Twin'])
+
+        self.destination.city = 'Gaia'
+        self.destination.save()
+        self.assertEqual(hotel_cache.get(self.hotels[2].pk).destination.city, 'Gaia')
+
+        hotel_cache.get(hotel.pk)
+        Hotel.objects.filter(pk=hotel.pk).update(name='Renamed')
+        self.assertEqual(hotel_cache.get(hotel.pk).name, 'Hotel 0')  # update() needs an explicit invalidate
+        hotel_cache.invalidate([hotel.pk])
+        self.assertEqual(hotel_cache.get(hotel.pk).name, 'Renamed')
+
+    def test_loads_do_not_share_prefetch_querysets(self):
+        """Test each miss builds its own Prefetch querysets, which are not safe to share between threads"""
+        first = hotel_cache.get(self.hotels[0].pk)
+        second = hotel_cache.get(self.hotels[1].pk)
+        self.assertIsNot(
+            first._prefetched_objects_cache['room_types']._hints,
+            second._prefetched_objects_cache['room_types']._hints,
+        )
+
+
+class ReferenceDataTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        reference_data.invalidate()
+        Amenity.objects.create(name='Wifi', category='general')
+        Amenity.objects.create(name='Minibar', category='room')
+        self.destination = Destination.objects.create(name='Porto', city='Porto', country='Portugal', description='Wine')
+
+    def test_filters_need_no_queries_once_warm(self):
+        """Test the sidebar is served from the snapshot"""
+        reference_data.warm()
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('hotels:filters'))
+        self.assertEqual(
+            response.json()['destinations'], [{'id': self.destination.pk, 'label': 'Porto, Portugal', 'is_featured': False}]
+        )
+        self.assertEqual([a['name'] for a in response.json()['amenities']['room']], ['Minibar'])
+        self.assertEqual(reference_data.destinations.get(self.destination.pk).city, 'Porto')
+
+    def test_writes_refresh_the_snapshot(self):
+        """Test saves and deletes invalidate, and other processes notice the shared token"""
+        self.assertEqual([a.name for a in reference_data.amenities.all()], ['Wifi', 'Minibar'])
+        Amenity.objects.filter(name='Wifi').delete()
+        self.assertEqual([a.name for a in reference_data.amenities.all()], ['Minibar'])
+
+        Destination.objects.filter(pk=self.destination.pk).update(city='Gaia')
+        reference_data.destinations.all()
+        cache.set(reference_data.destinations.token_key, 'from-another-worker')
+        with self.settings(REFERENCE_DATA_CHECK_SECONDS=0):
+            self.assertEqual(reference_data.destinations.get(self.destination.pk).city, 'Gaia')
+
+    def test_amenity_list_follows_the_database(self):
+        """Test the amenity list body matches its version when this process's snapshot lags"""
+        cache.clear()
+        self.client.get(reverse('hotels:filters'))  # Loads the snapshot
+        Amenity.objects.filter(name='Wifi').update(name='Fast wifi', updated_at=timezone.now())
+        with self.settings(REFERENCE_DATA_CHECK_SECONDS=3600):
+            response = self.client.get(reverse('hotels:amenities'))
+        self.assertEqual([a['name'] for a in response.json()], ['Fast wifi', 'Minibar'])
+
+    def test_oversized_tables_fall_back_to_lru_lookups(self):
+        """Test tables above the row bound are read through the LRU"""
+        with self.settings(REFERENCE_DATA_MAX_ROWS=1):
+            reference_data.amenities.load()
+            self.assertEqual(len(reference_data.amenities.all()), 2)
+            wifi = Amenity.objects.get(name='Wifi')
+            self.assertEqual(reference_data.amenities.get(wifi.pk).name, 'Wifi')
+            with self.assertNumQueries(0):
+                self.assertEqual(reference_data.amenities.get(wifi.pk).name, 'Wifi')
+
+
+class HotelListingTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        destination = Destination.objects.create(name='Porto', city='Porto', country='Portugal', description='Wine')
+        self.hotels = [
+            Hotel.objects.create(
+                name=f'Hotel {i}', destination=destination, address=f'{i} Ribeira', latitude=Decimal('41.14'),
+                star_rating=4, description='Riverside', cancellation_policy='Flexible'
+            )
+            for i in range(3)
+        ]
+        hotel = self.hotels[0]
+        HotelImage.objects.create(hotel=hotel, image='hotels/side.jpg', order=1)
+        HotelImage.objects.create(hotel=hotel, image='hotels/front image.jpg', is_primary=True, order=2)
+        for name in ('Spa', 'Pool'):
+            HotelAmenity.objects.create(hotel=hotel, amenity=Amenity.objects.create(name=name, category='general'))
+        for name, price in (('Suite', '300.00'), ('Double', '120.50')):
+            RoomType.objects.create(
+                hotel=hotel, name=name, description=name, max_occupancy=2,
+                bed_type='Double', price_per_night=Decimal(price), total_rooms=2
+            )
+
+    def test_fast_path_matches_model_serializer(self):
+        """Test values() cards encode exactly like HotelCardSerializer output"""
+        ids = [hotel.pk for hotel in reversed(self.hotels)]
+        hotels = sorted(hotel_card_queryset().filter(pk__in=ids), key=lambda hotel: ids.index(hotel.pk))
+        expected = HotelCardSerializer(hotels, many=True)
+        self.assertEqual(json.loads(dumps(hotel_cards(ids))), json.loads(JSONRenderer().render(expected.data)))
+        card = hotel_cards([self.hotels[0].pk])[0]
+        self.assertEqual(card['amenities'], ['Pool', 'Spa'])
+        self.assertEqual(card['room_types'][0]['price_per_night'], '120.50')
+        self.assertEqual(card['images'][0]['image'], '/media/hotels/front%20image.jpg')
+
+    def test_list_endpoint_queries_are_constant(self):
+        """Test the paginated list needs one query per relation, not per hotel"""
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('hotels:list'))
+        self.assertEqual(response.json()['count'], 3)
+        self.assertEqual(response.json()['results'][0]['room_types'][0]['price_per_night'], '120.50')
+        self.assertEqual(response.json()['results'][0]['latitude'], '41.140000')
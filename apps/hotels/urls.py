@@ -0,0 +1,20 @@
+from django.urls import path
+
+from . import async_views, views
+
+app_name = 'hotels'
+
+urlpatterns = [
+    path('', views.HotelListView.as_view(), name='list'),
+    path('autocomplete/', views.AutocompleteView.as_view(), name='autocomplete'),
+    path('search/', views.HotelSearchView.as_view(), name='search'),
+    path('amenities/', views.AmenityListView.as_view(), name='amenities'),
+    path('filters/', views.CatalogFiltersView.as_view(), name='filters'),
+    path('destinations/<int:pk>/', views.DestinationDetailView.as_view(), name='destination-detail'),
+    path('<int:pk>/', views.HotelDetailView.as_view(), name='detail'),
+    path('<int:pk>/availability/', views.HotelAvailabilityView.as_view(), name='availability'),
+    # ASGI-native versions of the read endpoints above
+    path('async/autocomplete/', async_views.autocomplete, name='autocomplete-async'),
+    path('async/search/', async_views.search, name='search-async'),
+    path('async/<int:pk>/availability/', async_views.availability, name='availability-async'),
+]
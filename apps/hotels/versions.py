@@ -0,0 +1,52 @@
+"""
+Version stamps for the cached catalog endpoints.
+
+``Hotel.updated_at`` doubles as the version of everything shown on a hotel
+page: saving or deleting a room type, image or amenity link, or saving an
+amenity it links to, touches it (see ``signals``), and the destination and
+guest rating carry their own stamps.
+"""
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from apps.core.httpcache import Version, latest
+from .cache import hotel_cache
+from .models import Amenity, Destination, Hotel
+
+
+def touch_hotels(hotel_ids, using='default'):
+    """Bump ``updated_at`` on hotels whose dependent rows changed outside ``Hotel.save``"""
+    hotel_ids = {pk for pk in hotel_ids if pk is not None}
+    if hotel_ids:
+        Hotel.objects.using(using).filter(pk__in=hotel_ids).update(updated_at=timezone.now())
+        hotel_cache.invalidate(hotel_ids)
+
+
+def hotel_version(pk):
+    row = Hotel.objects.filter(pk=pk, is_active=True).values(
+        'updated_at', 'destination__updated_at', 'rating__updated_at'
+    ).first()
+    if row is None:
+        return None
+    stamps = (row['updated_at'], row['destination__updated_at'], row['rating__updated_at'])
+    return Version(f'hotel:{pk}', stamps, latest(*stamps))
+
+
+def destination_version(pk):
+    active = Q(hotels__is_active=True)
+    row = Destination.objects.filter(pk=pk).annotate(
+        hotels_updated=Max('hotels__updated_at', filter=active),
+        hotel_count=Count('hotels', filter=active),
+    ).values('updated_at', 'hotels_updated', 'hotel_count').first()
+    if row is None:
+        return None
+    # The count catches hotels deactivated or deleted without a newer stamp,
+    # which also rules out Last-Modified
+    stamps = (row['updated_at'], row['hotels_updated'], row['hotel_count'])
+    return Version(f'destination:{pk}', stamps)
+
+
+def amenities_version():
+    row = Amenity.objects.aggregate(updated=Max('updated_at'), count=Count('id'))
+    # Deletes only change the count, so no Last-Modified
+    return Version('amenities', (row['updated'], row['count']))
@@ -1,3 +1,134 @@
-from django.shortcuts import render
+from django.db.models import Prefetch
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.core.fastjson import FastJSONRenderer
+from apps.core.httpcache import conditional_json
+from .autocomplete import DEFAULT_LIMIT, MAX_LIMIT as MAX_AUTOCOMPLETE_LIMIT, catalog_autocomplete
+from .availability import InvalidStay, hotel_availability, parse_stay
+from .cache import hotel_cache, hotel_queryset
+from .listing import hotel_cards
+from .models import Amenity, Destination, Hotel
+from .reference import reference_data
+from .search import hotel_search_index
+from .serializers import DestinationDetailSerializer, HotelDetailSerializer, HotelSummarySerializer
+from .versions import amenities_version, destination_version, hotel_version
+
+MAX_SEARCH_RESULTS = 200
+
+
+class AutocompleteView(APIView):
+    """Destination and hotel suggestions for the search box, served from memory"""
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_AUTOCOMPLETE_LIMIT)
+        except ValueError:
+            limit = DEFAULT_LIMIT
+        suggestions = catalog_autocomplete.search(query, max(limit, 1))
+        return Response({'query': query, 'results': [s.as_dict() for s in suggestions]})
+
+
+class HotelListView(generics.GenericAPIView):
+    """Active hotels with images, amenities and room types, built from values() rows"""
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
+
+    def get(self, request):
+        hotels = Hotel.objects.filter(is_active=True).order_by('name', 'pk')
+        destination = request.query_params.get('destination', '')
+        if destination.isdigit():
+            hotels = hotels.filter(destination_id=destination)
+        page = self.paginate_queryset(hotels.values_list('pk', flat=True))
+        return self.get_paginated_response(hotel_cards(page))
+
+
+class HotelSearchView(generics.GenericAPIView):
+    """Keyword search over hotel names, addresses and descriptions, best match first"""
+    serializer_class = HotelSummarySerializer
+
+    def get(self, request):
+        ranked = hotel_search_index.ranked_ids(request.query_params.get('q', ''), MAX_SEARCH_RESULTS)
+        active = set(Hotel.objects.filter(pk__in=ranked, is_active=True).values_list('pk', flat=True))
+        page = self.paginate_queryset([pk for pk in ranked if pk in active])
+        hotels = hotel_cache.get_many(page)
+        serializer = self.get_serializer([hotels[pk] for pk in page if pk in hotels], many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class HotelAvailabilityView(APIView):
+    """Room availability, stay prices and guest score for one hotel"""
+
+    def get(self, request, pk):
+        try:
+            check_in, check_out, num_rooms = parse_stay(request.query_params)
+        except InvalidStay as exc:
+            raise ValidationError({'detail': str(exc)})
+        get_object_or_404(Hotel.objects.only('id'), pk=pk, is_active=True)
+        return Response(hotel_availability(pk, check_in, check_out, num_rooms))
+
+
+class HotelDetailView(APIView):
+    """Full hotel page, revalidated by ETag and served from the cache between changes"""
+
+    def get(self, request, pk):
+        version = hotel_version(pk)
+        if version is None:
+            raise Http404
+        return conditional_json(request, version, lambda: self.build(pk))
+
+    def build(self, pk):
+        # From the database like the version: a worker whose object cache
+        # missed an invalidation would cache a stale body under the new version
+        return HotelDetailSerializer(hotel_queryset().using('default').get(pk=pk)).data
+
+
+class DestinationDetailView(APIView):
+    """Destination page with its active hotels, revalidated by ETag"""
+
+    def get(self, request, pk):
+        version = destination_version(pk)
+        if version is None:
+            raise Http404
+        return conditional_json(request, version, lambda: self.build(pk))
+
+    def build(self, pk):
+        destination = Destination.objects.prefetch_related(
+            Prefetch('hotels', Hotel.objects.filter(is_active=True).select_related('destination').order_by('name'))
+        ).get(pk=pk)
+        return DestinationDetailSerializer(destination).data
+
+
+class AmenityListView(APIView):
+    """Every amenity, for search filters; revalidated by ETag"""
+
+    def get(self, request):
+        return conditional_json(request, amenities_version(), self.build)
+
+    def build(self):
+        # From the database like the version, not from this process's snapshot,
+        # which may lag it and would cache a stale body under the new version
+        return list(Amenity.objects.order_by('category', 'name').values('id', 'name', 'icon', 'category'))
+
+
+class CatalogFiltersView(APIView):
+    """Search sidebar options, answered from the in-process reference data"""
+
+    def get(self, request):
+        amenities = {}
+        for amenity in reference_data.amenities.all():
+            entry = {'id': amenity.id, 'name': amenity.name, 'icon': amenity.icon}
+            amenities.setdefault(amenity.category, []).append(entry)
+        return Response({
+            'destinations': [
+                {'id': d.id, 'label': str(d), 'is_featured': d.is_featured} for d in reference_data.destinations.all()
+            ],
+            'amenities': amenities,
+            'hotel_types': [{'value': value, 'label': label} for value, label in Hotel.HOTEL_TYPES],
+            'star_ratings': [1, 2, 3, 4, 5],
+        })
@@ -1,5 +1,9 @@
 from django.contrib import admin
+from apps.core.admin_filters import AutocompleteListFilter, CachedValuesListFilter
+from apps.core.admin_search import FullTextSearchMixin
+from apps.core.pagination import EstimatedCountPaginator
 from .models import Review, ReviewPhoto, ReviewVote
+from .search import review_search_index
 
 
 class ReviewPhotoInline(admin.TabularInline):
@@ -8,12 +12,19 @@ class ReviewPhotoInline(admin.TabularInline):
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['hotel', 'user', 'overall_rating', 'is_verified', 'helpful_count', 'created_at']
-    list_filter = ['overall_rating', 'is_verified', 'created_at', 'hotel']
+    list_filter = [
+        ('overall_rating', CachedValuesListFilter), 'is_verified', 'created_at',
+        ('hotel', AutocompleteListFilter),
+    ]
     search_fields = ['user__username', 'hotel__name', 'title', 'content']
+    search_index = review_search_index
     readonly_fields = ['is_verified', 'helpful_count', 'not_helpful_count', 'created_at', 'updated_at']
-    date_hierarchy = 'created_at'
+    list_select_related = ['hotel', 'user']
+    autocomplete_fields = ['user', 'hotel', 'booking']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [ReviewPhotoInline]
     fieldsets = (
         ('Review Information', {
@@ -40,6 +51,8 @@ class ReviewPhotoAdmin(admin.ModelAdmin):
     list_display = ['review', 'caption', 'uploaded_at']
     list_filter = ['uploaded_at']
     search_fields = ['review__user__username', 'review__hotel__name', 'caption']
+    list_select_related = ['review__user', 'review__hotel']
+    autocomplete_fields = ['review']
 
 
 @admin.register(ReviewVote)
@@ -47,3 +60,7 @@ class ReviewVoteAdmin(admin.ModelAdmin):
     list_display = ['review', 'user', 'vote_type', 'created_at']
     list_filter = ['vote_type', 'created_at']
     search_fields = ['review__hotel__name', 'user__username']
+    list_select_related = ['review__user', 'review__hotel', 'user']
+    autocomplete_fields = ['review', 'user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
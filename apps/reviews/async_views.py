@@ -0,0 +1,25 @@
+"""
+Async versions of the review read endpoints, for ASGI deployments.
+"""
+from django.views.decorators.http import require_GET
+
+from apps.core.aio import gather_queries, invalid_page, page_bounds, page_out_of_range, paginated_response
+from .models import Review
+from .serializers import ReviewSerializer
+
+
+@require_GET
+async def feed(request):
+    reviews = Review.objects.select_related('user').order_by('-created_at', '-id')
+    hotel = request.GET.get('hotel')
+    if hotel and hotel.isdigit():
+        reviews = reviews.filter(hotel_id=hotel)
+    bounds = page_bounds(request)
+    if bounds is None:
+        return invalid_page()
+    start, end, page = bounds
+    # The count and the page rows are independent queries
+    count, rows = await gather_queries(reviews.count, lambda: list(reviews[start:end]))
+    if page_out_of_range(page, start, count):
+        return invalid_page()
+    return paginated_response(request, count, page, ReviewSerializer(rows, many=True).data)
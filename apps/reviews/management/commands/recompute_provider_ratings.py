@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.reviews.ratings import recompute_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuild provider_ratings from reviews in one grouped update (schedule periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        updated = recompute_all(options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Recomputed ratings for {updated} hotels'))
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+# Frozen copy of apps.reviews.search.review_search_index as of this migration
+INSTALL_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS reviews_review_fts USING fts5(title, content, "
+    "content='reviews_review', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS reviews_review_fts_ai AFTER INSERT ON reviews_review BEGIN "
+    "INSERT INTO reviews_review_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_review_fts_ad AFTER DELETE ON reviews_review BEGIN "
+    "INSERT INTO reviews_review_fts(reviews_review_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS reviews_review_fts_au AFTER UPDATE OF title, content ON reviews_review BEGIN "
+    "INSERT INTO reviews_review_fts(reviews_review_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO reviews_review_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+    "INSERT INTO reviews_review_fts(reviews_review_fts) VALUES ('rebuild')",
+]
+
+UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS reviews_review_fts_ai",
+    "DROP TRIGGER IF EXISTS reviews_review_fts_ad",
+    "DROP TRIGGER IF EXISTS reviews_review_fts_au",
+    "DROP TABLE IF EXISTS reviews_review_fts",
+]
+
+
+def install_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in INSTALL_SQL:
+            schema_editor.execute(sql)
+
+
+def uninstall_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in UNINSTALL_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reviews", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_index, uninstall_index),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.8 on 2026-10-19 16:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_ratings(apps, schema_editor):
+    schema_editor.execute(
+        "INSERT INTO provider_ratings "
+        "(provider_id, provider_type, avg_rating, total_reviews, rating_sum, updated_at) "
+        "SELECT h.id, 'hotel', COALESCE(ROUND(SUM(r.overall_rating) * 1.0 / COUNT(r.id), 2), 0), "
+        "COUNT(r.id), COALESCE(SUM(r.overall_rating), 0), %s "
+        "FROM hotels_hotel h LEFT JOIN reviews_review r ON r.hotel_id = h.id GROUP BY h.id",
+        [timezone.now()],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotels", "0003_external_ids"),
+        ("reviews", "0003_review_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProviderRating",
+            fields=[
+                (
+                    "hotel",
+                    models.OneToOneField(
+                        db_column="provider_id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="rating",
+                        serialize=False,
+                        to="hotels.hotel",
+                    ),
+                ),
+                (
+                    "provider_type",
+                    models.CharField(
+                        choices=[("hotel", "Hotel")], default="hotel", max_length=20
+                    ),
+                ),
+                (
+                    "avg_rating",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=3),
+                ),
+                ("total_reviews", models.IntegerField(default=0)),
+                ("rating_sum", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "provider_ratings",
+                "indexes": [
+                    models.Index(
+                        fields=["avg_rating", "total_reviews"],
+                        name="provider_ra_avg_rat_65df97_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_ratings, migrations.RunPython.noop),
+    ]
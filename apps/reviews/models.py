@@ -71,3 +71,26 @@ class ReviewVote(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.vote_type}"
+
+
+class ProviderRating(models.Model):
+    """Maintained guest-score rollup per provider, refreshed from review changes"""
+    PROVIDER_TYPES = [
+        ('hotel', 'Hotel'),
+    ]
+
+    hotel = models.OneToOneField(
+        Hotel, on_delete=models.CASCADE, primary_key=True, related_name='rating', db_column='provider_id'
+    )
+    provider_type = models.CharField(max_length=20, choices=PROVIDER_TYPES, default='hotel')
+    avg_rating = models.DecimalField(max_digits=3, decimal_places=2, default=0)
+    total_reviews = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)  # Kept so averages can be updated incrementally
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'provider_ratings'
+        indexes = [models.Index(fields=['avg_rating', 'total_reviews'])]
+
+    def __str__(self):
+        return f"{self.provider_type} {self.hotel_id}: {self.avg_rating} ({self.total_reviews})"
@@ -0,0 +1,93 @@
+"""
+Maintenance of the ``provider_ratings`` rollup.
+
+Review saves and deletes adjust a hotel's rating sum and count in place, and
+``recompute_all`` periodically rebuilds every row from one grouped query
+over reviews, correcting any drift from writes that bypassed the signals.
+"""
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from apps.hotels.models import Hotel
+from .models import ProviderRating, Review
+
+
+def _average(rating_sum, count):
+    return f'CASE WHEN {count} > 0 THEN ROUND(({rating_sum}) * 1.0 / ({count}), 2) ELSE 0 END'
+
+
+def apply_delta(hotel_id, rating_delta, count_delta, using=None, insert=True):
+    """
+    Add ``rating_delta``/``count_delta`` to a hotel's rollup row. With
+    ``insert=False`` a missing row is left alone, as on cascade deletes.
+    """
+    if not rating_delta and not count_delta:
+        return
+    connection = connections[using or router.db_for_write(ProviderRating)]
+    table = connection.ops.quote_name(ProviderRating._meta.db_table)
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        if insert:
+            new_sum = f'{table}.rating_sum + excluded.rating_sum'
+            new_count = f'{table}.total_reviews + excluded.total_reviews'
+            initial = round(rating_delta / count_delta, 2) if count_delta > 0 else 0
+            cursor.execute(
+                f'INSERT INTO {table} (provider_id, provider_type, rating_sum, total_reviews, avg_rating, updated_at) '
+                f"VALUES (%s, 'hotel', %s, %s, %s, %s) "
+                f'ON CONFLICT (provider_id) DO UPDATE SET '
+                f'rating_sum = {new_sum}, total_reviews = {new_count}, '
+                f'avg_rating = {_average(new_sum, new_count)}, updated_at = excluded.updated_at',
+                [hotel_id, rating_delta, count_delta, initial, now],
+            )
+        else:
+            new_sum = 'rating_sum + %s'
+            new_count = 'total_reviews + %s'
+            cursor.execute(
+                f'UPDATE {table} SET rating_sum = {new_sum}, total_reviews = {new_count}, '
+                f'avg_rating = {_average(new_sum, new_count)}, updated_at = %s WHERE provider_id = %s',
+                [rating_delta, count_delta, count_delta, rating_delta, count_delta, now, hotel_id],
+            )
+
+
+def record_review_change(old, new, using=None):
+    """Apply a review save/delete; ``old`` and ``new`` are (hotel_id, overall_rating) or None"""
+    if old and new and old[0] == new[0]:
+        apply_delta(new[0], new[1] - old[1], 0, using)
+        return
+    if old:
+        apply_delta(old[0], -old[1], -1, using, insert=False)
+    if new:
+        apply_delta(new[0], new[1], 1, using)
+
+
+def recompute_all(using='default'):
+    """Rebuild every rating from reviews with one grouped UPDATE ... FROM"""
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(ProviderRating._meta.db_table)
+    hotels = quote(Hotel._meta.db_table)
+    reviews = quote(Review._meta.db_table)
+    now = timezone.now()
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (provider_id, provider_type, avg_rating, total_reviews, rating_sum, updated_at) '
+            f"SELECT h.id, 'hotel', 0, 0, 0, %s FROM {hotels} h "
+            f'WHERE NOT EXISTS (SELECT 1 FROM {table} p WHERE p.provider_id = h.id)',
+            [now],
+        )
+        cursor.execute(
+            f'UPDATE {table} SET rating_sum = agg.rating_sum, total_reviews = agg.total_reviews, '
+            f'avg_rating = ROUND(agg.rating_sum * 1.0 / agg.total_reviews, 2), updated_at = %s '
+            f'FROM (SELECT hotel_id, SUM(overall_rating) AS rating_sum, COUNT(*) AS total_reviews '
+            f'FROM {reviews} GROUP BY hotel_id) AS agg '
+            f'WHERE {table}.provider_id = agg.hotel_id',
+            [now],
+        )
+        updated = cursor.rowcount
+        cursor.execute(
+            f'UPDATE {table} SET rating_sum = 0, total_reviews = 0, avg_rating = 0, updated_at = %s '
+            f'WHERE total_reviews <> 0 AND NOT EXISTS '
+            f'(SELECT 1 FROM {reviews} r WHERE r.hotel_id = {table}.provider_id)',
+            [now],
+        )
+    return updated
@@ -0,0 +1,3 @@
+from apps.core.fulltext import FullTextIndex
+
+review_search_index = FullTextIndex('reviews.Review', ['title', 'content'], weights=[3.0, 1.0])
@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+from .models import Review
+
+
+class ReviewSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = Review
+        fields = [
+            'id', 'hotel', 'username', 'overall_rating', 'title', 'content',
+            'is_verified', 'helpful_count', 'created_at',
+        ]
@@ -0,0 +1,38 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.hotels.autocomplete import catalog_autocomplete
+from .models import Review
+from .ratings import record_review_change
+
+
+@receiver(pre_save, sender=Review)
+def remember_rating(sender, instance, raw, using, **kwargs):
+    previous = None
+    if not raw and instance.pk is not None:
+        previous = Review.objects.using(using).filter(pk=instance.pk).values_list('hotel_id', 'overall_rating').first()
+    instance._rating_previous = previous
+
+
+@receiver(post_save, sender=Review)
+def update_rating(sender, instance, raw, using, **kwargs):
+    if not raw:
+        new = (instance.hotel_id, instance.overall_rating)
+        previous = getattr(instance, '_rating_previous', None)
+        record_review_change(previous, new, using)
+        if previous is None or previous[0] != instance.hotel_id:
+            _rerank(using, instance.hotel_id, previous[0] if previous else None)
+
+
+@receiver(post_delete, sender=Review)
+def remove_rating(sender, instance, using, **kwargs):
+    record_review_change((instance.hotel_id, instance.overall_rating), None, using)
+    _rerank(using, instance.hotel_id)
+
+
+def _rerank(using, *hotel_ids):
+    # Review counts rank hotel suggestions
+    for hotel_id in hotel_ids:
+        if hotel_id is not None:
+            transaction.on_commit(lambda hotel_id=hotel_id: catalog_autocomplete.refresh_hotel(hotel_id), using=using)
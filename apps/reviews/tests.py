@@ -1,3 +1,164 @@
-from django.test import TestCase
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.testing import QueryAuditMixin
+from apps.hotels.models import Destination, Hotel
+from .models import ProviderRating, Review
+from .search import review_search_index
+
+User = get_user_model()
+
+
+class ReviewSearchTests(QueryAuditMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reviewer', password='testpass123')
+        destination = Destination.objects.create(name='Rome', city='Rome', country='Italy', description='Eternal')
+        self.hotel = Hotel.objects.create(
+            name='Hotel Roma', destination=destination, address='Via Test',
+            star_rating=4, description='Test', cancellation_policy='Flexible'
+        )
+        self.breakfast = self._review('Great breakfast', 'The breakfast buffet was superb.')
+        self.noisy = self._review('Noisy street', 'Lovely staff but the breakfast room was loud.')
+
+    def _review(self, title, content):
+        return Review.objects.create(
+            user=self.user, hotel=self.hotel, overall_rating=4, cleanliness_rating=4,
+            location_rating=4, service_rating=4, value_rating=4, title=title, content=content
+        )
+
+    def test_title_matches_rank_first(self):
+        """Test title hits outrank content-only hits"""
+        self.assertEqual(review_search_index.ranked_ids('breakfast'), [self.breakfast.id, self.noisy.id])
+
+    def test_search_endpoint(self):
+        """Test the public endpoint returns ranked reviews"""
+        response = self.client.get(reverse('reviews:search'), {'q': 'loud'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['id'] for r in response.json()['results']], [self.noisy.id])
+
+    def test_admin_search_matches_content_and_username(self):
+        """Test admin search covers content and reviewer"""
+        from django.contrib.admin.sites import site
+        admin = site._registry[Review]
+        queryset, _ = admin.get_search_results(None, Review.objects.all(), 'superb')
+        self.assertEqual(list(queryset), [self.breakfast])
+        queryset, _ = admin.get_search_results(None, Review.objects.all(), 'reviewer')
+        self.assertEqual(queryset.count(), 2)
+
+    def test_admin_search_requires_every_word(self):
+        """Test admin search splits words and matches usernames partially"""
+        from django.contrib.admin.sites import site
+        admin = site._registry[Review]
+        queryset, _ = admin.get_search_results(None, Review.objects.all(), 'review')
+        self.assertEqual(queryset.count(), 2)
+        queryset, _ = admin.get_search_results(None, Review.objects.all(), 'superb REVIEW roma')
+        self.assertEqual(list(queryset), [self.breakfast])
+        queryset, _ = admin.get_search_results(None, Review.objects.all(), 'superb "street"')
+        self.assertEqual(list(queryset), [])
+
+    def test_admin_changelist_ranks_matches(self):
+        """Test the changelist orders search hits by relevance"""
+        User.objects.create_superuser(username='admin', password='testpass123')
+        self.client.login(username='admin', password='testpass123')
+        response = self.client.get(reverse('admin:reviews_review_changelist'), {'q': 'breakfast'})
+        self.assertEqual(list(response.context['cl'].result_list), [self.breakfast, self.noisy])
+
+
+class ProviderRatingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reviewer', password='testpass123')
+        destination = Destination.objects.create(name='Rome', city='Rome', country='Italy', description='Eternal')
+        self.hotels = [
+            Hotel.objects.create(
+                name=f'Hotel {i}', destination=destination, address='Via Test',
+                star_rating=4, description='Test', cancellation_policy='Flexible'
+            )
+            for i in range(3)
+        ]
+
+    def _review(self, hotel, rating):
+        return Review.objects.create(
+            user=self.user, hotel=hotel, overall_rating=rating, cleanliness_rating=4,
+            location_rating=4, service_rating=4, value_rating=4, title='Stay', content='Fine'
+        )
+
+    def _rating(self, hotel):
+        return ProviderRating.objects.get(hotel=hotel)
+
+    def test_reviews_update_rollup_incrementally(self):
+        """Test creates, edits and deletes adjust the rollup"""
+        hotel = self.hotels[0]
+        first = self._review(hotel, 5)
+        self._review(hotel, 2)
+        self.assertEqual((self._rating(hotel).avg_rating, self._rating(hotel).total_reviews), (Decimal('3.50'), 2))
+
+        first.overall_rating = 4
+        first.save()
+        self.assertEqual(self._rating(hotel).avg_rating, Decimal('3.00'))
+
+        first.delete()
+        self.assertEqual((self._rating(hotel).avg_rating, self._rating(hotel).total_reviews), (Decimal('2.00'), 1))
+
+    def test_moving_review_between_hotels(self):
+        """Test reassigning a review moves it between rollup rows"""
+        review = self._review(self.hotels[0], 5)
+        review.hotel = self.hotels[1]
+        review.save()
+        self.assertEqual(self._rating(self.hotels[0]).total_reviews, 0)
+        self.assertEqual(self._rating(self.hotels[1]).avg_rating, Decimal('5.00'))
+
+    def test_recompute_corrects_drift(self):
+        """Test the periodic recompute rebuilds every row from reviews"""
+        self._review(self.hotels[0], 4)
+        self._review(self.hotels[0], 5)
+        Review.objects.filter(hotel=self.hotels[0]).update(overall_rating=1)
+        ProviderRating.objects.filter(hotel=self.hotels[1]).delete()
+        call_command('recompute_provider_ratings', stdout=StringIO())
+        self.assertEqual(self._rating(self.hotels[0]).avg_rating, Decimal('1.00'))
+        self.assertEqual(self._rating(self.hotels[1]).total_reviews, 0)
+        self.assertEqual(ProviderRating.objects.count(), 3)
+
+    def test_sorting_by_guest_score_reads_only_rollup(self):
+        """Test score ordering and filtering don't touch reviews"""
+        self._review(self.hotels[0], 3)
+        self._review(self.hotels[2], 5)
+        with CaptureQueriesContext(connection) as queries:
+            ranked = list(Hotel.objects.by_guest_score())
+            good = list(Hotel.objects.with_min_guest_score(4))
+        self.assertFalse([q for q in queries if 'reviews_review' in q['sql']])
+        self.assertEqual(ranked, [self.hotels[2], self.hotels[0], self.hotels[1]])
+        self.assertEqual(good, [self.hotels[2]])
+        self.assertEqual(ranked[0].average_rating, 5.0)
+
+
+class AsyncReviewFeedTests(QueryAuditMixin, TransactionTestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='reviewer', password='testpass123')
+        destination = Destination.objects.create(name='Nice', city='Nice', country='France', description='Riviera')
+        self.hotel = Hotel.objects.create(
+            name='Hotel Azur', destination=destination, address='Promenade',
+            star_rating=4, description='Test', cancellation_policy='Flexible'
+        )
+        for i in range(25):
+            Review.objects.create(
+                user=user, hotel=self.hotel, overall_rating=4, cleanliness_rating=4, location_rating=4,
+                service_rating=4, value_rating=4, title=f'Stay {i}', content='Sea views'
+            )
+
+    def test_feed_matches_sync_pages(self):
+        """Test both feeds page identically, newest first"""
+        for page in (1, 2):
+            query = {'hotel': self.hotel.pk, 'page': page}
+            sync = self.client.get(reverse('reviews:feed'), query).json()
+            async_ = self.client.get(reverse('reviews:feed-async'), query).json()
+            self.assertEqual(sync['results'], async_['results'])
+            self.assertEqual(async_['count'], 25)
+        self.assertEqual(async_['results'][-1]['title'], 'Stay 0')
+        self.assertEqual(self.client.get(reverse('reviews:feed-async'), {'page': 3}).status_code, 404)
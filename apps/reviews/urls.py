@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import async_views, views
+
+app_name = 'reviews'
+
+urlpatterns = [
+    path('search/', views.ReviewSearchView.as_view(), name='search'),
+    path('feed/', views.ReviewFeedView.as_view(), name='feed'),
+    path('async/feed/', async_views.feed, name='feed-async'),
+]
@@ -1,3 +1,31 @@
-from django.shortcuts import render
+from rest_framework import generics
 
-# Create your views here.
+from .models import Review
+from .search import review_search_index
+from .serializers import ReviewSerializer
+
+MAX_SEARCH_RESULTS = 200
+
+
+class ReviewSearchView(generics.GenericAPIView):
+    """Keyword search over review titles and content, best match first"""
+    serializer_class = ReviewSerializer
+
+    def get(self, request):
+        ranked = review_search_index.ranked_ids(request.query_params.get('q', ''), MAX_SEARCH_RESULTS)
+        page = self.paginate_queryset(ranked)
+        reviews = Review.objects.select_related('user').in_bulk(page)
+        serializer = self.get_serializer([reviews[pk] for pk in page if pk in reviews], many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class ReviewFeedView(generics.ListAPIView):
+    """Newest reviews, optionally for one hotel"""
+    serializer_class = ReviewSerializer
+
+    def get_queryset(self):
+        reviews = Review.objects.select_related('user').order_by('-created_at', '-id')
+        hotel = self.request.query_params.get('hotel')
+        if hotel and hotel.isdigit():
+            reviews = reviews.filter(hotel_id=hotel)
+        return reviews
@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from apps.core.admin_filters import CachedValuesListFilter
 from .models import User, UserPreference, SavedSearch
 
 
@@ -16,8 +17,10 @@ class UserAdmin(BaseUserAdmin):
 @admin.register(UserPreference)
 class UserPreferenceAdmin(admin.ModelAdmin):
     list_display = ['user', 'preferred_currency', 'budget_range_min', 'budget_range_max', 'newsletter_subscription']
-    list_filter = ['preferred_currency', 'newsletter_subscription']
+    list_filter = [('preferred_currency', CachedValuesListFilter), 'newsletter_subscription']
     search_fields = ['user__username', 'user__email']
+    list_select_related = ['user']
+    autocomplete_fields = ['user']
 
 
 @admin.register(SavedSearch)
@@ -25,4 +28,6 @@ class SavedSearchAdmin(admin.ModelAdmin):
     list_display = ['user', 'destination', 'check_in', 'check_out', 'guests', 'created_at']
     list_filter = ['created_at']
     search_fields = ['user__username', 'destination']
+    list_select_related = ['user']
+    autocomplete_fields = ['user']
     date_hierarchy = 'created_at'
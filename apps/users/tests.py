@@ -7,8 +7,9 @@ User = get_user_model()
 
 
 class UserModelTests(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123',
@@ -28,14 +29,15 @@ class UserModelTests(TestCase):
 
 
 class UserPreferenceModelTests(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
-        self.preference = UserPreference.objects.create(
-            user=self.user,
+        cls.preference = UserPreference.objects.create(
+            user=cls.user,
             preferred_currency='EUR',
             budget_range_min=100,
             budget_range_max=500
@@ -54,14 +56,15 @@ class UserPreferenceModelTests(TestCase):
 
 
 class SavedSearchModelTests(TestCase):
-    def setUp(self):
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpass123'
         )
-        self.search = SavedSearch.objects.create(
-            user=self.user,
+        cls.search = SavedSearch.objects.create(
+            user=cls.user,
             destination='Paris',
             check_in=date.today() + timedelta(days=30),
             check_out=date.today() + timedelta(days=35),
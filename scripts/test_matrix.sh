@@ -0,0 +1,27 @@
+#!/usr/bin/env sh
+# Run the model integration tests on SQLite and on PostgreSQL.
+# PostgreSQL comes from docker-compose.postgres.yml unless POSTGRES_HOST points elsewhere.
+# The PostgreSQL leg runs the real migrations (TEST_MIGRATE=1), so the generated
+# stay column, its GiST index and the capacity trigger are created the way a
+# deploy creates them rather than by the test runner's shortcut.
+set -e
+cd "$(dirname "$0")/.."
+
+TESTS="${*:-tests.test_models_integration}"
+
+echo "== sqlite"
+DATABASE_ENGINE=sqlite python manage.py test $TESTS
+
+if [ -z "$POSTGRES_HOST" ]; then
+    if ! command -v docker >/dev/null 2>&1; then
+        echo "PostgreSQL leg needs docker or POSTGRES_HOST" >&2
+        exit 1
+    fi
+    docker compose -f docker-compose.postgres.yml up -d --wait
+fi
+echo "== postgres"
+DATABASE_ENGINE=postgres \
+POSTGRES_HOST="${POSTGRES_HOST:-localhost}" \
+POSTGRES_PASSWORD="${POSTGRES_PASSWORD:-travel_portal}" \
+TEST_MIGRATE=1 \
+python manage.py test $TESTS
@@ -1,65 +1,36 @@
 """
 Integration tests for all models in the travel portal
 """
+from unittest import skipUnless
+
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
-from django.contrib.auth import get_user_model
-from apps.hotels.models import Destination, Hotel, Amenity, RoomType, HotelAmenity
-from apps.bookings.models import Booking, Payment
-from apps.reviews.models import Review
+from apps.core.factories import make_booking, make_destination, make_hotel, make_review, make_room_type, make_user
+from apps.hotels.models import Amenity, HotelAmenity
+from apps.bookings.models import Payment
 from datetime import date, timedelta
 from decimal import Decimal
 
-User = get_user_model()
-
 
 class ModelsIntegrationTests(TestCase):
     """Test models work together correctly"""
 
-    def setUp(self):
-        # Create test user
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-
-        # Create destination
-        self.destination = Destination.objects.create(
-            name='Paris',
-            city='Paris',
-            country='France',
-            description='City of Light',
-            is_featured=True
-        )
-
-        # Create hotel
-        self.hotel = Hotel.objects.create(
-            name='Test Hotel Paris',
-            destination=self.destination,
-            address='123 Test Street',
-            star_rating=4,
-            hotel_type='hotel',
-            description='A test hotel',
-            cancellation_policy='Free cancellation up to 24 hours'
-        )
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user(username='testuser', email='test@example.com')
+        cls.destination = make_destination(name='Paris', description='City of Light', is_featured=True)
+        cls.hotel = make_hotel(name='Test Hotel Paris', destination=cls.destination, address='123 Test Street')
 
-        # Create amenities
-        self.wifi = Amenity.objects.create(name='WiFi', category='general')
-        self.pool = Amenity.objects.create(name='Pool', category='general')
+        cls.wifi = Amenity.objects.create(name='WiFi', category='general')
+        cls.pool = Amenity.objects.create(name='Pool', category='general')
+        HotelAmenity.objects.create(hotel=cls.hotel, amenity=cls.wifi)
+        HotelAmenity.objects.create(hotel=cls.hotel, amenity=cls.pool)
 
-        # Link amenities to hotel
-        HotelAmenity.objects.create(hotel=self.hotel, amenity=self.wifi)
-        HotelAmenity.objects.create(hotel=self.hotel, amenity=self.pool)
+        cls.room_type = make_room_type(hotel=cls.hotel, price_per_night=Decimal('150.00'), total_rooms=10)
 
-        # Create room type
-        self.room_type = RoomType.objects.create(
-            hotel=self.hotel,
-            name='Standard Room',
-            description='Comfortable standard room',
-            max_occupancy=2,
-            bed_type='Queen Bed',
-            price_per_night=Decimal('150.00'),
-            total_rooms=10
+    def _past_booking(self):
+        return make_booking(
+            user=self.user, room_type=self.room_type, check_in=date.today() - timedelta(days=10), status='completed'
         )
 
     def test_destination_has_hotels(self):
@@ -85,23 +56,8 @@ class ModelsIntegrationTests(TestCase):
 
     def test_booking_creation_with_auto_reference(self):
         """Test booking is created with auto-generated reference"""
-        booking = Booking.objects.create(
-            user=self.user,
-            room_type=self.room_type,
-            check_in=date.today() + timedelta(days=30),
-            check_out=date.today() + timedelta(days=35),
-            num_guests=2,
-            guest_first_name='John',
-            guest_last_name='Doe',
-            guest_email='john@example.com',
-            guest_phone='+1-555-0123',
-            price_per_night=Decimal('150.00'),
-            num_nights=5,
-            subtotal=Decimal('750.00'),
-            taxes=Decimal('112.50'),
-            total_price=Decimal('862.50'),
-            status='confirmed'
-        )
+        booking = make_booking(user=self.user, room_type=self.room_type, status='confirmed')
+        self.assertEqual(booking.total_price, Decimal('862.50'))
         self.assertIsNotNone(booking.booking_reference)
         self.assertEqual(len(booking.booking_reference), 8)
 
@@ -115,22 +71,9 @@ class ModelsIntegrationTests(TestCase):
 
         # Create bookings to fill all rooms
         for i in range(10):
-            Booking.objects.create(
-                user=self.user,
-                room_type=self.room_type,
-                check_in=check_in,
-                check_out=check_out,
-                num_guests=2,
-                guest_first_name='Test',
-                guest_last_name=f'Guest{i}',
-                guest_email=f'guest{i}@example.com',
-                guest_phone='+1-555-0123',
-                price_per_night=Decimal('150.00'),
-                num_nights=5,
-                subtotal=Decimal('750.00'),
-                taxes=Decimal('112.50'),
-                total_price=Decimal('862.50'),
-                status='confirmed'
+            make_booking(
+                user=self.user, room_type=self.room_type, check_in=check_in, check_out=check_out,
+                guest_last_name=f'Guest{i}', guest_email=f'guest{i}@example.com', status='confirmed'
             )
 
         # Now room should not be available
@@ -138,86 +81,16 @@ class ModelsIntegrationTests(TestCase):
 
     def test_review_auto_verification(self):
         """Test review is automatically verified when linked to booking"""
-        booking = Booking.objects.create(
-            user=self.user,
-            room_type=self.room_type,
-            check_in=date.today() - timedelta(days=10),
-            check_out=date.today() - timedelta(days=5),
-            num_guests=2,
-            guest_first_name='John',
-            guest_last_name='Doe',
-            guest_email='john@example.com',
-            guest_phone='+1-555-0123',
-            price_per_night=Decimal('150.00'),
-            num_nights=5,
-            subtotal=Decimal('750.00'),
-            taxes=Decimal('112.50'),
-            total_price=Decimal('862.50'),
-            status='completed'
-        )
-
-        review = Review.objects.create(
-            user=self.user,
-            hotel=self.hotel,
-            booking=booking,
-            overall_rating=5,
-            cleanliness_rating=5,
-            location_rating=4,
-            service_rating=5,
-            value_rating=4,
-            title='Great stay!',
-            content='Had a wonderful time at this hotel.'
+        review = make_review(
+            user=self.user, hotel=self.hotel, booking=self._past_booking(), rating=5,
+            title='Great stay!', content='Had a wonderful time at this hotel.'
         )
-
         self.assertTrue(review.is_verified)
 
     def test_hotel_average_rating_calculation(self):
         """Test hotel average rating is calculated correctly"""
-        # Create past booking
-        booking = Booking.objects.create(
-            user=self.user,
-            room_type=self.room_type,
-            check_in=date.today() - timedelta(days=10),
-            check_out=date.today() - timedelta(days=5),
-            num_guests=2,
-            guest_first_name='John',
-            guest_last_name='Doe',
-            guest_email='john@example.com',
-            guest_phone='+1-555-0123',
-            price_per_night=Decimal('150.00'),
-            num_nights=5,
-            subtotal=Decimal('750.00'),
-            taxes=Decimal('112.50'),
-            total_price=Decimal('862.50'),
-            status='completed'
-        )
-
-        # Create reviews
-        Review.objects.create(
-            user=self.user,
-            hotel=self.hotel,
-            booking=booking,
-            overall_rating=5,
-            cleanliness_rating=5,
-            location_rating=5,
-            service_rating=5,
-            value_rating=5,
-            title='Excellent!',
-            content='Perfect hotel.'
-        )
-
-        user2 = User.objects.create_user(username='user2', email='user2@example.com', password='pass123')
-        Review.objects.create(
-            user=user2,
-            hotel=self.hotel,
-            overall_rating=3,
-            cleanliness_rating=3,
-            location_rating=3,
-            service_rating=3,
-            value_rating=3,
-            title='Average',
-            content='It was okay.'
-        )
+        make_review(user=self.user, hotel=self.hotel, booking=self._past_booking(), rating=5)
+        make_review(hotel=self.hotel, rating=3)
 
         # Average should be (5 + 3) / 2 = 4.0
         self.assertEqual(self.hotel.average_rating, 4.0)
@@ -225,23 +98,7 @@ class ModelsIntegrationTests(TestCase):
 
     def test_payment_linked_to_booking(self):
         """Test payment can be linked to a booking"""
-        booking = Booking.objects.create(
-            user=self.user,
-            room_type=self.room_type,
-            check_in=date.today() + timedelta(days=30),
-            check_out=date.today() + timedelta(days=35),
-            num_guests=2,
-            guest_first_name='John',
-            guest_last_name='Doe',
-            guest_email='john@example.com',
-            guest_phone='+1-555-0123',
-            price_per_night=Decimal('150.00'),
-            num_nights=5,
-            subtotal=Decimal('750.00'),
-            taxes=Decimal('112.50'),
-            total_price=Decimal('862.50'),
-            status='confirmed'
-        )
+        booking = make_booking(user=self.user, room_type=self.room_type, status='confirmed')
 
         payment = Payment.objects.create(
             booking=booking,
@@ -255,3 +112,35 @@ class ModelsIntegrationTests(TestCase):
 
         self.assertEqual(booking.payment, payment)
         self.assertEqual(payment.booking, booking)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Capacity constraints are PostgreSQL-only')
+class PostgresCapacityTests(TestCase):
+    """Test the database rejects overbooking on PostgreSQL"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user(username='testuser')
+        cls.room_type = make_room_type(
+            name='Suite', description='Only one of these', bed_type='King Bed',
+            price_per_night=Decimal('300.00'), total_rooms=1
+        )
+        cls.check_in = date.today() + timedelta(days=30)
+
+    def _book(self, check_in, nights=3, status='confirmed'):
+        return make_booking(user=self.user, room_type=self.room_type, check_in=check_in, nights=nights, status=status)
+
+    def test_overlapping_booking_rejected(self):
+        """Test a booking past capacity on any night fails at the database"""
+        self._book(self.check_in)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self._book(self.check_in + timedelta(days=2))
+
+    def test_adjacent_and_cancelled_bookings_allowed(self):
+        """Test back-to-back stays and cancelled bookings don't use capacity"""
+        first = self._book(self.check_in)
+        self._book(self.check_in + timedelta(days=3))
+        first.status = 'cancelled'
+        first.save()
+        self._book(self.check_in, nights=2)
+        self.assertFalse(self.room_type.is_available(self.check_in, self.check_in + timedelta(days=1)))
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from decouple import Csv, config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +43,7 @@ INSTALLED_APPS = [
     "rest_framework",
     "corsheaders",
     # Local apps
+    "apps.core",
     "apps.users",
     "apps.hotels",
     "apps.bookings",
@@ -48,7 +51,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.core.middleware.QueryInstrumentationMiddleware",
+    "apps.core.middleware.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.middleware.PrimaryPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -81,13 +87,134 @@ WSGI_APPLICATION = "travel_portal_backend.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
+# Applied on every new SQLite connection. WAL lets readers run alongside the
+# single writer; synchronous=NORMAL is durable across crashes in WAL mode.
+# cache_size is negative to mean KiB rather than pages.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": config("SQLITE_BUSY_TIMEOUT_MS", default=5000, cast=int),
+    "cache_size": -config("SQLITE_CACHE_KB", default=64000, cast=int),
+    "mmap_size": config("SQLITE_MMAP_BYTES", default=268435456, cast=int),
+    "temp_store": "MEMORY",
 }
 
+SQLITE_OPTIONS = {
+    "init_command": ";".join(f"PRAGMA {name}={value}" for name, value in SQLITE_PRAGMAS.items()),
+    # Take the write lock at BEGIN so transactions queue on busy_timeout
+    # instead of failing when a read lock can't be upgraded
+    "transaction_mode": "IMMEDIATE",
+}
+
+# "sqlite" (default) or "postgres"; PostgreSQL needs requirements-postgres.txt
+DATABASE_ENGINE = config("DATABASE_ENGINE", default="sqlite")
+
+if DATABASE_ENGINE == "postgres":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config("POSTGRES_DB", default="travel_portal"),
+            "USER": config("POSTGRES_USER", default="travel_portal"),
+            "PASSWORD": config("POSTGRES_PASSWORD", default=""),
+            "HOST": config("POSTGRES_HOST", default="localhost"),
+            "PORT": config("POSTGRES_PORT", default=5432, cast=int),
+            "CONN_MAX_AGE": config("CONN_MAX_AGE", default=600, cast=int),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+    REPLICA_SETTING, REPLICA_VALUES = "HOST", config("POSTGRES_REPLICA_HOSTS", default="", cast=Csv())
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config("SQLITE_PATH", default=str(BASE_DIR / "db.sqlite3")),
+            # Persistent connections; pragmas are only paid once per connection
+            "CONN_MAX_AGE": config("CONN_MAX_AGE", default=600, cast=int),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": SQLITE_OPTIONS,
+        }
+    }
+    REPLICA_SETTING, REPLICA_VALUES = "NAME", config("SQLITE_REPLICA_PATHS", default="", cast=Csv())
+
+# Test databases are built from the models (SQLite ones in memory); set
+# TEST_MIGRATE to run the migrations instead. See apps.core.testing.TestRunner.
+DATABASES["default"]["TEST"] = {"MIGRATE": config("TEST_MIGRATE", default=False, cast=bool)}
+TEST_RUNNER = "apps.core.testing.TestRunner"
+
+# Read replicas (SQLite copies kept current by litestream or the backup
+# API, or PostgreSQL streaming replicas) serve catalog and review reads;
+# see apps.core.routers. Tests read them through the primary.
+DATABASE_REPLICAS = []
+for index, value in enumerate(REPLICA_VALUES, start=1):
+    alias = f"replica{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        REPLICA_SETTING: value,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["apps.core.routers.PrimaryReplicaRouter"]
+
+# Seconds a client's reads stay on the primary after it writes
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", default=5, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# "locmem" keeps entries in each worker process, so invalidations made by one
+# worker are invisible to the others: use it for single-process deployments
+# and development. "file" shares entries between workers on one host.
+CACHE_BACKEND = config("CACHE_BACKEND", default="locmem")
+CACHE_TIMEOUT = config("CACHE_TIMEOUT", default=3600, cast=int)
+CACHE_MAX_ENTRIES = config("CACHE_MAX_ENTRIES", default=10000, cast=int)
+
+if CACHE_BACKEND == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": config("CACHE_DIR", default=str(BASE_DIR / "cache")),
+            "TIMEOUT": CACHE_TIMEOUT,
+            "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "travel-portal",
+            "TIMEOUT": CACHE_TIMEOUT,
+            "OPTIONS": {"MAX_ENTRIES": CACHE_MAX_ENTRIES},
+        }
+    }
+
+# In-process snapshots of amenities and destinations (apps.hotels.reference):
+# row bound per table, and how often other workers' invalidations are polled
+REFERENCE_DATA_MAX_ROWS = config("REFERENCE_DATA_MAX_ROWS", default=5000, cast=int)
+REFERENCE_DATA_CHECK_SECONDS = config("REFERENCE_DATA_CHECK_SECONDS", default=5, cast=int)
+# How often each worker polls for catalog changes other workers made to the
+# autocomplete index (apps.hotels.autocomplete)
+AUTOCOMPLETE_CHECK_SECONDS = config("AUTOCOMPLETE_CHECK_SECONDS", default=5, cast=int)
+
+
+# Per-request query and latency stats (apps.core.instrumentation); the
+# headers reveal query counts, so they are only sent under DEBUG unless
+# enabled (the load-test tooling enables them for the servers it starts)
+REQUEST_STATS_ENABLED = config("REQUEST_STATS_ENABLED", default=True, cast=bool)
+REQUEST_STATS_HEADERS = config("REQUEST_STATS_HEADERS", default=DEBUG, cast=bool)
+REQUEST_STATS_WINDOW = config("REQUEST_STATS_WINDOW", default=1000, cast=int)
+REQUEST_STATS_PUBLISH_SECONDS = config("REQUEST_STATS_PUBLISH_SECONDS", default=10, cast=int)
+
+# Stack-sampling profiles of slow and sampled requests (apps.core.profiling),
+# aggregated with the profile_report command; off unless enabled
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=False, cast=bool)
+PROFILING_SAMPLE_RATE = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+PROFILING_SLOW_MS = config("PROFILING_SLOW_MS", default=1000, cast=int)
+PROFILING_INTERVAL_MS = config("PROFILING_INTERVAL_MS", default=5, cast=float)
+PROFILING_DIR = config("PROFILING_DIR", default=str(BASE_DIR / "profiles"))
+PROFILING_MAX_FILES = config("PROFILING_MAX_FILES", default=1000, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -156,3 +283,12 @@ CORS_ALLOWED_ORIGINS = [
     "http://127.0.0.1:8787",
 ]
 CORS_ALLOW_CREDENTIALS = True
+
+# Booking lifecycle: unpaid pending bookings are cancelled after this long
+BOOKING_PENDING_HOLD_MINUTES = 30
+
+# Checkout sessions hold inventory for this long unless extended
+INVENTORY_HOLD_MINUTES = 15
+
+# Completed and cancelled bookings move to the archive tables this long after check-out
+BOOKING_ARCHIVE_AFTER_DAYS = 365
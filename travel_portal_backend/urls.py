@@ -16,8 +16,11 @@ Including another URLconf
 """
 
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("api/hotels/", include("apps.hotels.urls")),
+    path("api/bookings/", include("apps.bookings.urls")),
+    path("api/reviews/", include("apps.reviews.urls")),
 ]